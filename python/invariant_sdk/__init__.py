@@ -28,13 +28,18 @@ from .operators import (
     InferResult,
     verify_path,
     reread_context_window,
+    reread_context_windows,
+    sweep_anchor_integrity,
     compute_ctx_hash,
     infer_DEF,
     infer_SEQ,
     infer_INHIB,
     infer_GATE,
+    infer_GATE_many,
     build_window_stats,
+    load_or_build_window_stats,
     compute_dt_null_cache,
+    update_dt_null_cache,
 )
 
 __version__ = "34.4.2"
@@ -51,13 +56,18 @@ __all__ = [
     "VerifyResult",
     "verify_path",
     "reread_context_window",
+    "reread_context_windows",
+    "sweep_anchor_integrity",
     "compute_ctx_hash",
     "infer_DEF",
     "infer_SEQ",
     "infer_INHIB",
     "infer_GATE",
+    "infer_GATE_many",
     "build_window_stats",
+    "load_or_build_window_stats",
     "compute_dt_null_cache",
+    "update_dt_null_cache",
     # Lower-level
     "BinaryCrystal",
     "HaloClient",
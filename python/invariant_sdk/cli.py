@@ -6,12 +6,14 @@ Commands:
   inv ingest <path>   Ingest documents into local overlay
   inv ask <query>     Ask a question using global + local knowledge
   inv info            Show current overlay status
+  inv doctor          Check anchor integrity of every σ-edge
 """
 
 from __future__ import annotations
 
 import argparse
 import math
+import os
 import re
 import sys
 from pathlib import Path
@@ -20,6 +22,7 @@ from typing import List, Set
 # Import SDK components
 try:
     from .halo import hash8_hex
+    from .ingest import compute_ctx_hash
     from .overlay import OverlayGraph, OverlayEdge, find_overlays
     from .physics import HaloPhysics
     from .tokenize import tokenize_simple as _tokenize_simple
@@ -27,6 +30,7 @@ try:
 except ImportError:
     # Running as standalone script
     from invariant_sdk.halo import hash8_hex
+    from invariant_sdk.ingest import compute_ctx_hash
     from invariant_sdk.overlay import OverlayGraph, find_overlays
     from invariant_sdk.physics import HaloPhysics
     from invariant_sdk.tokenize import tokenize_simple as _tokenize_simple
@@ -57,39 +61,6 @@ def tokenize_with_positions(text: str) -> List[tuple]:
     return _tokenize_with_positions(text)
 
 
-def compute_ctx_hash(tokens_with_pos: List[tuple], anchor_idx: int, k: int = 2) -> str:
-    """
-    Compute semantic checksum for anchor (Anchor Integrity Protocol).
-    
-    Args:
-        tokens_with_pos: List of (word, line, char_start, char_end)
-        anchor_idx: Index of anchor word in the list
-        k: Window size (±k words around anchor)
-    
-    Returns:
-        8 hex characters of SHA-256 hash of normalized anchor window
-    
-    Theory: This is the "DNA" of the σ-fact. If context changes, hash changes.
-    Used for drift detection and self-healing.
-    """
-    import hashlib
-    
-    # Get window [anchor_idx - k, anchor_idx + k]
-    start = max(0, anchor_idx - k)
-    end = min(len(tokens_with_pos), anchor_idx + k + 1)
-    
-    # Extract words
-    window_words = [tokens_with_pos[i][0] for i in range(start, end)]
-    
-    # Normalize: lowercase, join with single space
-    normalized = ' '.join(w.lower() for w in window_words)
-    
-    # Hash and truncate to 8 hex chars
-    h = hashlib.sha256(normalized.encode('utf-8')).hexdigest()[:8]
-    
-    return h
-
-
 def get_anchors(
     client: HaloPhysics, 
     words: List[str], 
@@ -165,219 +136,85 @@ def cmd_ingest(args: argparse.Namespace) -> int:
     print(f"  Mean mass: {client.mean_mass:.4f}")
     print()
     
-    
-    # Helper: Check if file is text (UTF-8 decodable)
-    def is_text_file(file_path: Path) -> bool:
-        if not file_path.is_file():
-            return False
-        try:
-            with open(file_path, 'rb') as f:
-                sample = f.read(512)
-            sample.decode('utf-8', errors='strict')
-            return True
-        except (UnicodeDecodeError, OSError):
-            return False
-    
-    # Collect files
-    if input_path.is_file():
-        files = [input_path]
-    else:
-        # Find ALL files (no extension filtering)
-        all_files = [f for f in input_path.rglob("*") if f.is_file()]
-        
-        # Filter using .gitignore if present (Theory: Explicit user declaration)
-        gitignore_path = input_path / '.gitignore'
-        if gitignore_path.exists():
-            try:
-                import pathspec
-                gitignore_text = gitignore_path.read_text(encoding='utf-8')
-                spec = pathspec.PathSpec.from_lines('gitwildmatch', gitignore_text.splitlines())
-                files_after_gitignore = [f for f in all_files if not spec.match_file(str(f.relative_to(input_path)))]
-            except Exception:
-                files_after_gitignore = all_files
-        else:
-            files_after_gitignore = all_files
-
-        # Always ignore protocol / build artifacts (prevents self-indexing .invariant, etc.)
-        def is_default_ignored(p: Path) -> bool:
-            try:
-                rel = p.relative_to(input_path)
-            except Exception:
-                rel = p
-            for part in rel.parts:
-                if part in {".git", ".invariant", "__pycache__", ".venv", "venv", "node_modules", "dist", "build"}:
-                    return True
-                if part.endswith(".egg-info"):
-                    return True
-            return False
-
-        files_after_gitignore = [f for f in files_after_gitignore if not is_default_ignored(f)]
-        
-        # Filter to text files only
-        files = [f for f in files_after_gitignore if is_text_file(f)]
-    
-    # --update mode: filter to files modified after overlay
-    if update_mode and output_path.exists():
-        overlay_mtime = output_path.stat().st_mtime
-        files_before = len(files)
-        files = [f for f in files if f.stat().st_mtime > overlay_mtime]
-        print(f"  Update mode: {files_before} files total, {len(files)} modified since last ingest")
-    
-    print(f"Found {len(files)} files to process")
-    print()
+    from .ingest import IngestManifest, IngestWriter, MetaFetchError, ingest_path, manifest_path
+    from .operators import build_window_stats, load_or_build_window_stats, window_stats_path
     
     # Load existing overlay or create new
+    stats_path = window_stats_path(output_path)
+    stats = None
     if output_path.exists():
         overlay = OverlayGraph.load(output_path)
         print(f"Loaded existing overlay: {overlay.n_edges} edges")
+        # Window stats are maintained by delta (rebuilt first if the persisted copy is stale)
+        stats = load_or_build_window_stats(output_path, overlay)
     else:
         overlay = OverlayGraph()
-    total_edges = 0
-    mean_mass = client.mean_mass
-
-    # ------------------------------------------------------------------
-    # Pass 1/2: scan files and collect unique words (bounded per file)
-    # ------------------------------------------------------------------
-    print("Pass 1/2: scanning files for vocabulary...")
-    per_file_tokens: dict[Path, list[tuple]] = {}  # Cache tokens to avoid re-reading
-    all_words: Set[str] = set()
-
-    for i, file_path in enumerate(files, 1):
-        if i == 1 or i % 50 == 0 or i == len(files):
-            print(f"  [{i}/{len(files)}] {file_path}")
-
-        try:
-            text = file_path.read_text(encoding="utf-8")
-        except Exception:
-            continue
-
-        tokens_with_pos = tokenize_with_positions(text)
-        if len(tokens_with_pos) < 2:
-            continue
-
-        # Cache full tokens (avoids re-reading in Pass 2)
-        per_file_tokens[file_path] = tokens_with_pos
-        
-        words = [w for w, _, _, _ in tokens_with_pos]
-        unique_words = list(dict.fromkeys(words))[:200]
-        all_words.update(unique_words)
-
-    print(f"  Files with tokens: {len(per_file_tokens)}/{len(files)}")
-    print(f"  Unique words (bounded): {len(all_words)}")
-    print()
-
-    # ------------------------------------------------------------------
-    # Mega-batch crystal meta for ALL words (chunked to avoid huge payloads)
-    # ------------------------------------------------------------------
-    print("Fetching crystal meta (mega-batch)...")
-    word_to_hash = {w: hash8_hex(f"Ġ{w}") for w in all_words}
-    hashes = list(word_to_hash.values())
-
-    # Empirically safe chunk to avoid request-size limits.
-    chunk_size = 4000
-    batch_results: dict[str, dict] = {}
-    http_requests = 0
-
-    for start in range(0, len(hashes), chunk_size):
-        http_requests += 1
-        chunk = hashes[start : start + chunk_size]
-        try:
-            resp = client._client.get_halo_pages(chunk, limit=0)
-        except Exception as e:
-            print(f"  Error: crystal server batch failed: {e}")
-            return 1
-        batch_results.update(resp)
-
-        done = min(start + chunk_size, len(hashes))
-        if http_requests == 1 or done == len(hashes) or http_requests % 5 == 0:
-            print(f"  Crystal batches: {http_requests}  ({done}/{len(hashes)} words)")
-
-    print(f"  HTTP requests: {http_requests}")
-    print()
-
-    # ------------------------------------------------------------------
-    # Pass 2/2: build edges using cached tokens + crystal meta (no I/O)
-    # ------------------------------------------------------------------
-    print("Pass 2/2: building overlay...")
-    for i, (file_path, tokens_with_pos) in enumerate(per_file_tokens.items(), 1):
-        if i == 1 or i % 50 == 0 or i == len(per_file_tokens):
-            print(f"  [{i}/{len(per_file_tokens)}] {file_path}")
-
-        # Extract unique words for phase classification (use cache)
-        words = [w for w, _, _, _ in tokens_with_pos]
-        unique_words = list(dict.fromkeys(words))[:200]
-
-        # Phase classification: word -> 'solid' | 'gas' (using cached batch_results)
-        word_phases: dict[str, str] = {}
-        for word in unique_words:
-            h8 = word_to_hash.get(word)
-            res = batch_results.get(h8) if h8 else None
-            res = res or {}
-            if res.get("exists"):
-                meta = res.get("meta") or {}
-                degree = int(meta.get("degree_total") or 1)
-                mass = 1.0 / math.log(2 + degree) if degree > 0 else 0.5
-                word_phases[word] = "solid" if mass >= mean_mass else "gas"
-            else:
-                # THEORY: Unknown = Local Anchor (rare, high information)
-                word_phases[word] = "solid"
-
-        # Create edges between consecutive tokens
-        doc_name = str(file_path.relative_to(input_path) if input_path.is_dir() else file_path.name)
-        
-        # DEDUPLICATION: Remove old edges for this doc before adding new
-        # Theory: Replace, not accumulate (prevents overlay bloat on re-ingest)
-        removed = overlay.delete_doc(doc_name)
+    
+    workers = args.workers if getattr(args, 'workers', None) is not None else (os.cpu_count() or 1)
+    print(f"Scanning with {workers} worker(s); crystal meta fetched in batches...")
+    
+    def on_doc(scanned, removed, added):
+        n = writer.report.docs
+        if n == 1 or n % 50 == 0:
+            print(f"  [{n}] {scanned.path}")
         if removed > 0:
             print(f"    Replaced: removed {removed} old edges")
-        
-        doc_edges = 0
-
-        for j in range(len(tokens_with_pos) - 1):
-            src_word, _src_line, _, _ = tokens_with_pos[j]
-            tgt_word, tgt_line, _, _ = tokens_with_pos[j + 1]
-
-            src_phase = word_phases.get(src_word, "gas")
-            tgt_phase = word_phases.get(tgt_word, "gas")
-
-            # Skip gas→gas (pure noise)
-            if src_phase == "gas" and tgt_phase == "gas":
-                continue
-
-            # Use cached word_to_hash (avoids re-hashing)
-            src_hash = word_to_hash.get(src_word) or hash8_hex(f"Ġ{src_word}")
-            tgt_hash = word_to_hash.get(tgt_word) or hash8_hex(f"Ġ{tgt_word}")
-
-            # ALL document edges are σ (provable facts with doc:line provenance)
-            # WITNESS: ADJACENT (consecutive tokens in text)
-            ctx_hash = compute_ctx_hash(tokens_with_pos, j + 1, k=2)
-            overlay.add_edge(
-                src_hash,
-                tgt_hash,
-                weight=1.0,
-                doc=doc_name,
-                ring="sigma",
-                phase=tgt_phase,
-                line=tgt_line,
-                ctx_hash=ctx_hash,
-                witness=OverlayEdge.ADJACENT,  # Consecutive tokens = structurally adjacent
-            )
-            overlay.define_label(src_hash, src_word)
-            overlay.define_label(tgt_hash, tgt_word)
-            doc_edges += 1
-            total_edges += 1
-
-        print(f"    Added {doc_edges} edges")
-    
-    # Save overlay
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    overlay.save(output_path)
+        print(f"    Added {added} edges")
+    
+    # --update mode: skip files whose manifest entry is current (stat, then digest)
+    manifest_file = manifest_path(output_path)
+    writer = IngestWriter(
+        overlay=overlay,
+        fetch_meta=lambda chunk: client._client.get_halo_pages(chunk, limit=0),
+        mean_mass=client.mean_mass,
+        stats=stats,
+        on_doc=on_doc,
+        manifest=IngestManifest.load(manifest_file) if output_path.exists() else IngestManifest(),
+    )
+    try:
+        report = ingest_path(input_path, writer, workers=workers, update=update_mode)
+    except MetaFetchError as e:
+        print(f"  Error: crystal server batch failed: {e}")
+        return 1
+    for doc_name in report.removed_docs:
+        print(f"  Removed (file gone): {doc_name}")
+    
+    if update_mode:
+        print(f"  Update mode: {report.files_found} files total, {report.files_read} read")
+        print(
+            f"  Added {report.added}, changed {report.changed}, "
+            f"removed {report.removed}, skipped {report.skipped} (unchanged)"
+        )
+    walk = report.discovery
+    print(
+        f"  Discovery: {walk.files} files in {walk.dirs} dirs "
+        f"({walk.pruned_dirs} dirs pruned, {walk.ignored_files} gitignored), "
+        f"{walk.files_per_s:.0f} files/s"
+    )
+    print(f"  Files with tokens: {report.docs}/{report.files_read}")
+    print(f"  Crystal meta: {report.meta_hashes} words in {report.meta_requests} HTTP request(s)")
+    
+    # Save overlay (a no-op run only refreshes manifest mtimes)
+    unchanged = output_path.exists() and not (report.added or report.changed or report.removed)
+    with report.timings.stage("save"):
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if not unchanged:
+            overlay.save(output_path)
+            if stats is None:
+                stats = build_window_stats(overlay)
+            stats.save(stats_path, overlay)
+        writer.manifest.save(manifest_file)
     
     print()
     print(f"Done!")
-    print(f"  Total edges: {total_edges}")
+    print(f"  Total edges: {report.edges}")
     print(f"  Total labels: {len(overlay.labels)}")
-    print(f"  Overlay saved: {output_path}")
+    if unchanged:
+        print(f"  Overlay unchanged (not rewritten): {output_path}")
+    else:
+        print(f"  Overlay saved: {output_path}")
+    print(f"  Window stats: {stats_path} ({stats.n_windows} windows)")
+    print("  Timings: " + ", ".join(f"{k} {v:.2f}s" for k, v in report.timings.as_dict().items()))
     
     return 0
 
@@ -626,6 +463,55 @@ def cmd_info(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_doctor(args: argparse.Namespace) -> int:
+    """Bulk anchor-integrity sweep (COHERENT/RELOCATED/DECOHERENT per σ-edge)."""
+    import os
+    from .operators import sweep_anchor_integrity, window_stats_path
+
+    overlay_path = Path(args.overlay) if args.overlay else Path("./.invariant/overlay.jsonl")
+    if not overlay_path.exists():
+        print(f"Error: Overlay not found: {overlay_path}")
+        return 1
+
+    # Docs are stored relative to the ingest root (the project above .invariant/).
+    if args.root:
+        root = Path(args.root)
+    elif overlay_path.resolve().parent.name == ".invariant":
+        root = overlay_path.resolve().parent.parent
+    else:
+        root = overlay_path.resolve().parent
+    workers = args.workers if args.workers is not None else (os.cpu_count() or 1)
+
+    print("Invariant Doctor" + (" (--dry-run)" if args.dry_run else ""))
+    print(f"  Overlay: {overlay_path}")
+    print(f"  Root: {root}")
+    print(f"  Workers: {workers}")
+    print()
+
+    overlay = OverlayGraph.load(overlay_path)
+    report = sweep_anchor_integrity(overlay, root, workers=workers)
+
+    print(f"  Docs: {report.n_docs}")
+    print(f"  Edges checked: {report.n_edges}")
+    print(f"    COHERENT:   {report.coherent}")
+    print(f"    RELOCATED:  {report.relocated}")
+    print(f"    DECOHERENT: {report.decoherent}")
+    print(f"  Throughput: {report.edges_per_s:,.0f} edges/s ({report.elapsed_s:.2f}s)")
+    print()
+
+    if not report.changed:
+        print("No anchor changes; overlay left untouched.")
+    elif args.dry_run:
+        print(f"{report.changed} edge(s) would change (dry run, not saved).")
+    else:
+        overlay.save(overlay_path)
+        # Relocated lines move windows; the stats are rebuilt on next load
+        window_stats_path(overlay_path).unlink(missing_ok=True)
+        print(f"Updated {report.changed} edge(s); overlay saved: {overlay_path}")
+
+    return 0
+
+
 def cmd_map(args: argparse.Namespace) -> int:
     """Show file structure (functions, classes, line numbers).
     
@@ -667,7 +553,14 @@ def cmd_ui(args: argparse.Namespace) -> int:
     from .ui import run_ui
     
     overlay_path = Path(args.overlay) if args.overlay else None
-    run_ui(port=args.port, server=args.server, overlay_path=overlay_path)
+    crystal_path = Path(args.crystal) if args.crystal else None
+    run_ui(
+        port=args.port,
+        server=args.server,
+        overlay_path=overlay_path,
+        crystal_path=crystal_path,
+        threaded=not args.single_thread,
+    )
     return 0
 
 
@@ -701,7 +594,13 @@ def main() -> int:
     ingest_parser.add_argument(
         "--update", "-u",
         action="store_true",
-        help="Only reindex files modified since last ingest (incremental update)"
+        help="Only reindex files whose content changed since last ingest; drop vanished files"
+    )
+    ingest_parser.add_argument(
+        "--workers", "-j",
+        type=int,
+        default=None,
+        help="Scan worker processes (default: CPU count; 1 = serial)"
     )
     
     # ask command
@@ -740,6 +639,31 @@ def main() -> int:
         help="Object of assertion (e.g., '5 years')"
     )
     
+    # doctor command
+    doctor_parser = subparsers.add_parser(
+        "doctor",
+        help="Check anchor integrity of every σ-edge (bulk relocate)"
+    )
+    doctor_parser.add_argument(
+        "--overlay", "-o",
+        help="Overlay file path (default: ./.invariant/overlay.jsonl)"
+    )
+    doctor_parser.add_argument(
+        "--root",
+        help="Directory docs are relative to (default: project above .invariant/)"
+    )
+    doctor_parser.add_argument(
+        "--workers", "-j",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count; 1 = serial)"
+    )
+    doctor_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report only; do not save the overlay"
+    )
+    
     # map command
     map_parser = subparsers.add_parser(
         "map",
@@ -765,6 +689,15 @@ def main() -> int:
         "--overlay", "-o",
         help="Overlay file path"
     )
+    ui_parser.add_argument(
+        "--crystal", "-c",
+        help="Local .crystal file (offline vocabulary for autocomplete)"
+    )
+    ui_parser.add_argument(
+        "--single-thread",
+        action="store_true",
+        help="Serve one request at a time (default: one thread per request)"
+    )
     
     args = parser.parse_args()
     
@@ -776,6 +709,8 @@ def main() -> int:
         return cmd_info(args)
     elif args.command == "verify":
         return cmd_verify(args)
+    elif args.command == "doctor":
+        return cmd_doctor(args)
     elif args.command == "map":
         return cmd_map(args)
     elif args.command == "ui":
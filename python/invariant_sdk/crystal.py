@@ -9,6 +9,8 @@ from pathlib import Path
 from collections import defaultdict
 from typing import Dict, List, Optional, Tuple, Set
 
+from .labelindex import LabelIndex
+
 
 # ============================================================================
 # BPE DECODER
@@ -106,6 +108,7 @@ class CrystalGraph:
             clean = label.replace("Ġ", "").lower()
             if clean != decoded:
                 self.label_to_hash[clean] = h
+        self._label_index: Optional[LabelIndex] = None  # built on first find_nodes
         
         # Compute Topological Mass (Shannon Information Content)
         # 
@@ -148,22 +151,9 @@ class CrystalGraph:
         q = query.lower().strip()
         if not q:
             return []
-        
-        exact = []
-        prefix = []
-        contains = []
-        
-        for label, h in self.label_to_hash.items():
-            if label == q:
-                exact.append(h)
-            elif label.startswith(q):
-                prefix.append(h)
-            elif q in label:
-                contains.append(h)
-        
-        # Combine: exact first, then prefix, then contains
-        result = exact + prefix + contains
-        return result[:max_matches]
+        if self._label_index is None:
+            self._label_index = LabelIndex(self.label_to_hash.items())
+        return self._label_index.find(q, max_matches)
     
     def expand(self, 
                seed_nodes: List[str], 
@@ -474,6 +464,8 @@ class BinaryCrystal:
         self.path = Path(crystal_path)
         self.index_path = self.path.with_suffix('.index')
         self.vocab_idx_path = self.path.with_suffix('.vocab.idx')
+        self.label_index_path = self.path.with_suffix('.labels.idx')
+        self._label_index: Optional[LabelIndex] = None
         
         # Open crystal file with mmap
         self.file = open(self.path, 'rb')
@@ -719,18 +711,43 @@ class BinaryCrystal:
             self.file.close()
     
     def find_nodes(self, query: str, max_matches: int = 10) -> List[str]:
-        """Find node hashes matching query."""
+        """
+        Find node hashes matching query: exact, then prefix, then contains.
+        
+        Works in both label modes (Zero-Start has no label_to_hash).
+        """
         q = query.lower().strip()
         if not q:
             return []
-        
-        results = []
-        for label, h in self.label_to_hash.items():
-            if q in label:
-                results.append(h)
-                if len(results) >= max_matches:
-                    break
-        return results
+        return self._get_label_index().find(q, max_matches)
+    
+    def _get_label_index(self) -> LabelIndex:
+        """Label search index, built once and persisted next to the crystal."""
+        if self._label_index is not None:
+            return self._label_index
+        
+        st = self.path.stat()
+        stamp = (self.n_labels, st.st_size, st.st_mtime_ns, self._use_vocab_index)
+        index = LabelIndex.load(self.label_index_path, stamp)
+        if index is None:
+            if self.label_to_hash:
+                items = self.label_to_hash
+            else:
+                # Zero-Start: walk the vocab once (same decode as the fallback parser)
+                from .merkle import get_token_hash16_hex
+                
+                items = {}
+                tokens = self.idx_to_token
+                for idx in range(self.n_labels):
+                    token = tokens.get(idx)
+                    if token is None:
+                        continue
+                    items[decode_bpe_token(token).strip().lower()] = get_token_hash16_hex(token)
+            index = LabelIndex(items.items())
+            if not index.save(self.label_index_path, stamp):
+                print(f"  Warning: Could not save label index to {self.label_index_path.name}")
+        self._label_index = index
+        return index
     
     def get_label(self, h: str) -> str:
         """Get decoded label for hash."""
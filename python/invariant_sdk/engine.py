@@ -21,14 +21,23 @@ This module is intentionally stdlib-only and deterministic.
 from __future__ import annotations
 
 import ast
+import atexit
+import heapq
+import math
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
+from .filecache import iter_lines, shared_file_cache
 from .halo import hash8_hex
 from .overlay import OverlayEdge, OverlayGraph
+from .suggest import PrefixIndex, build_label_prefix_index
 from .tokenize import dedupe_preserve_order, tokenize_simple
-from .quantum import compute_dyadic_energy, compute_amplitude, normalize_by_entropy, compute_ranking_tuple, occurrences_to_sigma_events, compute_peak_score, beta_from_query
+from .quantum import compute_dyadic_energy, compute_amplitude, normalize_by_entropy, compute_ranking_tuple, compute_scoring_tuple, occurrences_to_sigma_events, compute_peak_score, beta_from_query
 
 if TYPE_CHECKING:
     from .physics import HaloPhysics
@@ -56,6 +65,7 @@ class OverlayIndex:
     known_hashes: set[str]
     label_to_hash: Dict[str, str]
     hash_to_docs: Dict[str, set[str]]  # For IDF: which docs contain each hash
+    label_prefix: PrefixIndex  # Autocomplete: label prefix → hash8, by σ-edge count
 
     @classmethod
     def build(cls, overlay: OverlayGraph) -> "OverlayIndex":
@@ -104,6 +114,7 @@ class OverlayIndex:
             known_hashes=known_hashes, 
             label_to_hash=label_to_hash,
             hash_to_docs=hash_to_docs,
+            label_prefix=build_label_prefix_index(overlay, incoming),
         )
 
 
@@ -129,11 +140,8 @@ def _resolve_query_hash(word: str, *, overlay: OverlayGraph, index: Optional[Ove
         by_label = index.label_to_hash.get(w)
         if by_label:
             return by_label
-    # Slow fallback (rare).
-    for node, label in (overlay.labels or {}).items():
-        if label and str(label).strip().lower() == w:
-            return node
-    return h8
+    # Label index fallback (overlays without an OverlayIndex).
+    return overlay.lookup_label(w) or h8
 
 
 def _find_epicenter(line_hashes: Dict[int, set]) -> tuple:
@@ -219,33 +227,28 @@ def _read_context_window(
     Lines are sorted chronologically (Chronology Law).
     No character truncation (Identity Law — don't cut atoms).
     """
-    try:
-        text = path.read_text(encoding="utf-8", errors="ignore")
-    except Exception:
-        return []
-    
-    lines = text.splitlines()
-    if not lines:
+    needles = [w.strip().lower() for w in signal_words if w and w.strip()]
+    if not needles:
         return []
     
-    # Clamp to valid range
+    # Clamp to valid range (the cache clamps the end; huge files are streamed)
     start = max(1, start_line)
-    end = min(len(lines), end_line)
-    
-    needles = [w.strip().lower() for w in signal_words if w and w.strip()]
-    if not needles:
+    cache = shared_file_cache()
+    entry = cache.get(path)
+    if entry is not None:
+        raws = entry.lines(start, end_line)
+        lowers = entry.lines(start, end_line, lower=True)
+    else:
+        raws = cache.read_lines(path, start, end_line) or []
+        lowers = [raw.lower() for raw in raws]
+    if not raws:
         return []
     
     needle_weights = {n: float((word_weights or {}).get(n, 1.0)) for n in needles}
     out: List[Dict] = []
     
     # Read all lines in the window (chronological order)
-    for i in range(start, end + 1):
-        if i < 1 or i > len(lines):
-            continue
-        raw = lines[i - 1].rstrip("\n")
-        lower = raw.lower()
-        
+    for i, raw, lower in zip(range(start, start + len(raws)), raws, lowers):
         # Find which signal words appear on this line
         hits = [n for n in needles if n in lower]
         
@@ -263,6 +266,49 @@ def _read_context_window(
     return out  # Already in chronological order
 
 
+def _find_hit_lines(
+    path: Path,
+    needles: Sequence[str],
+) -> Tuple[Dict[int, set], Callable[[int], Optional[str]]]:
+    """
+    Lines containing each needle: ({line: {needles}}, line -> raw text).
+
+    Cached files are searched with str.find over the lowered text and hits are
+    mapped to lines through the cached offsets (no per-line lowercasing).
+    Files above the cache bound are streamed line by line (bounded memory).
+    """
+    line_hits: Dict[int, set] = {}
+    entry = shared_file_cache().get(path)
+    if entry is not None and entry.lower_aligned:
+        lower = entry.lower
+        for n in needles:
+            pos = lower.find(n)
+            while pos >= 0:
+                line_no = entry.line_at(pos)
+                _start, end = entry.line_span(line_no)
+                if pos + len(n) <= end:
+                    line_hits.setdefault(line_no, set()).add(n)
+                pos = lower.find(n, max(end, pos + 1))
+
+        def _line(line_no: int) -> Optional[str]:
+            got = entry.lines(line_no, line_no)
+            return got[0] if got else None
+
+        return line_hits, _line
+
+    raw_lines: Dict[int, str] = {}
+    try:
+        for i, raw in enumerate(iter_lines(path), 1):
+            lower = raw.lower()
+            hits = [n for n in needles if n in lower]
+            if hits:
+                line_hits[i] = set(hits)
+                raw_lines[i] = raw
+    except OSError:
+        return {}, raw_lines.get
+    return line_hits, raw_lines.get
+
+
 def _scan_file_for_words(
     *,
     path: Path,
@@ -278,10 +324,6 @@ def _scan_file_for_words(
     """
     if not words or max_occurrences <= 0:
         return []
-    try:
-        text = path.read_text(encoding="utf-8", errors="ignore")
-    except Exception:
-        return []
 
     needles = [w.strip().lower() for w in words if w and w.strip()]
     needles = [n for n in needles if n]
@@ -303,15 +345,10 @@ def _scan_file_for_words(
     # Collect candidate hit lines with their "energy" and coverage.
     # Selection prefers lines that cover MORE distinct needles (intersection / bisection),
     # then higher energy, then earlier line number.
-    lines = text.splitlines()
+    line_hits, line_text = _find_hit_lines(path, needles)
     candidates: List[Dict] = []
-    for i, raw_line in enumerate(lines, 1):
-        raw = raw_line.rstrip("\n")
-        lower = raw.lower()
-        hits = [n for n in needles if n in lower]
-        if not hits:
-            continue
-        hits_set = set(hits)
+    for i in sorted(line_hits):
+        hits_set = line_hits[i]
         score = sum(needle_weights.get(n, 0.0) for n in hits_set)
         candidates.append({"line": i, "hits": sorted(hits_set), "score": score, "coverage": len(hits_set)})
 
@@ -354,9 +391,9 @@ def _scan_file_for_words(
     out: List[Dict] = []
     for c in selected:
         line_no = int(c.get("line") or 0)
-        if not line_no or line_no < 1 or line_no > len(lines):
+        raw = line_text(line_no)
+        if raw is None:
             continue
-        raw = lines[line_no - 1].rstrip("\n")
         lower = raw.lower()
         hits = [str(h) for h in (c.get("hits") or []) if h]
 
@@ -399,6 +436,293 @@ def _scan_file_for_words(
     return out
 
 
+def _build_query_terms(
+    expanded: Dict[str, Dict],
+    *,
+    index: OverlayIndex,
+    n_docs: int,
+    epsilon: float,
+) -> Dict[str, Dict]:
+    """
+    Per-hash amplitude table for one query.
+
+    α = Mass × IDF × Coupling depends only on the hash (df is corpus-wide), so it
+    is computed once per query instead of once per (doc, hash).
+    """
+    terms: Dict[str, Dict] = {}
+    for h8, term in expanded.items():
+        term = term or {}
+        df = len(index.hash_to_docs.get(h8, set()))
+
+        # v1.8.3: OOV mass = self-information from σ-corpus
+        # If Halo provides mass → use it
+        # Else: mass = -log(df/n_docs) / log(n_docs) ∈ [0,1]
+        halo_mass = term.get("mass")
+        if halo_mass is not None and float(halo_mass) > 0:
+            mass = float(halo_mass)
+        elif df > 0 and n_docs > 1:
+            # Self-information: rare = high mass, common = low mass
+            mass = min(1.0, max(0.1, -math.log(df / n_docs) / math.log(n_docs)))
+        else:
+            mass = 1.0  # Fallback for df=0 (filtered out anyway)
+
+        source_type = str(term.get("source_type") or "crystal")
+        is_direct = bool(term.get("is_direct"))
+        weight = abs(float(term.get("weight") or 0.0))
+
+        if is_direct:
+            coupling = 1.0
+        elif source_type == "local":
+            coupling = 1.0
+        elif source_type == "embedding":
+            coupling = weight * epsilon
+        else:
+            coupling = weight
+
+        # INVARIANT: df == 0 ⟹ α = 0 (λ-lens cannot create σ-truth)
+        alpha = compute_amplitude(mass=mass, df=df, n_docs=n_docs, coupling=coupling)
+
+        # Keep contribution for UI/debugging
+        contribution = alpha  # Individual amplitude (not energy)
+        idf = math.log(n_docs / df) if df and df < n_docs else 0.0
+
+        terms[h8] = {
+            "hash8": h8,
+            "word": str(term.get("label") or h8[:8]),
+            "source_word": str(term.get("source_word") or ""),
+            "is_direct": is_direct,
+            "source_type": source_type,
+            "phase": str(term.get("phase") or "solid"),
+            "mass": mass,
+            "df": df,
+            "idf": idf,
+            "weight": coupling,
+            "alpha": alpha,
+            "contribution": contribution,
+        }
+    return terms
+
+
+def _peak_upper_bound(info: Dict, terms: Dict[str, Dict]) -> Optional[float]:
+    """
+    Cheap upper bound on a document's peak score (None = no matched hashes).
+
+    Every window holds a subset of the matched anchors and binding only drops
+    cross-terms, so E(window) ≤ (Σα)² over all matched hashes. Legacy docs
+    without σ-events score Σα directly.
+    """
+    hashes = info.get("hashes") or set()
+    alpha_sum = 0.0
+    matched = False
+    for h8 in hashes:
+        term = terms.get(h8)
+        if term is None:
+            continue
+        matched = True
+        alpha_sum += term["alpha"]
+    if not matched:
+        return None
+    ub = alpha_sum ** 2 if info.get("event_hashes") else alpha_sum
+    # Relative slack absorbs float summation-order differences.
+    return ub * (1.0 + 1e-9)
+
+
+def _score_document(
+    doc: str,
+    info: Dict,
+    *,
+    terms: Dict[str, Dict],
+    order: Iterable[str],
+) -> Optional[Tuple[str, Dict]]:
+    """Exact dyadic scoring of one document (None if nothing matched)."""
+    doc_hashes = info.get("hashes") or set()
+    matched_hashes = [h8 for h8 in order if h8 in doc_hashes and h8 in terms]
+    if not matched_hashes:
+        return None
+
+    # 1) Amplitudes for each matched hash (from the per-query table)
+    amplitudes: Dict[str, float] = {}
+    word_contributions: List[Dict] = []
+    for h8 in matched_hashes:
+        wc = dict(terms[h8])
+        amplitudes[h8] = wc["alpha"]
+        word_contributions.append(wc)
+
+    # 2) Build σ-events directly from event_hashes (v1.9.1: true ctx_hash identity)
+    # 
+    # CRITICAL: We build sigma_events directly from event_hashes,
+    # NOT through occurrences_to_sigma_events which re-groups by line.
+    # This preserves ctx_hash identity: each event_key = one σ-event.
+    event_hashes = info.get("event_hashes") or {}
+    event_lines = info.get("event_lines") or {}
+    
+    # Sort events by their associated line (for order stability)
+    sorted_events = sorted(event_hashes.items(), key=lambda x: event_lines.get(x[0], 0))
+    
+    # Build sigma_events: each event_key → one σ-event with {h8: alpha}
+    sigma_events: List[Dict[str, float]] = []
+    for event_key, hashes in sorted_events:
+        event_dict: Dict[str, float] = {}
+        for h8 in hashes:
+            if h8 in amplitudes:
+                event_dict[h8] = amplitudes[h8]
+        if event_dict:
+            sigma_events.append(event_dict)
+
+    # 3) Compute Scores: Peak (primary) + Sum (secondary) (v1.9)
+    query_hash_set = set(amplitudes.keys())
+    if sigma_events:
+        
+        # v1.9.4 Invariant IX: Peak Energy Wins (needle detection)
+        # Pass query amplitudes for query-level binding.
+        # Peak + sum + coherence + min_scale come from ONE dyadic sweep.
+        peak_score, energy, coherence, min_scale = compute_scoring_tuple(
+            sigma_events, query_hash_set, query_amplitudes=amplitudes,
+        )
+        
+        # Sum energy for secondary ranking (context/coverage)
+        # v1.9.2: Normalize by len(sigma_events), not anchor count
+        sum_score = normalize_by_entropy(energy, len(sigma_events))
+        total_coherence = normalize_by_entropy(coherence, len(sigma_events))
+        
+        # Primary = peak (needles win), Secondary = sum (context)
+        total_score = peak_score
+    else:
+        # Fallback: sum of alphas if no line info (legacy overlays)
+        total_score = sum(amplitudes.values())
+        sum_score = total_score
+        total_coherence = 0.0
+        min_scale = 8
+
+    # 4) Compute percentages for UI
+    alpha_sum = sum(wc["alpha"] for wc in word_contributions) or 1.0
+    for wc in word_contributions:
+        wc["percent"] = round(wc["alpha"] / alpha_sum * 100, 1) if alpha_sum > 0 else 0.0
+
+    word_contributions.sort(key=lambda x: (-float(x.get("alpha") or 0.0), str(x.get("word") or "").lower()))
+    sorted_matches = [wc["word"] for wc in word_contributions]
+
+    # Semantic Bridges: Show expansion paths
+    semantic_bridges = []
+    for wc in word_contributions:
+        if not wc.get("is_direct") and wc.get("source_word"):
+            semantic_bridges.append({
+                "from": wc["source_word"],
+                "to": wc["word"],
+                "weight": round(wc.get("weight", 0.0), 3),
+                "contribution_pct": wc.get("percent", 0.0),
+            })
+
+    return (
+        doc,
+        {
+            "file": doc,
+            "n_matches": len(matched_hashes),
+            "n_events": len(sigma_events),
+            "matching_words": sorted_matches,
+            "word_contributions": word_contributions,
+            "semantic_bridges": semantic_bridges,
+            "score": round(total_score, 6),  # v1.9: peak score
+            "sum_score": round(sum_score, 6),  # v1.9: sum for secondary
+            "coherence": round(total_coherence, 6),
+            "min_scale": min_scale,
+        },
+    )
+
+
+def _ranking_key(item: Tuple[str, Dict]) -> tuple:
+    """v1.9: Stable tie-breaking by (peak desc, sum desc, coherence desc, min_scale asc, doc_id)."""
+    doc, info = item
+    return (
+        -float(info.get("score") or 0.0),
+        -float(info.get("sum_score") or 0.0),
+        -float(info.get("coherence") or 0.0),
+        int(info.get("min_scale") or 8),
+        doc.lower(),
+    )
+
+
+# Docs per worker task when scoring in parallel (amortizes pickling/dispatch).
+_PARALLEL_CHUNK = 64
+
+_SCORING_POOLS: Dict[Tuple[bool, int], Executor] = {}
+_SCORING_POOLS_LOCK = threading.Lock()  # threaded UI server: concurrent first queries
+
+# Max concurrent preview reads for top files.
+_PREVIEW_THREADS = 8
+
+
+def locate_workers_from_env() -> int:
+    """Opt-in parallel scoring for front ends (INVARIANT_LOCATE_WORKERS, 0 = serial)."""
+    try:
+        return int(os.environ.get("INVARIANT_LOCATE_WORKERS") or 0)
+    except ValueError:
+        return 0
+
+
+def _scoring_pool(workers: int, use_threads: bool) -> Executor:
+    """Shared, lazily created pool per (kind, size); reused across queries."""
+    key = (use_threads, workers)
+    pool = _SCORING_POOLS.get(key)
+    if pool is None:
+        with _SCORING_POOLS_LOCK:
+            pool = _SCORING_POOLS.get(key)
+            if pool is None:
+                pool = ThreadPoolExecutor(max_workers=workers) if use_threads else ProcessPoolExecutor(max_workers=workers)
+                _SCORING_POOLS[key] = pool
+    return pool
+
+
+@atexit.register
+def _shutdown_scoring_pools() -> None:
+    with _SCORING_POOLS_LOCK:
+        pools = list(_SCORING_POOLS.values())
+        _SCORING_POOLS.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _score_chunk(
+    items: List[Tuple[str, Dict]],
+    terms: Dict[str, Dict],
+    order: List[str],
+) -> List[Tuple[str, Dict]]:
+    """Worker entry point: score a chunk of documents (module-level for pickling)."""
+    out: List[Tuple[str, Dict]] = []
+    for doc, info in items:
+        scored = _score_document(doc, info, terms=terms, order=order)
+        if scored is not None:
+            out.append(scored)
+    return out
+
+
+def _score_documents(
+    items: List[Tuple[str, Dict]],
+    *,
+    terms: Dict[str, Dict],
+    order: List[str],
+    workers: int = 0,
+    use_threads: bool = False,
+) -> List[Tuple[str, Dict]]:
+    """
+    Score documents serially or chunked across a worker pool.
+
+    Per-document scoring is independent, so chunks are scored in parallel and
+    concatenated in input order; callers sort with `_ranking_key`, which makes
+    the merged ranking identical to the serial one.
+    """
+    if workers <= 1 or len(items) <= _PARALLEL_CHUNK:
+        return _score_chunk(items, terms, order)
+
+    chunk_size = max(_PARALLEL_CHUNK, -(-len(items) // (workers * 4)))
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    pool = _scoring_pool(workers, use_threads)
+    out: List[Tuple[str, Dict]] = []
+    for part in pool.map(_score_chunk, chunks, repeat(terms), repeat(order)):
+        out.extend(part)
+    return out
+
+
 def locate_files(
     issue_text: str,
     *,
@@ -410,6 +734,9 @@ def locate_files(
     preview_files: int = 8,
     preview_occurrences: int = 6,
     resolve_doc_path: Optional[Callable[[str], Optional[Path]]] = None,
+    exhaustive: bool = False,
+    workers: int = 0,
+    use_threads: bool = False,
 ) -> Dict:
     """
     File discovery from issue text.
@@ -423,6 +750,15 @@ def locate_files(
       - ranked files
       - why each file matched (matching_words)
       - a small number of preview occurrences for top files
+
+    With `max_results > 0`, documents are visited in descending order of a
+    cheap peak upper bound and exact dyadic scoring stops once no remaining
+    document can enter the top k. `exhaustive=True` forces full scoring; the
+    returned ranking is identical either way.
+
+    `workers > 1` opts into parallel per-document scoring: a process pool for
+    the CPU-bound dyadic kernel, or threads with `use_threads=True` (useful on
+    free-threaded builds). The merged ranking keeps the same stable tie-break.
     """
     query_words = tokenize_query(issue_text)
     if not query_words:
@@ -523,169 +859,48 @@ def locate_files(
     # === FULL HAMILTONIAN SCORING (RUNTIME_CONTRACT v1.7) ===
     # E = Ψ² = Σα² + 2Σαᵢαⱼ (presence + interference)
     # Dyadic multi-scale energy computation
-    import math
-
     n_docs = len(idx.doc_stats) or 1
     n_vocab = 150000  # Default if physics unavailable
     if physics is not None:
         n_vocab = int((physics.meta or {}).get("n_labels", 150000))
     epsilon = 1.0 / math.log(n_vocab) if n_vocab > 1 else 0.1
 
-    ranked: List[Tuple[str, Dict]] = []
-    for doc, info in file_scores.items():
-        matched_hashes = [h8 for h8 in expanded.keys() if h8 in (info.get("hashes") or set())]
-        if not matched_hashes:
-            continue
-
-        # 1) Compute amplitudes for each matched hash
-        amplitudes: Dict[str, float] = {}
-        word_contributions: List[Dict] = []
-
-        for h8 in matched_hashes:
-            term = expanded.get(h8) or {}
-
-            df = len(idx.hash_to_docs.get(h8, set()))
-            
-            # v1.8.3: OOV mass = self-information from σ-corpus
-            # If Halo provides mass → use it
-            # Else: mass = -log(df/n_docs) / log(n_docs) ∈ [0,1]
-            halo_mass = term.get("mass")
-            if halo_mass is not None and float(halo_mass) > 0:
-                mass = float(halo_mass)
-            elif df > 0 and n_docs > 1:
-                # Self-information: rare = high mass, common = low mass
-                mass = min(1.0, max(0.1, -math.log(df / n_docs) / math.log(n_docs)))
-            else:
-                mass = 1.0  # Fallback for df=0 (filtered out anyway)
-
-            source_type = str(term.get("source_type") or "crystal")
-            is_direct = bool(term.get("is_direct"))
-            weight = abs(float(term.get("weight") or 0.0))
-
-            if is_direct:
-                coupling = 1.0
-            elif source_type == "local":
-                coupling = 1.0
-            elif source_type == "embedding":
-                coupling = weight * epsilon
-            else:
-                coupling = weight
-
-            # INVARIANT: df == 0 ⟹ α = 0 (λ-lens cannot create σ-truth)
-            alpha = compute_amplitude(mass=mass, df=df, n_docs=n_docs, coupling=coupling)
-            amplitudes[h8] = alpha
-
-            # Keep contribution for UI/debugging
-            contribution = alpha  # Individual amplitude (not energy)
-            idf = math.log(n_docs / df) if df and df < n_docs else 0.0
-
-            word_contributions.append(
-                {
-                    "hash8": h8,
-                    "word": str(term.get("label") or h8[:8]),
-                    "source_word": str(term.get("source_word") or ""),
-                    "is_direct": is_direct,
-                    "source_type": source_type,
-                    "phase": str(term.get("phase") or "solid"),
-                    "mass": mass,
-                    "df": df,
-                    "idf": idf,
-                    "weight": coupling,
-                    "alpha": alpha,
-                    "contribution": contribution,
-                }
-            )
+    terms = _build_query_terms(expanded, index=idx, n_docs=n_docs, epsilon=epsilon)
 
-        # 2) Build σ-events directly from event_hashes (v1.9.1: true ctx_hash identity)
-        # 
-        # CRITICAL: We build sigma_events directly from event_hashes,
-        # NOT through occurrences_to_sigma_events which re-groups by line.
-        # This preserves ctx_hash identity: each event_key = one σ-event.
-        event_hashes = info.get("event_hashes") or {}
-        event_lines = info.get("event_lines") or {}
-        
-        # Sort events by their associated line (for order stability)
-        sorted_events = sorted(event_hashes.items(), key=lambda x: event_lines.get(x[0], 0))
-        
-        # Build sigma_events: each event_key → one σ-event with {h8: alpha}
-        sigma_events: List[Dict[str, float]] = []
-        for event_key, hashes in sorted_events:
-            event_dict: Dict[str, float] = {}
-            for h8 in hashes:
-                if h8 in amplitudes:
-                    event_dict[h8] = amplitudes[h8]
-            if event_dict:
-                sigma_events.append(event_dict)
-
-        # 3) Compute Scores: Peak (primary) + Sum (secondary) (v1.9)
-        query_hash_set = set(amplitudes.keys())
-        if sigma_events:
-            
-            # v1.9.4 Invariant IX: Peak Energy Wins (needle detection)
-            # Pass query amplitudes for query-level binding
-            peak_score = compute_peak_score(sigma_events, query_hash_set, 
-                                            query_amplitudes=amplitudes)
-            
-            # Sum energy for secondary ranking (context/coverage)
-            # v1.9.2: Normalize by len(sigma_events), not anchor count
-            energy, coherence, min_scale = compute_ranking_tuple(sigma_events, query_hash_set)
-            sum_score = normalize_by_entropy(energy, len(sigma_events))
-            total_coherence = normalize_by_entropy(coherence, len(sigma_events))
-            
-            # Primary = peak (needles win), Secondary = sum (context)
-            total_score = peak_score
-        else:
-            # Fallback: sum of alphas if no line info (legacy overlays)
-            total_score = sum(amplitudes.values())
-            sum_score = total_score
-            total_coherence = 0.0
-            min_scale = 8
-
-        # 4) Compute percentages for UI
-        alpha_sum = sum(wc["alpha"] for wc in word_contributions) or 1.0
-        for wc in word_contributions:
-            wc["percent"] = round(wc["alpha"] / alpha_sum * 100, 1) if alpha_sum > 0 else 0.0
-
-        word_contributions.sort(key=lambda x: (-float(x.get("alpha") or 0.0), str(x.get("word") or "").lower()))
-        sorted_matches = [wc["word"] for wc in word_contributions]
-
-        # Semantic Bridges: Show expansion paths
-        semantic_bridges = []
-        for wc in word_contributions:
-            if not wc.get("is_direct") and wc.get("source_word"):
-                semantic_bridges.append({
-                    "from": wc["source_word"],
-                    "to": wc["word"],
-                    "weight": round(wc.get("weight", 0.0), 3),
-                    "contribution_pct": wc.get("percent", 0.0),
-                })
-
-        ranked.append(
-            (
-                doc,
-                {
-                    "file": doc,
-                    "n_matches": len(matched_hashes),
-                    "n_events": len(sigma_events),
-                    "matching_words": sorted_matches,
-                    "word_contributions": word_contributions,
-                    "semantic_bridges": semantic_bridges,
-                    "score": round(total_score, 6),  # v1.9: peak score
-                    "sum_score": round(sum_score, 6),  # v1.9: sum for secondary
-                    "coherence": round(total_coherence, 6),
-                    "min_scale": min_scale,
-                },
-            )
-        )
+    ranked: List[Tuple[str, Dict]] = []
+    order = list(expanded)
+    if max_results > 0 and not exhaustive:
+        # Top-k mode: visit docs by descending upper bound, stop once the bound
+        # cannot reach the current k-th peak score (results identical to exhaustive).
+        bounds: List[Tuple[float, str]] = []
+        for doc, info in file_scores.items():
+            ub = _peak_upper_bound(info, terms)
+            if ub is not None:
+                bounds.append((ub, doc))
+        bounds.sort(key=lambda x: (-x[0], x[1]))
+
+        # Parallel mode scores one round of bound-ordered docs per pool dispatch.
+        batch = 1 if workers <= 1 else workers * _PARALLEL_CHUNK
+        kth_scores: List[float] = []  # min-heap of the k best peak scores
+        pos = 0
+        while pos < len(bounds):
+            if len(kth_scores) >= max_results and round(bounds[pos][0], 6) < kth_scores[0]:
+                break
+            items = [(doc, file_scores[doc]) for _ub, doc in bounds[pos:pos + batch]]
+            pos += batch
+            for scored in _score_documents(items, terms=terms, order=order,
+                                           workers=workers, use_threads=use_threads):
+                ranked.append(scored)
+                score = float(scored[1]["score"])
+                if len(kth_scores) < max_results:
+                    heapq.heappush(kth_scores, score)
+                elif score > kth_scores[0]:
+                    heapq.heapreplace(kth_scores, score)
+    else:
+        ranked = _score_documents(list(file_scores.items()), terms=terms, order=order,
+                                  workers=workers, use_threads=use_threads)
 
-    # v1.9: Stable tie-breaking by (peak desc, sum desc, coherence desc, min_scale asc, doc_id)
-    ranked.sort(key=lambda x: (
-        -float(x[1].get("score") or 0.0),
-        -float(x[1].get("sum_score") or 0.0),
-        -float(x[1].get("coherence") or 0.0),
-        int(x[1].get("min_scale") or 8),
-        x[0].lower()
-    ))
+    ranked.sort(key=_ranking_key)
 
     # Apply max_results (0 = "all").
     results: List[Dict] = []
@@ -698,18 +913,18 @@ def locate_files(
     # Use coordinate-based epicenter when line provenance exists (Energy Law),
     # fall back to grep when no coordinates are available (backward compat).
     if resolve_doc_path:
-        for i, r in enumerate(results[: max(0, int(preview_files))]):
+        def _preview(r: Dict) -> None:
             doc_name = r["file"]
             path = resolve_doc_path(doc_name)
             if not path:
-                continue
-            
+                return
+        
             contributions = list(r.get("word_contributions") or [])
             n = len(contributions)
             # Threshold = 1/N (uniform distribution baseline — Observation Law V.3)
             # Strict > comparison: at equilibrium (= 1/N) there's no signal
             threshold_pct = 100.0 / n if n else 0.0
-            
+        
             # V.3 Observation Law: Only words with contribution > 1/N are above noise floor
             # This applies equally to query words and expanded words (no exceptions)
             # Words below threshold are "below noise floor" (INVARIANTS.md lines 273-279)
@@ -723,7 +938,7 @@ def locate_files(
                 # STRICTLY above threshold per V.3 (not >=)
                 if pct > threshold_pct and contrib > 0.0:
                     sig_words.append(word)
-            
+        
             # Fallback: if filter killed everything, take the highest contributor
             # (there must be at least one signal if file matched at all)
             if not sig_words and contributions:
@@ -734,16 +949,16 @@ def locate_files(
                 if not w:
                     continue
                 weights[w] = weights.get(w, 0.0) + float(wc.get("contribution") or 0.0)
-            
+        
             # Coordinate-based preview (Energy Law: use what we already know)
             # Use DIRECT query hashes for epicenter (Invariant IV: Will > Observation)
             direct_line_hashes = file_scores.get(doc_name, {}).get("direct_line_hashes") or {}
             window_limit = 100  # Max contiguous lines to show (Energy Law: prevent token waste)
-            
+        
             if direct_line_hashes:
                 # Find minimum enclosing interval (no magic radius)
                 epicenter, window_start, window_end = _find_epicenter(direct_line_hashes)
-                
+            
                 # OPTIMIZATION: If window is too large, it means matches are too scattered.
                 # Fall back to grep-style scan to pick the best individual lines
                 # and avoid token waste (Invariant III: Energy Law).
@@ -761,9 +976,9 @@ def locate_files(
                         r["signal_words"] = sig_words
                         r["epicenter"] = epicenter
                         r["window"] = {"start": window_start, "end": window_end}
-                        continue
+                        return
 
-            
+        
             # Fallback: grep-style scan (for overlays without line provenance)
             occ = _scan_file_for_words(
                 path=path,
@@ -775,6 +990,14 @@ def locate_files(
                 r["occurrences"] = occ
                 r["signal_words"] = sig_words
 
+        # Previews touch disjoint result dicts; read files concurrently (I/O bound).
+        top = results[: max(0, int(preview_files))]
+        if len(top) > 1:
+            list(_scoring_pool(_PREVIEW_THREADS, True).map(_preview, top))  # one fixed pool
+        else:
+            for r in top:
+                _preview(r)
+
     return {
         "query_words": query_words,
         "files_found": len(results),
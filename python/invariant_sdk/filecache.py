@@ -0,0 +1,370 @@
+"""
+filecache.py — Shared, bounded file-content cache for preview/context reads
+
+Previews (engine.locate_files), anchor context (MCP `context`, UI
+`/api/context`) and operators.read_context_window all read the same hot files
+over and over. This module keeps one decoded copy per file version:
+
+  key   = (resolved path, st_mtime_ns, st_size)   — any edit is a new version
+  value = text + line offsets (built lazily)      — line ranges are slices
+
+Text is decoded like Path.read_text(): universal newlines ("\r\n" and "\r"
+become "\n"), so line numbers agree with ingest. Invalid UTF-8 is dropped
+(errors="ignore") but remembered; strict readers get UnicodeDecodeError.
+
+Two line conventions exist in this repo and both are served from offsets:
+  - newline_only=False: str.splitlines() semantics (previews, operators)
+  - newline_only=True:  text.split("\\n") semantics (ingest line numbers)
+
+Bounds (Invariant III: Energy Law):
+  - files larger than `max_file_bytes` are never cached; line ranges are
+    streamed with O(window) memory instead
+  - total cached size is capped by `max_bytes` (LRU eviction); an entry
+    costs its text plus everything derived from it — offsets, the lowercase
+    copy and memos (estimated with approx_size when built)
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Sequence
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# str.splitlines() boundaries (\r\n first so it is consumed as one separator).
+_LINE_BREAK_RE = re.compile("\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_FILE_BYTES = 8 * 1024 * 1024
+
+# Elements measured per container by approx_size (the rest are extrapolated)
+_SIZE_SAMPLE = 256
+
+
+class CachedFile:
+    """One decoded file version with lazily built line offsets."""
+
+    __slots__ = (
+        "path", "mtime_ns", "size", "text", "lossy", "cost",
+        "_bounds", "_nl_starts", "_lower", "_memo", "_lock", "_owner",
+    )
+
+    def __init__(self, path: str, mtime_ns: int, size: int, text: str, lossy: bool = False):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.text = text
+        self.lossy = lossy  # invalid UTF-8 was dropped while decoding
+        self.cost = size  # bytes charged to the owning cache (text + derived data)
+        self._bounds: Optional[Tuple[array, array]] = None
+        self._nl_starts: Optional[array] = None
+        self._lower: Optional[str] = None
+        self._memo: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._owner: Optional["FileCache"] = None
+
+    def _grow(self, nbytes: int) -> None:
+        """Charge derived data to this entry (and its cache, which may evict others)."""
+        self.cost += nbytes
+        owner = self._owner
+        if owner is not None:
+            owner._charge(self, nbytes)
+
+    # -- offsets ---------------------------------------------------------
+
+    def _line_bounds(self) -> Tuple[array, array]:
+        """(starts, ends) of splitlines() lines."""
+        if self._bounds is None:
+            starts, ends = array("q"), array("q")
+            pos = 0
+            for m in _LINE_BREAK_RE.finditer(self.text):
+                starts.append(pos)
+                ends.append(m.start())
+                pos = m.end()
+            if pos < len(self.text):
+                starts.append(pos)
+                ends.append(len(self.text))
+            self._bounds = (starts, ends)
+            self._grow(2 * starts.itemsize * len(starts))
+        return self._bounds
+
+    def _newline_starts(self) -> array:
+        """Start offsets of split("\\n") lines."""
+        if self._nl_starts is None:
+            starts = array("q", [0])
+            text = self.text
+            i = text.find("\n")
+            while i >= 0:
+                starts.append(i + 1)
+                i = text.find("\n", i + 1)
+            self._nl_starts = starts
+            self._grow(starts.itemsize * len(starts))
+        return self._nl_starts
+
+    def line_count(self, *, newline_only: bool = False) -> int:
+        if newline_only:
+            return len(self._newline_starts())
+        return len(self._line_bounds()[0])
+
+    def _span(self, idx: int, newline_only: bool) -> Tuple[int, int]:
+        if newline_only:
+            starts = self._newline_starts()
+            end = starts[idx + 1] - 1 if idx + 1 < len(starts) else len(self.text)
+            return starts[idx], end
+        starts, ends = self._line_bounds()
+        return starts[idx], ends[idx]
+
+    def lines(self, start: int, end: int, *, newline_only: bool = False, lower: bool = False) -> List[str]:
+        """Lines [start, end] (1-indexed, inclusive, clamped) without re-splitting."""
+        n = self.line_count(newline_only=newline_only)
+        lo = max(1, start)
+        hi = min(n, end)
+        src = self.lower if lower and self.lower_aligned else self.text
+        out = []
+        for i in range(lo - 1, hi):
+            a, b = self._span(i, newline_only)
+            out.append(src[a:b])
+        if lower and not self.lower_aligned:
+            out = [s.lower() for s in out]
+        return out
+
+    def line_view(self, *, newline_only: bool = False) -> "LineView":
+        """Read-only list-like view of all lines (indexing slices on demand)."""
+        return LineView(self, newline_only)
+
+    def line_at(self, offset: int, *, newline_only: bool = False) -> int:
+        """1-indexed line containing a character offset."""
+        starts = self._newline_starts() if newline_only else self._line_bounds()[0]
+        return max(1, bisect_right(starts, offset))
+
+    def line_span(self, line: int, *, newline_only: bool = False) -> Tuple[int, int]:
+        """Character [start, end) of a 1-indexed line (end excludes the break)."""
+        return self._span(line - 1, newline_only)
+
+    # -- derived views ---------------------------------------------------
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+            self._grow(self.size)
+        return self._lower
+
+    @property
+    def lower_aligned(self) -> bool:
+        """True if lowercasing preserved every offset (no length-changing chars)."""
+        return len(self.lower) == len(self.text)
+
+    def memo(self, key: str, build: Callable[[str], Any]) -> Any:
+        """Per-version memo for derived data (tokens, hash windows, ...); counts toward the cache bound."""
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+            value = self._memo[key] = build(self.text)
+        self._grow(approx_size(value))
+        return value
+
+
+class LineView(Sequence):
+    """0-indexed lines of a CachedFile; drop-in for `text.split("\\n")` reads."""
+
+    __slots__ = ("_entry", "_newline_only", "_n")
+
+    def __init__(self, entry: CachedFile, newline_only: bool):
+        self._entry = entry
+        self._newline_only = newline_only
+        self._n = entry.line_count(newline_only=newline_only)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self._n))]
+        if idx < 0:
+            idx += self._n
+        if not 0 <= idx < self._n:
+            raise IndexError("line index out of range")
+        a, b = self._entry._span(idx, self._newline_only)
+        return self._entry.text[a:b]
+
+
+class FileCache:
+    """LRU cache of CachedFile versions, bounded by total text size."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_file_bytes: int = DEFAULT_MAX_FILE_BYTES):
+        self.max_bytes = int(max_bytes)
+        self.max_file_bytes = int(max_file_bytes)
+        self._entries: "OrderedDict[str, CachedFile]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Union[str, Path], *, strict: bool = False) -> Optional[CachedFile]:
+        """
+        Current version of a file, or None if unreadable or above the size bound.
+
+        A changed (mtime, size) replaces the stale entry. With `strict`, a file
+        that is not valid UTF-8 raises UnicodeDecodeError (as read_text does).
+        """
+        p = Path(path)
+        try:
+            st = p.stat()
+        except OSError:
+            return None
+        if st.st_size > self.max_file_bytes:
+            return None
+        key = str(p.resolve())
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _checked(entry, strict)
+
+        try:
+            text, lossy = decode_text(p.read_bytes())
+        except OSError:
+            return None
+        entry = CachedFile(key, st.st_mtime_ns, st.st_size, text, lossy)
+
+        with self._lock:
+            self.misses += 1
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.cost
+            self._entries[key] = entry
+            self._bytes += entry.cost
+            entry._owner = self
+            self._evict()
+        return _checked(entry, strict)
+
+    def _charge(self, entry: CachedFile, nbytes: int) -> None:
+        """Account derived data built on a live entry; the entry itself is kept (most recent)."""
+        with self._lock:
+            if self._entries.get(entry.path) is not entry:
+                return  # already evicted or replaced
+            self._bytes += nbytes
+            self._entries.move_to_end(entry.path)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _k, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.cost
+            evicted._owner = None
+
+    def read_lines(
+        self,
+        path: Union[str, Path],
+        start: int,
+        end: int,
+        *,
+        newline_only: bool = False,
+    ) -> Optional[List[str]]:
+        """
+        Lines [start, end] of a file (1-indexed, inclusive, clamped).
+
+        Cached files are sliced from offsets; files above the size bound are
+        streamed so memory stays O(window) regardless of file size.
+        """
+        entry = self.get(path)
+        if entry is not None:
+            return entry.lines(start, end, newline_only=newline_only)
+        if start > end:
+            return []
+        try:
+            return list(islice(iter_lines(path, newline_only=newline_only), max(0, start - 1), max(0, end)))
+        except OSError:
+            return None
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                entry._owner = None
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def decode_text(data: bytes) -> Tuple[str, bool]:
+    """(text, lossy): UTF-8 with universal newlines, like Path.read_text()."""
+    try:
+        text = data.decode("utf-8")
+        lossy = False
+    except UnicodeDecodeError:
+        text = data.decode("utf-8", errors="ignore")
+        lossy = True
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text, lossy
+
+
+def approx_size(obj: Any, depth: int = 3) -> int:
+    """
+    Rough deep size in bytes, for cache accounting.
+
+    Containers are measured on a sample of `_SIZE_SAMPLE` elements and
+    extrapolated; objects are measured through __slots__ / __dict__.
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, memoryview):
+        return size + obj.nbytes
+    if depth <= 0 or isinstance(obj, (str, bytes, bytearray, int, float, bool, array)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        n = len(obj)
+        sample = list(islice(obj.items(), _SIZE_SAMPLE))
+        part = sum(approx_size(k, depth - 1) + approx_size(v, depth - 1) for k, v in sample)
+        return size + (part * n // len(sample) if sample else 0)
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        n = len(obj)
+        sample = list(islice(obj, _SIZE_SAMPLE))
+        part = sum(approx_size(v, depth - 1) for v in sample)
+        return size + (part * n // len(sample) if sample else 0)
+    slots = getattr(type(obj), "__slots__", ())
+    names = [slots] if isinstance(slots, str) else list(slots)
+    names.extend(getattr(obj, "__dict__", {}))
+    for name in names:
+        value = getattr(obj, name, None)
+        if value is not None and not callable(value):
+            size += approx_size(value, depth - 1)
+    return size
+
+
+def _checked(entry: CachedFile, strict: bool) -> CachedFile:
+    if strict and entry.lossy:
+        raise UnicodeDecodeError("utf-8", b"", 0, 1, f"invalid UTF-8 in {entry.path}")
+    return entry
+
+
+def iter_lines(path: Union[str, Path], *, newline_only: bool = False):
+    """Stream lines with the same boundaries as split("\\n") / splitlines() of decode_text()."""
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        terminated = True  # split("\n") always yields a (possibly empty) last line
+        for piece in f:
+            terminated = piece.endswith("\n")
+            if newline_only:
+                yield piece[:-1] if terminated else piece
+            else:
+                yield from piece.splitlines()
+        if newline_only and terminated:
+            yield ""
+
+
+_shared_cache = FileCache()
+
+
+def shared_file_cache() -> FileCache:
+    """Process-wide cache shared by engine previews, operators, MCP and UI."""
+    return _shared_cache
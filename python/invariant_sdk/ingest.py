@@ -0,0 +1,1108 @@
+"""
+ingest.py — Ingest engine (files → σ-edges), shared by CLI, MCP and UI
+
+Stages (each timed in IngestTimings):
+  1. discover — os.scandir walk that prunes protocol/build and gitignored
+                directories (nested .gitignore files honoured), text sniffing
+                in a thread pool; at most `window` files are in flight, so
+                discovery never runs ahead unbounded
+  2. read     — worker processes stream each file in STREAM_CHUNK pieces
+                (content digest for the manifest computed on the fly)
+  3. tokenize — same workers tokenize the line stream, hash8 every distinct
+                word and, for adjacent edges, pre-build candidate edges
+                (ctx_hash from a sliding window; no token list is kept)
+  4. meta     — the writer fetches crystal meta in chunks as new vocabulary
+                appears (each hash8 is asked for once per run)
+  5. edges    — one writer applies the edge policy and merges edges into the
+                overlay, in submission order (same overlay as a serial run)
+  6. save     — the front end persists; timed via IngestTimings.stage("save")
+
+Edge policies (one per front end, unchanged semantics):
+  ADJACENT          — consecutive tokens, solid/gas by mass, gas→gas dropped,
+                      first MAX_UNIQUE_WORDS distinct words classified (inv ingest)
+  HUB_ANCHORS       — consecutive occurrences of every non-hub word (MCP ingest)
+  CONDENSED_ANCHORS — consecutive occurrences of words solid by mass or local
+                      TF (Law of Condensation; UI ingest / reindex)
+
+Memory is bounded by in-flight + buffered files, not corpus size, and per
+file by its vocabulary and edges, not its byte size (Invariant III: Energy Law).
+
+Incremental runs consult an IngestManifest (doc → size, mtime, digest, edges)
+persisted next to the overlay: stat-identical files are skipped without being
+opened, files whose content digest is unchanged are skipped after one read,
+and docs that vanished from the tree lose their σ-edges.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import time
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .halo import hash8_hex
+from .overlay import OverlayEdge, OverlayGraph
+from .tokenize import STREAM_CHUNK, iter_binary_lines, iter_tokens_with_lines
+
+# Edge policies
+ADJACENT = "adjacent"
+HUB_ANCHORS = "hub_anchors"
+CONDENSED_ANCHORS = "condensed_anchors"
+EDGE_POLICIES = (ADJACENT, HUB_ANCHORS, CONDENSED_ANCHORS)
+
+# Distinct words per file whose phase is looked up (later words count as gas)
+MAX_UNIQUE_WORDS = 200
+
+# Hashes per crystal meta request (empirically safe payload size)
+META_CHUNK = 4000
+
+# Scanned files held by the writer while their vocabulary is pending
+MAX_BUFFERED_DOCS = 64
+
+# Threads sniffing the first 512 bytes of candidate files
+SNIFF_WORKERS = 8
+
+# Anchor policies fall back to the top-N words by mass when too few qualify
+ANCHOR_FALLBACK_TOP = 64
+
+MANIFEST_VERSION = 1
+
+
+class MetaFetchError(RuntimeError):
+    """Crystal meta lookup failed mid-ingest (wraps whatever fetch_meta raised)."""
+
+# Protocol / build artifacts never ingested (prevents self-indexing .invariant, etc.)
+DEFAULT_IGNORED_DIRS = frozenset({
+    ".git", ".invariant", "__pycache__", ".venv", "venv", "node_modules", "dist", "build",
+})
+
+
+def compute_ctx_hash(tokens_with_pos: List[tuple], anchor_idx: int, k: int = 2) -> str:
+    """
+    Compute semantic checksum for anchor (Anchor Integrity Protocol).
+
+    Args:
+        tokens_with_pos: List of (word, line, ...) tuples
+        anchor_idx: Index of anchor word in the list
+        k: Window size (±k words around anchor)
+
+    Returns:
+        8 hex characters of SHA-256 hash of normalized anchor window
+
+    Theory: This is the "DNA" of the σ-fact. If context changes, hash changes.
+    Used for drift detection and self-healing.
+    """
+    # Get window [anchor_idx - k, anchor_idx + k]
+    start = max(0, anchor_idx - k)
+    end = min(len(tokens_with_pos), anchor_idx + k + 1)
+
+    # Normalize: lowercase, join with single space
+    normalized = ' '.join(tokens_with_pos[i][0].lower() for i in range(start, end))
+
+    # Hash and truncate to 8 hex chars
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()[:8]
+
+
+class CtxHashIndex:
+    """
+    All ctx_hash windows of one tokenized document, from one joined buffer.
+
+    The ±k window around token i is a contiguous slice of the space-joined,
+    lowercased words, so every hash is SHA-256 over a memoryview slice: no
+    per-window slicing, lowercasing or joining. Tokens of a line are
+    contiguous, so hashes_at_line() touches only that line's tokens.
+
+    Same hashes as compute_ctx_hash(tokens, i, k).
+    """
+
+    __slots__ = ("words", "lines", "k", "_view", "_starts", "_ends", "_ranges", "_by_line")
+
+    def __init__(self, tokens: Sequence[tuple], k: int = 2):
+        self.words = [t[0] for t in tokens]
+        self.lines = [t[1] for t in tokens] if tokens and len(tokens[0]) > 1 else []
+        self.k = k
+        lowered = [w.lower() for w in self.words]
+        joined = ' '.join(lowered)
+        data = joined.encode('utf-8')
+        if len(data) == len(joined):
+            sizes = [len(w) for w in lowered]
+        else:
+            sizes = [len(w.encode('utf-8')) for w in lowered]
+        starts: List[int] = []
+        ends: List[int] = []
+        pos = 0
+        for size in sizes:
+            starts.append(pos)
+            ends.append(pos + size)
+            pos += size + 1
+        self._view = memoryview(data)
+        self._starts = starts
+        self._ends = ends
+        self._ranges: Optional[Dict[int, Tuple[int, int]]] = None
+        self._by_line: Dict[int, List[Tuple[str, str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def hash_at(self, idx: int) -> str:
+        """ctx_hash of the window centred on token `idx`."""
+        k = self.k
+        start = idx - k if idx > k else 0
+        end = min(len(self._starts), idx + k + 1)
+        window = self._view[self._starts[start]:self._ends[end - 1]]
+        return hashlib.sha256(window).hexdigest()[:8]
+
+    def hashes(self) -> Iterator[str]:
+        """ctx_hash of every token, in token order (one pass)."""
+        sha256 = hashlib.sha256
+        view, starts, ends, k = self._view, self._starts, self._ends, self.k
+        n = len(starts)
+        for idx in range(n):
+            start = idx - k if idx > k else 0
+            end = idx + k + 1 if idx + k + 1 < n else n
+            yield sha256(view[starts[start]:ends[end - 1]]).hexdigest()[:8]
+
+    def line_range(self, line: int) -> Tuple[int, int]:
+        """Token index range [start, end) on a 1-based line (empty if none)."""
+        if self._ranges is None:
+            ranges: Dict[int, Tuple[int, int]] = {}
+            for idx, ln in enumerate(self.lines):
+                first = ranges.get(ln)
+                ranges[ln] = (idx if first is None else first[0], idx + 1)
+            self._ranges = ranges
+        return self._ranges.get(line, (0, 0))
+
+    def hashes_at_line(self, line: int) -> List[Tuple[str, str]]:
+        """(ctx_hash, word) for every token on `line` (memoized)."""
+        cached = self._by_line.get(line)
+        if cached is None:
+            start, end = self.line_range(line)
+            cached = [(self.hash_at(i), self.words[i]) for i in range(start, end)]
+            self._by_line[line] = cached
+        return cached
+
+
+def iter_ctx_hashes(
+    tokens: Iterable[tuple],
+    k: int = 2,
+    want: Optional[Callable[[tuple], bool]] = None,
+) -> Iterator[Tuple[tuple, Optional[str]]]:
+    """
+    Streaming ctx_hash: (token, hash) in token order, holding 2k+1 tokens.
+
+    Each token is yielded once its k right neighbours have arrived (or the
+    stream ended). want(token) is asked in arrival order; tokens it rejects
+    come back with hash None and are never hashed. Same hashes as
+    compute_ctx_hash over the whole list.
+    """
+    sha256 = hashlib.sha256
+    window: deque = deque()  # lowered words [next - k, newest]
+    pending: deque = deque()  # (token, wanted) not yet yielded
+    before = 0  # words in `window` ahead of the next token to yield
+    for token in tokens:
+        window.append(token[0].lower())
+        pending.append((token, want is None or want(token)))
+        if len(pending) > k:
+            token, wanted = pending.popleft()
+            yield token, sha256(' '.join(window).encode('utf-8')).hexdigest()[:8] if wanted else None
+            if before < k:
+                before += 1
+            else:
+                window.popleft()
+    while pending:
+        token, wanted = pending.popleft()
+        yield token, sha256(' '.join(window).encode('utf-8')).hexdigest()[:8] if wanted else None
+        if before < k:
+            before += 1
+        else:
+            window.popleft()
+
+
+# =============================================================================
+# Stage 1: discovery
+# =============================================================================
+
+def is_text_file(file_path: Path) -> bool:
+    """
+    UTF-8 decodable first 512 bytes.
+
+    Theory: Observable property, not heuristic - works for ALL languages.
+    """
+    if not file_path.is_file():
+        return False
+    try:
+        with open(file_path, 'rb') as f:
+            sample = f.read(512)
+        sample.decode('utf-8', errors='strict')
+        return True
+    except (UnicodeDecodeError, OSError):
+        return False
+
+
+@dataclass
+class DiscoveryStats:
+    """Walk counters; elapsed_s excludes time the consumer holds the generator."""
+    dirs: int = 0
+    pruned_dirs: int = 0  # default-ignored or gitignored, never entered
+    files: int = 0  # candidate files yielded by the walk
+    ignored_files: int = 0  # dropped by a .gitignore
+    text_files: int = 0  # passed the text sniff
+    elapsed_s: float = 0.0
+
+    @property
+    def files_per_s(self) -> float:
+        return self.files / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {**vars(self), "elapsed_s": round(self.elapsed_s, 3), "files_per_s": round(self.files_per_s, 1)}
+
+
+def _load_gitignore(dir_path: str):
+    """PathSpec of `dir_path`/.gitignore, or None (missing, unreadable, no pathspec)."""
+    gitignore_path = os.path.join(dir_path, '.gitignore')
+    if not os.path.isfile(gitignore_path):
+        return None
+    try:
+        import pathspec
+        with open(gitignore_path, encoding='utf-8') as f:
+            return pathspec.PathSpec.from_lines('gitwildmatch', f.read().splitlines())
+    except Exception:
+        return None
+
+
+def _gitignored(specs: Tuple[Tuple[str, object], ...], rel: str) -> bool:
+    """
+    Git precedence over nested .gitignore files: patterns are relative to
+    their own directory, the last matching pattern wins and deeper files
+    override shallower ones (`!pattern` re-includes).
+    """
+    decision = None
+    for base, spec in specs:
+        sub = rel[len(base):]
+        for pattern in spec.patterns:
+            if pattern.include is not None and pattern.regex.match(sub):
+                decision = pattern.include
+    return bool(decision)
+
+
+def iter_files(input_path: Path, *, stats: Optional[DiscoveryStats] = None) -> Iterator[Path]:
+    """
+    Candidate files under `input_path` (the path itself if it is a file).
+
+    os.scandir walk in sorted order that never enters default-ignored or
+    gitignored directories; every directory's .gitignore (when pathspec is
+    installed) applies below it. No extension filtering and no text
+    sniffing (see iter_text_files). Directory symlinks are not followed.
+    """
+    input_path = Path(input_path)
+    stats = stats if stats is not None else DiscoveryStats()
+    if input_path.is_file():
+        stats.files += 1
+        yield input_path
+        return
+
+    t0 = time.perf_counter()
+    stack: List[Tuple[str, str, Tuple[Tuple[str, object], ...]]] = [(str(input_path), "", ())]
+    while stack:
+        dir_path, rel_dir, specs = stack.pop()
+        stats.dirs += 1
+        spec = _load_gitignore(dir_path)
+        if spec is not None:
+            specs = specs + ((rel_dir, spec),)
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            rel = rel_dir + name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if (
+                        name in DEFAULT_IGNORED_DIRS
+                        or name.endswith(".egg-info")
+                        or (specs and _gitignored(specs, rel + "/"))
+                    ):
+                        stats.pruned_dirs += 1
+                    else:
+                        subdirs.append((entry.path, rel + "/", specs))
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if specs and _gitignored(specs, rel):
+                stats.ignored_files += 1
+                continue
+            stats.files += 1
+            stats.elapsed_s += time.perf_counter() - t0
+            yield Path(entry.path)
+            t0 = time.perf_counter()
+        stack.extend(reversed(subdirs))
+    stats.elapsed_s += time.perf_counter() - t0
+
+
+def iter_text_files(
+    paths: Iterable[Path],
+    *,
+    workers: int = SNIFF_WORKERS,
+    window: int = 0,
+    stats: Optional[DiscoveryStats] = None,
+) -> Iterator[Path]:
+    """
+    Paths that pass is_text_file, in input order, sniffed by a thread pool
+    (the 512-byte reads are I/O bound) with at most `window` in flight.
+    """
+    if workers <= 1:
+        for path in paths:
+            if is_text_file(path):
+                if stats is not None:
+                    stats.text_files += 1
+                yield path
+        return
+
+    window = window or workers * 4
+    pool = ThreadPoolExecutor(max_workers=workers)
+    pending: deque = deque()
+    try:
+        for path in paths:
+            pending.append((path, pool.submit(is_text_file, path)))
+            while len(pending) >= window or (pending and pending[0][1].done()):
+                head, future = pending.popleft()
+                if future.result():
+                    if stats is not None:
+                        stats.text_files += 1
+                    yield head
+        while pending:
+            head, future = pending.popleft()
+            if future.result():
+                if stats is not None:
+                    stats.text_files += 1
+                yield head
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+# =============================================================================
+# Stages 2-3: read + tokenize (worker side)
+# =============================================================================
+
+@dataclass
+class ScannedDoc:
+    """Everything about one file that does not depend on crystal meta."""
+    path: str
+    doc: str
+    words: List[str]  # distinct words, first-appearance order (empty: < 2 tokens)
+    hashes: List[str]  # hash8 per word
+    # ADJACENT: (src word idx, tgt word idx, tgt line, ctx_hash) per consecutive
+    # token pair that is not gas→gas for sure (both words beyond max_words)
+    edges: List[Tuple[int, int, int, str]]
+    max_words: int = MAX_UNIQUE_WORDS
+    size: int = 0
+    mtime_ns: int = 0
+    digest: str = ""
+    unchanged: bool = False  # digest matched the manifest; nothing was tokenized
+    # Anchor policies: word index + line per token, as array("I") (edges need
+    # crystal meta first)
+    seq: Sequence[int] = field(default_factory=list)
+    lines: Sequence[int] = field(default_factory=list)
+    read_s: float = 0.0
+    tokenize_s: float = 0.0
+
+
+def content_digest(data: bytes) -> str:
+    """Content fingerprint recorded in the manifest (16 hex chars of SHA-256)."""
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def scan_tokens(
+    tokens: Iterable[Tuple[str, int]],
+    doc: str,
+    *,
+    path: str = "",
+    max_words: Optional[int] = MAX_UNIQUE_WORDS,
+    policy: str = ADJACENT,
+) -> ScannedDoc:
+    """
+    Hash8 + candidate edges from a (word, line) stream, in one pass.
+
+    Only the vocabulary and the policy's output are kept: ADJACENT edges
+    (ctx_hash from a 2k+1 sliding window) or the compact per-token
+    word/line arrays of the anchor policies, never the token list.
+    max_words=None classifies every distinct word. Fewer than 2 tokens
+    gives a ScannedDoc with no words.
+    """
+    scanned = ScannedDoc(path=path, doc=doc, words=[], hashes=[], edges=[])
+    index: Dict[str, int] = {}
+
+    def indexed() -> Iterator[Tuple[str, int, int]]:
+        for word, line in tokens:
+            idx = index.get(word)
+            if idx is None:
+                idx = index[word] = len(index)
+            yield word, line, idx
+
+    n_tokens = 0
+    if policy == ADJACENT:
+        cap = math.inf if max_words is None else max_words
+        edges = scanned.edges
+        arrived = -1
+
+        def wanted(token: Tuple[str, int, int]) -> bool:
+            # Not gas→gas for sure: one end among the first `cap` words
+            nonlocal arrived
+            src_idx, arrived = arrived, token[2]
+            return src_idx >= 0 and (src_idx < cap or arrived < cap)
+
+        src_idx = -1
+        for (_word, line, tgt_idx), ctx_hash in iter_ctx_hashes(indexed(), k=2, want=wanted):
+            if ctx_hash is not None:
+                edges.append((src_idx, tgt_idx, line, ctx_hash))
+            src_idx = tgt_idx
+            n_tokens += 1
+    else:
+        seq, lines = array("I"), array("I")
+        for _word, line, idx in indexed():
+            seq.append(idx)
+            lines.append(line)
+        scanned.seq, scanned.lines = seq, lines
+        n_tokens = len(seq)
+
+    if n_tokens < 2:
+        scanned.edges, scanned.seq, scanned.lines = [], [], []
+        scanned.max_words = max_words or 0
+        return scanned
+    words = list(index)
+    scanned.words = words
+    scanned.hashes = [hash8_hex(f"Ġ{w}") for w in words]
+    scanned.max_words = len(words) if max_words is None else max_words
+    return scanned
+
+
+def scan_text(
+    text: str,
+    doc: str,
+    *,
+    path: str = "",
+    max_words: Optional[int] = MAX_UNIQUE_WORDS,
+    policy: str = ADJACENT,
+) -> ScannedDoc:
+    """Tokenize + hash8 one document already in memory (see scan_tokens)."""
+    t0 = time.perf_counter()
+    scanned = scan_tokens(
+        iter_tokens_with_lines(text.split("\n")), doc, path=path, max_words=max_words, policy=policy
+    )
+    scanned.tokenize_s = time.perf_counter() - t0
+    return scanned
+
+
+class _DigestReader:
+    """Binary reader that feeds content_digest and times its reads."""
+
+    __slots__ = ("_f", "_sha", "read_s")
+
+    def __init__(self, f) -> None:
+        self._f = f
+        self._sha = hashlib.sha256()
+        self.read_s = 0.0
+
+    def read(self, n: int) -> bytes:
+        t0 = time.perf_counter()
+        data = self._f.read(n)
+        self._sha.update(data)
+        self.read_s += time.perf_counter() - t0
+        return data
+
+    def digest(self) -> str:
+        return self._sha.hexdigest()[:16]
+
+
+def scan_document(
+    path: str,
+    doc: str,
+    max_words: Optional[int] = MAX_UNIQUE_WORDS,
+    known_digest: Optional[str] = None,
+    policy: str = ADJACENT,
+    chunk_size: int = STREAM_CHUNK,
+) -> Optional[ScannedDoc]:
+    """
+    Stages 2-3 (worker): read + tokenize + hash8 (+ candidate edges) for one file.
+
+    The file is streamed in `chunk_size` pieces through the tokenizer, so
+    memory follows the vocabulary and edges, not the file size. Returns
+    None for unreadable or non-UTF-8 files. With `known_digest` the file is
+    digested first; if it matches, the ScannedDoc comes back unchanged=True
+    and is not tokenized. Fewer than 2 tokens gives no words.
+    """
+    t0 = time.perf_counter()
+    try:
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if known_digest is not None:
+                reader = _DigestReader(f)
+                while reader.read(chunk_size):
+                    pass
+                if reader.digest() == known_digest:
+                    scanned = ScannedDoc(path=path, doc=doc, words=[], hashes=[], edges=[], unchanged=True)
+                    scanned.digest = known_digest
+                    scanned.size, scanned.mtime_ns = st.st_size, st.st_mtime_ns
+                    scanned.read_s = time.perf_counter() - t0
+                    return scanned
+                f.seek(0)
+            reader = _DigestReader(f)
+            # Same lines as Path.read_text (universal newlines)
+            lines = iter_binary_lines(reader, chunk_size=chunk_size)
+            scanned = scan_tokens(
+                iter_tokens_with_lines(lines), doc, path=path, max_words=max_words, policy=policy
+            )
+    except (OSError, ValueError):  # ValueError: UnicodeDecodeError
+        return None
+    scanned.size = st.st_size
+    scanned.mtime_ns = st.st_mtime_ns
+    scanned.digest = reader.digest()
+    scanned.read_s = reader.read_s
+    scanned.tokenize_s = time.perf_counter() - t0 - reader.read_s
+    return scanned
+
+
+def _timed_items(items: Iterable[Tuple], timings: "IngestTimings") -> Iterator[Tuple]:
+    # Time spent producing items is the discovery stage
+    it = iter(items)
+    while True:
+        t0 = time.perf_counter()
+        try:
+            item = next(it)
+        except StopIteration:
+            timings.discover += time.perf_counter() - t0
+            return
+        timings.discover += time.perf_counter() - t0
+        yield item
+
+
+def iter_scanned(
+    items: Iterable[Tuple],
+    *,
+    workers: int = 1,
+    window: int = 0,
+    max_words: Optional[int] = MAX_UNIQUE_WORDS,
+    policy: str = ADJACENT,
+    timings: Optional["IngestTimings"] = None,
+) -> Iterator[ScannedDoc]:
+    """
+    Scan (path, doc) or (path, doc, known_digest) items in input order.
+
+    workers > 1 uses a process pool with at most `window` files in flight
+    (default 4 per worker); the input iterator is consumed lazily.
+    """
+    if timings is not None:
+        items = _timed_items(items, timings)
+
+    if workers <= 1:
+        for path, doc, *known in items:
+            known_digest = known[0] if known else None
+            scanned = scan_document(path, doc, max_words, known_digest, policy)
+            if scanned is not None:
+                yield scanned
+        return
+
+    window = window or workers * 4
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending: deque = deque()
+    try:
+        for path, doc, *known in items:
+            known_digest = known[0] if known else None
+            pending.append(pool.submit(scan_document, path, doc, max_words, known_digest, policy))
+            if len(pending) >= window:
+                scanned = pending.popleft().result()
+                if scanned is not None:
+                    yield scanned
+        while pending:
+            scanned = pending.popleft().result()
+            if scanned is not None:
+                yield scanned
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+# =============================================================================
+# Phase / anchor selection (needs crystal meta)
+# =============================================================================
+
+def word_phase(result: Optional[dict], mean_mass: float) -> str:
+    """'solid' | 'gas' from a crystal meta result (unknown words are solid)."""
+    res = result or {}
+    if res.get("exists"):
+        meta = res.get("meta") or {}
+        degree = int(meta.get("degree_total") or 1)
+        mass = 1.0 / math.log(2 + degree) if degree > 0 else 0.5
+        return "solid" if mass >= mean_mass else "gas"
+    # THEORY: Unknown = Local Anchor (rare, high information)
+    return "solid"
+
+
+def word_mass(result: Optional[dict]) -> Tuple[float, int, bool]:
+    """(mass, degree_total, exists) for anchor selection; unknown words weigh 1.0."""
+    res = result or {}
+    if not res.get("exists"):
+        # Unknown words are local anchors (σ) by definition.
+        return 1.0, 0, False
+    meta = res.get("meta") or {}
+    try:
+        degree = int(meta.get("degree_total") or 0)
+    except (TypeError, ValueError):
+        degree = 0
+    mass = 1.0 / math.log(2 + degree) if degree > 0 else 0.0
+    return mass, degree, True
+
+
+def _top_by_mass(masses: List[Tuple[float, int, bool]]) -> Set[int]:
+    order = sorted(range(len(masses)), key=lambda i: masses[i][0], reverse=True)
+    return set(order[:ANCHOR_FALLBACK_TOP])
+
+
+def select_anchors(
+    scanned: ScannedDoc,
+    results: List[Optional[dict]],
+    policy: str,
+    mean_mass: float,
+    n_labels: int,
+) -> Set[int]:
+    """
+    Word indices of `scanned` that become anchors under an anchor policy.
+
+    HUB_ANCHORS (INVARIANT VII: σ-presence wins): every word except hubs
+    (degree > √N_labels); OOV words always count.
+    CONDENSED_ANCHORS (Law of Condensation, INVARIANTS V.1): solid iff
+    mass > μ_mass or local TF > mean TF (LINK words excluded from condensing).
+    Both fall back to the top ANCHOR_FALLBACK_TOP words by mass.
+    """
+    masses = [word_mass(res) for res in results]
+    threshold = math.sqrt(max(1, n_labels))
+
+    if policy == HUB_ANCHORS:
+        solid = {
+            i for i, (_mass, degree, exists) in enumerate(masses)
+            if not exists or degree <= threshold
+        }
+    elif policy == CONDENSED_ANCHORS:
+        solid = {i for i, (mass, _degree, _exists) in enumerate(masses) if mass > mean_mass}
+        counts = Counter(scanned.seq)
+        tf_mean = (sum(counts.values()) / len(counts)) if counts else 0.0
+        solid.update(
+            i for i, count in counts.items()
+            if count > tf_mean and (not masses[i][2] or float(masses[i][1]) <= threshold)
+        )
+    else:
+        raise ValueError(f"Not an anchor policy: {policy}")
+
+    return solid if len(solid) >= 2 else _top_by_mass(masses)
+
+
+# =============================================================================
+# Manifest (incremental ingest)
+# =============================================================================
+
+def manifest_path(overlay_path: Path) -> Path:
+    """Manifest stored next to an overlay: overlay.jsonl → overlay.manifest.json."""
+    return Path(overlay_path).with_suffix(".manifest.json")
+
+
+@dataclass
+class ManifestEntry:
+    """What was ingested for one doc."""
+    size: int
+    mtime_ns: int
+    digest: str
+    edges: int
+    root: str  # resolved ingest root the doc name is relative to
+
+
+@dataclass
+class IngestManifest:
+    """doc → ManifestEntry for every file an ingest has seen."""
+    docs: Dict[str, ManifestEntry] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> "IngestManifest":
+        """Manifest from disk; empty if missing, unreadable or another version."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            if payload.get("version") != MANIFEST_VERSION:
+                return cls()
+            return cls({doc: ManifestEntry(**entry) for doc, entry in payload["docs"].items()})
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return cls()
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        payload = {
+            "version": MANIFEST_VERSION,
+            "docs": {doc: vars(entry) for doc, entry in self.docs.items()},
+        }
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        tmp.replace(path)
+
+    def current(self, doc: str, root: str) -> Optional[ManifestEntry]:
+        """Entry for `doc` if it was ingested from `root` (None otherwise)."""
+        entry = self.docs.get(doc)
+        return entry if entry is not None and entry.root == root else None
+
+    @staticmethod
+    def stat_matches(entry: ManifestEntry, st: os.stat_result) -> bool:
+        """Size + mtime unchanged: skip without reading."""
+        return entry.size == st.st_size and entry.mtime_ns == st.st_mtime_ns
+
+
+# =============================================================================
+# Stages 4-5: meta + edges (single writer)
+# =============================================================================
+
+@dataclass
+class IngestTimings:
+    """Seconds per stage (read / tokenize are summed over workers)."""
+    discover: float = 0.0
+    read: float = 0.0
+    tokenize: float = 0.0
+    meta: float = 0.0
+    edges: float = 0.0
+    save: float = 0.0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            setattr(self, name, getattr(self, name) + time.perf_counter() - t0)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(value, 3) for name, value in vars(self).items()}
+
+
+@dataclass
+class IngestReport:
+    """Counters for one ingest run."""
+    docs: int = 0  # docs written (with at least 2 tokens)
+    edges: int = 0
+    anchors: int = 0  # anchor policies: anchor words over all docs
+    replaced_edges: int = 0
+    meta_requests: int = 0
+    meta_hashes: int = 0
+    files_found: int = 0  # text files discovered (skipped ones included)
+    files_read: int = 0
+    # Manifest bookkeeping (doc-level outcome of an incremental run)
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    skipped: int = 0
+    removed_docs: List[str] = field(default_factory=list)
+    discovery: DiscoveryStats = field(default_factory=DiscoveryStats)
+    timings: IngestTimings = field(default_factory=IngestTimings)
+
+
+@dataclass
+class IngestWriter:
+    """
+    Stages 4-5: single writer that owns the overlay (and optional WindowStats).
+
+    Scanned docs are buffered until their vocabulary's crystal meta is known;
+    meta is fetched in META_CHUNK batches once enough new hashes accumulate
+    (or the buffer is full), then buffered docs are merged in order.
+
+    fetch_meta(hashes) → {hash8: result} must raise on transport failure
+    (surfaced as MetaFetchError; every other exception is a bug and propagates);
+    on_doc(scanned, removed_edges, added_edges) reports progress per doc and
+    on_meta(report) per meta request. With a manifest, every written doc is
+    recorded under `root`.
+    """
+    overlay: OverlayGraph
+    fetch_meta: Callable[[List[str]], Dict[str, dict]]
+    mean_mass: float
+    stats: Optional[object] = None  # operators.WindowStats, maintained by delta
+    on_doc: Optional[Callable[[ScannedDoc, int, int], None]] = None
+    on_meta: Optional[Callable[[IngestReport], None]] = None
+    manifest: Optional[IngestManifest] = None
+    root: str = ""
+    policy: str = ADJACENT
+    max_words: Optional[int] = MAX_UNIQUE_WORDS  # ADJACENT only; None: classify every word
+    n_labels: int = 1  # crystal vocabulary size (anchor policies' hub threshold)
+    meta_chunk: int = META_CHUNK
+    max_buffered: int = MAX_BUFFERED_DOCS
+    report: IngestReport = field(default_factory=IngestReport)
+    _meta: Dict[str, dict] = field(default_factory=dict, repr=False)
+    _wanted: Dict[str, None] = field(default_factory=dict, repr=False)  # ordered set
+    _buffer: List[ScannedDoc] = field(default_factory=list, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.policy not in EDGE_POLICIES:
+            raise ValueError(f"Unknown edge policy: {self.policy}")
+
+    @property
+    def scan_max_words(self) -> Optional[int]:
+        """Word cap scanners should apply (anchor policies classify every word)."""
+        return self.max_words if self.policy == ADJACENT else None
+
+    def add(self, scanned: ScannedDoc) -> None:
+        timings = self.report.timings
+        timings.read += scanned.read_s
+        timings.tokenize += scanned.tokenize_s
+        self.report.files_read += 1
+        for h8 in scanned.hashes[: scanned.max_words]:
+            if h8 not in self._meta:
+                self._wanted[h8] = None
+        self._buffer.append(scanned)
+        if len(self._wanted) >= self.meta_chunk or len(self._buffer) >= self.max_buffered:
+            self.flush()
+
+    def flush(self) -> None:
+        """Fetch pending meta, then merge every buffered doc."""
+        wanted = list(self._wanted)
+        with self.report.timings.stage("meta"):
+            for start in range(0, len(wanted), self.meta_chunk):
+                chunk = wanted[start : start + self.meta_chunk]
+                self.report.meta_requests += 1
+                try:
+                    resp = self.fetch_meta(chunk) or {}
+                except MetaFetchError:
+                    raise
+                except Exception as e:
+                    raise MetaFetchError(str(e) or type(e).__name__) from e
+                for h8 in chunk:
+                    self._meta[h8] = resp.get(h8) or {}
+                self.report.meta_hashes += len(chunk)
+                if self.on_meta is not None:
+                    self.on_meta(self.report)
+        self._wanted.clear()
+
+        buffered, self._buffer = self._buffer, []
+        for scanned in buffered:
+            with self.report.timings.stage("edges"):
+                result = self._write(scanned)
+            if result is not None and self.on_doc is not None:
+                self.on_doc(scanned, *result)
+
+    def _write(self, scanned: ScannedDoc) -> Optional[Tuple[int, int]]:
+        overlay = self.overlay
+        doc = scanned.doc
+        manifest = self.manifest
+        previous = manifest.current(doc, self.root) if manifest is not None else None
+
+        if scanned.unchanged:
+            # Same content under a new mtime (checkout, touch, copy): keep edges
+            previous.size, previous.mtime_ns = scanned.size, scanned.mtime_ns
+            self.report.skipped += 1
+            return None
+
+        # DEDUPLICATION: Replace, not accumulate (prevents overlay bloat on re-ingest)
+        if self.stats is not None:
+            self.stats.remove_doc(doc, overlay)  # needs the old edges still present
+        removed = overlay.delete_doc(doc)
+
+        if self.policy == ADJACENT:
+            added = self._write_adjacent(scanned)
+        else:
+            added = self._write_anchor_chain(scanned)
+
+        if self.stats is not None:
+            self.stats.add_doc(doc, overlay)
+        if manifest is not None:
+            manifest.docs[doc] = ManifestEntry(
+                scanned.size, scanned.mtime_ns, scanned.digest, added, self.root
+            )
+        if previous is not None or removed:
+            self.report.changed += 1
+        else:
+            self.report.added += 1
+        self.report.edges += added
+        self.report.replaced_edges += removed
+        if not scanned.words:
+            return None
+        self.report.docs += 1
+        return removed, added
+
+    def _write_adjacent(self, scanned: ScannedDoc) -> int:
+        overlay = self.overlay
+        doc = scanned.doc
+        words, hashes, cap = scanned.words, scanned.hashes, scanned.max_words
+        phases = [word_phase(self._meta.get(h8), self.mean_mass) for h8 in hashes[:cap]]
+        added = 0
+        for src_idx, tgt_idx, line, ctx_hash in scanned.edges:
+            src_phase = phases[src_idx] if src_idx < cap else "gas"
+            tgt_phase = phases[tgt_idx] if tgt_idx < cap else "gas"
+            # Skip gas→gas (pure noise)
+            if src_phase == "gas" and tgt_phase == "gas":
+                continue
+            # ALL document edges are σ (provable facts with doc:line provenance)
+            overlay.add_edge(
+                hashes[src_idx],
+                hashes[tgt_idx],
+                weight=1.0,
+                doc=doc,
+                ring="sigma",
+                phase=tgt_phase,
+                line=line,
+                ctx_hash=ctx_hash,
+                witness=OverlayEdge.ADJACENT,  # Consecutive tokens = structurally adjacent
+            )
+            overlay.define_label(hashes[src_idx], words[src_idx])
+            overlay.define_label(hashes[tgt_idx], words[tgt_idx])
+            added += 1
+        return added
+
+    def _write_anchor_chain(self, scanned: ScannedDoc) -> int:
+        if len(scanned.words) < 2:
+            return 0
+        words, hashes, seq = scanned.words, scanned.hashes, scanned.seq
+        results = [self._meta.get(h8) for h8 in hashes]
+        anchors = select_anchors(scanned, results, self.policy, self.mean_mass, self.n_labels)
+        if len(anchors) < 2:
+            return 0
+        self.report.anchors += len(anchors)
+
+        overlay = self.overlay
+        doc = scanned.doc
+        tokens = zip(map(words.__getitem__, seq), scanned.lines, seq)
+        added = 0
+        src_idx = -1
+        for (_word, line, word_idx), ctx_hash in iter_ctx_hashes(
+            tokens, k=2, want=lambda token: token[2] in anchors
+        ):
+            if ctx_hash is None:
+                continue
+            if src_idx >= 0:
+                overlay.add_edge(
+                    hashes[src_idx],
+                    hashes[word_idx],
+                    weight=1.0,
+                    doc=doc,
+                    ring="sigma",  # All document edges are σ (facts)
+                    phase="solid",
+                    line=line,
+                    ctx_hash=ctx_hash,
+                )
+                overlay.define_label(hashes[src_idx], words[src_idx])
+                overlay.define_label(hashes[word_idx], words[word_idx])
+                added += 1
+            src_idx = word_idx
+        return added
+
+    def remove_missing(self, seen: Iterable[str]) -> List[str]:
+        """
+        Delete the σ-edges of manifest docs under `root` that were not seen.
+
+        Call after flush() with every doc name the walk produced (skipped ones
+        included); returns the removed doc names.
+        """
+        if self.manifest is None:
+            return []
+        seen = set(seen)
+        gone = [
+            doc for doc, entry in self.manifest.docs.items()
+            if entry.root == self.root and doc not in seen
+        ]
+        for doc in gone:
+            if self.stats is not None:
+                self.stats.remove_doc(doc, self.overlay)
+            self.report.replaced_edges += self.overlay.delete_doc(doc)
+            del self.manifest.docs[doc]
+        self.report.removed += len(gone)
+        self.report.removed_docs.extend(gone)
+        return gone
+
+
+# =============================================================================
+# Engine entry point
+# =============================================================================
+
+def ingest_path(
+    input_path: Path,
+    writer: IngestWriter,
+    *,
+    workers: int = 1,
+    sniff_workers: int = SNIFF_WORKERS,
+    update: bool = False,
+    doc_name: Optional[Callable[[Path], str]] = None,
+) -> IngestReport:
+    """
+    Ingest a file or folder through `writer` (the caller saves).
+
+    Args:
+        workers: Scan processes (1 = in-process)
+        sniff_workers: Threads sniffing candidate files for text
+        update: Skip docs the writer's manifest says are current and drop
+                manifest docs that vanished from a folder
+        doc_name: Path → doc name (default: relative to a folder input, the
+                  file name for a single file)
+
+    Raises MetaFetchError when writer.fetch_meta fails; the overlay may then
+    hold a partial run and should not be saved.
+    """
+    input_path = Path(input_path)
+    is_dir = input_path.is_dir()
+    if doc_name is None:
+        def doc_name(f: Path) -> str:
+            return str(f.relative_to(input_path) if is_dir else f.name)
+
+    report = writer.report
+    manifest = writer.manifest
+    writer.root = str(input_path.resolve())
+    seen: Set[str] = set()
+
+    def current(name: str) -> Optional[ManifestEntry]:
+        return manifest.current(name, writer.root) if update and manifest is not None else None
+
+    def candidates() -> Iterator[Path]:
+        for f in iter_files(input_path, stats=report.discovery):
+            name = doc_name(f)
+            entry = current(name)
+            if entry is not None:
+                try:
+                    st = f.stat()
+                except OSError:
+                    continue
+                if IngestManifest.stat_matches(entry, st):
+                    # Ingested before as a text file; no need to open it
+                    report.files_found += 1
+                    report.skipped += 1
+                    seen.add(name)
+                    continue
+            yield f
+
+    def items() -> Iterator[Tuple]:
+        for f in iter_text_files(candidates(), workers=sniff_workers, stats=report.discovery):
+            name = doc_name(f)
+            entry = current(name)
+            report.files_found += 1
+            seen.add(name)
+            if entry is not None:
+                yield str(f), name, entry.digest
+            else:
+                yield str(f), name
+
+    for scanned in iter_scanned(
+        items(),
+        workers=workers,
+        max_words=writer.scan_max_words,
+        policy=writer.policy,
+        timings=report.timings,
+    ):
+        writer.add(scanned)
+    writer.flush()
+
+    if update and is_dir:
+        writer.remove_missing(seen)
+    return report
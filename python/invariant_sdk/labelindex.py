@@ -0,0 +1,171 @@
+"""
+labelindex.py — Exact / prefix / substring search over labels
+
+One index answers the three match classes used by find_nodes-style lookups,
+ranked exact > prefix > contains, each class in label insertion order (the
+order a linear scan over the label dict would produce):
+
+  - exact    — dict key → ids
+  - prefix   — keys in one sorted array, a prefix is a bisect range
+  - contains — postings (ascending ids) for every 2- and 3-gram; a query is
+               checked only against the ids of its rarest n-gram, in order,
+               stopping as soon as enough matches are found
+
+1-character queries have no n-gram and fall back to an in-order scan (with
+the same early exit). The index can be pickled next to the crystal it was
+built from (save/load with a staleness stamp).
+
+Invariant III (Energy Law): lookups touch candidates, not the vocabulary.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+import pickle
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+LABEL_INDEX_VERSION = 1
+
+# Upper bound for "every key starting with prefix"
+_KEY_END = "\U0010ffff"
+
+
+def _grams(key: str) -> set:
+    grams = set()
+    for n in (2, 3):
+        for i in range(len(key) - n + 1):
+            grams.add(key[i:i + n])
+    return grams
+
+
+class LabelIndex:
+    """
+    (label, payload) pairs searchable by exact, prefix and substring match.
+
+    Labels are matched as given (callers lowercase them); duplicate labels
+    are kept, each with its own payload.
+    """
+
+    __slots__ = ("labels", "payloads", "_exact", "_sorted_keys", "_sorted_ids", "_postings")
+
+    def __init__(self, items: Iterable[Tuple[str, Any]] = ()):
+        self.labels: List[str] = []
+        self.payloads: List[Any] = []
+        exact: Dict[str, List[int]] = {}
+        postings: Dict[str, List[int]] = {}
+        for label, payload in items:
+            i = len(self.labels)
+            self.labels.append(label)
+            self.payloads.append(payload)
+            ids = exact.get(label)
+            if ids is None:
+                exact[label] = [i]
+                for gram in _grams(label):
+                    ids_for_gram = postings.get(gram)
+                    if ids_for_gram is None:
+                        postings[gram] = ids_for_gram = []
+                    ids_for_gram.append(i)
+            else:
+                ids.append(i)
+                for gram in _grams(label):
+                    postings[gram].append(i)
+        self._exact = exact
+        order = sorted(range(len(self.labels)), key=self.labels.__getitem__)
+        self._sorted_keys = [self.labels[i] for i in order]
+        self._sorted_ids = array("I", order)
+        self._postings = {gram: array("I", ids) for gram, ids in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def find(self, query: str, max_matches: int = 10) -> List[Any]:
+        """Payloads of up to max_matches labels: exact, then prefix, then contains."""
+        ids = self.find_ids(query, max_matches)
+        return [self.payloads[i] for i in ids]
+
+    def find_ids(self, query: str, max_matches: int = 10) -> List[int]:
+        if not query or max_matches <= 0:
+            return []
+        exact = self._exact.get(query, [])[:max_matches]
+        if len(exact) >= max_matches:
+            return exact
+
+        lo = bisect_left(self._sorted_keys, query)
+        hi = bisect_left(self._sorted_keys, query + _KEY_END)
+        want = max_matches - len(exact)
+        prefix = heapq.nsmallest(want + len(exact), self._sorted_ids[lo:hi])
+        prefix = [i for i in prefix if self.labels[i] != query][:want]
+        out = exact + prefix
+        if len(out) >= max_matches:
+            return out
+
+        want = max_matches - len(out)
+        contains: List[int] = []
+        labels = self.labels
+        for i in self._candidates(query):
+            label = labels[i]
+            if query in label and not label.startswith(query):
+                contains.append(i)
+                if len(contains) >= want:
+                    break
+        return out + contains
+
+    def find_all_ids(self, query: str) -> List[int]:
+        """Every id whose label contains `query`, in insertion order."""
+        if not query:
+            return []
+        labels = self.labels
+        return [i for i in self._candidates(query) if query in labels[i]]
+
+    def _candidates(self, query: str) -> Iterable[int]:
+        """Ascending ids that may contain `query` (its rarest n-gram's postings)."""
+        if len(query) < 2:
+            return range(len(self.labels))
+        best: Optional[array] = None
+        for gram in _grams(query):
+            ids = self._postings.get(gram)
+            if ids is None:
+                return ()
+            if best is None or len(ids) < len(best):
+                best = ids
+        return best if best is not None else ()
+
+    # Persistence (crystal vocabularies are large; building them is not free)
+
+    def save(self, path: Path, stamp: Tuple) -> bool:
+        """Pickle next to its source; stamp identifies the source state."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump((LABEL_INDEX_VERSION, tuple(stamp), self._state()), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            return True
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return False
+
+    @classmethod
+    def load(cls, path: Path, stamp: Tuple) -> Optional["LabelIndex"]:
+        """The saved index if it matches `stamp`, else None."""
+        try:
+            with open(path, "rb") as f:
+                version, saved_stamp, state = pickle.load(f)
+        except Exception:
+            return None
+        if version != LABEL_INDEX_VERSION or saved_stamp != tuple(stamp):
+            return None
+        index = cls.__new__(cls)
+        for name, value in zip(cls.__slots__, state):
+            setattr(index, name, value)
+        return index
+
+    def _state(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
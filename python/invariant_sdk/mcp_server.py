@@ -35,6 +35,7 @@ from __future__ import annotations
 
 import os
 import json
+import time
 from pathlib import Path
 from typing import Optional
 
@@ -68,8 +69,16 @@ _physics = None
 _overlay = None
 _overlay_path = None
 _halo_meta_cache: dict[str, dict] = {}
+_halo_neighbors_cache: dict[tuple, list] = {}  # (hash8, limit) → neighbors
+
+# Frontier budget per hop for path proving (Invariant III: bounded work)
+_PROVE_MAX_FRONTIER = 2000
 _overlay_index = None
-_overlay_index_key: Optional[tuple] = None
+_overlay_index_key: Optional[int] = None  # overlay.version
+_overlay_label_search = None  # LabelIndex over lowercased overlay labels
+_overlay_label_search_key: Optional[int] = None  # overlay.version
+_window_stats = None  # WindowStats of _overlay, kept by ingest (key: overlay.version)
+_window_stats_key: Optional[int] = None
 
 # Persistent disk cache for Crystal responses (1M scale optimization)
 import sqlite3
@@ -118,6 +127,17 @@ class _DiskCache:
         )
         import json
         return {row[0]: json.loads(row[1]) for row in cur.fetchall()}
+    
+    def set_many(self, items: dict):
+        """Batch insert in one transaction."""
+        if not items:
+            return
+        import json
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)",
+            [(k, json.dumps(v)) for k, v in items.items()],
+        )
+        self.conn.commit()
 
 _disk_cache: Optional[_DiskCache] = None
 
@@ -204,6 +224,293 @@ def _get_halo_meta_cached(hashes, *, chunk_size: int = 4000) -> tuple[dict[str,
     return {h: (_halo_meta_cache.get(h) or {}) for h in hashes_list}, http_requests
 
 
+def _get_halo_neighbors_cached(
+    hashes,
+    *,
+    limit: int = 50,
+    chunk_size: int = 1000,
+) -> tuple[dict[str, list], int]:
+    """
+    Halo neighbor lists (first page, `limit` per node) for many nodes at once.
+    
+    Same cache hierarchy as _get_halo_meta_cached (memory → disk → HTTP), but
+    misses go out as chunked `get_halo_pages` calls instead of one request
+    per node. HaloClient reports an unreachable server as an empty response,
+    not an exception: only nodes present in the response are cached (memory
+    and disk), so an outage yields empty lists now and is retried later.
+    
+    Returns:
+      (neighbors_by_hash8, http_requests_made)
+    """
+    _ensure_initialized()
+    if not _physics:
+        return {}, 0
+    
+    disk_cache = _get_disk_cache()
+    hashes_list = list(dict.fromkeys(str(h).lower() for h in hashes if h))
+    
+    missing_from_memory = [h for h in hashes_list if (h, limit) not in _halo_neighbors_cache]
+    if missing_from_memory:
+        disk_keys = {f"halo{limit}:{h}": h for h in missing_from_memory}
+        disk_hits = disk_cache.get_many(list(disk_keys))
+        for key, neighbors in disk_hits.items():
+            _halo_neighbors_cache[(disk_keys[key], limit)] = neighbors
+        missing_from_disk = [h for h in missing_from_memory if f"halo{limit}:{h}" not in disk_hits]
+    else:
+        missing_from_disk = []
+    
+    http_requests = 0
+    for start in range(0, len(missing_from_disk), int(chunk_size)):
+        http_requests += 1
+        chunk = missing_from_disk[start : start + int(chunk_size)]
+        try:
+            resp = _physics._client.get_halo_pages(chunk, limit=limit)
+        except Exception:
+            continue
+        if not resp:
+            continue  # failed request (timeout, HTTP error, bad JSON)
+        fresh = {}
+        for h in chunk:
+            page = resp.get(h)
+            if page is None:
+                continue  # not answered: don't record it as "no neighbors"
+            neighbors = page.get("neighbors") or []
+            _halo_neighbors_cache[(h, limit)] = neighbors
+            fresh[f"halo{limit}:{h}"] = neighbors
+        if fresh:
+            disk_cache.set_many(fresh)
+    
+    return {h: _halo_neighbors_cache.get((h, limit), []) for h in hashes_list}, http_requests
+
+
+def _backward_ball(target: str, depth: int, max_frontier: Optional[int]) -> dict:
+    """
+    Overlay nodes that reach `target` within `depth` hops (reverse index BFS).
+    
+    Returns:
+      {node: (next node toward target, edge, hops to target)}; target → None
+    """
+    ball: dict = {target: None}
+    layer = [target]
+    for hops in range(1, depth + 1):
+        next_layer = []
+        for node in layer:
+            for src, edge in _overlay.reverse_edges.get(node, ()):
+                if src not in ball:
+                    ball[src] = (node, edge, hops)
+                    next_layer.append(src)
+            if max_frontier is not None and len(next_layer) >= max_frontier:
+                break
+        layer = next_layer
+        if not layer:
+            break
+    return ball
+
+
+def _prove_paths(
+    pairs: list,
+    max_hops: int,
+    mode: str = "physics",
+    *,
+    max_frontier: Optional[int] = None,
+    bidirectional: bool = False,
+) -> tuple[list[dict], dict]:
+    """
+    Prove many (source, target) concept pairs with shared frontiers.
+    
+    Pairs are grouped by source; each source is expanded once (layer by
+    layer, overlay edges then Halo neighbors, same visit order as a single
+    prove_path) and every target of that source is tested on the way. All
+    sources advance in lock-step so each hop costs one batched Halo fetch.
+    
+    max_frontier caps the nodes kept per source per layer (later ones are
+    dropped and counted). A pair left unproven after its source dropped
+    nodes is inconclusive ("exists": None, "truncated": True), not a
+    disproof. bidirectional also grows an overlay-only ball
+    backward from each target (reverse index) and stops as soon as the
+    forward frontier meets it within max_hops.
+    
+    Returns:
+      (one result dict per pair — prove_path's JSON fields, run stats)
+    """
+    from invariant_sdk.cli import hash8_hex
+    
+    # src_hash → {tgt_hash: [pair index, ...]}
+    groups: dict[str, dict[str, list[int]]] = {}
+    for i, (source, target) in enumerate(pairs):
+        src_hash = hash8_hex(f"Ġ{source.lower()}")
+        tgt_hash = hash8_hex(f"Ġ{target.lower()}")
+        groups.setdefault(src_hash, {}).setdefault(tgt_hash, []).append(i)
+    
+    # Backward balls: meet[src][node] = [(tgt, hops to tgt), ...]
+    balls: dict[str, dict] = {}
+    meet: dict[str, dict[str, list]] = {s: {} for s in groups}
+    if bidirectional and max_hops > 1:
+        for s, targets in groups.items():
+            for t in targets:
+                if t not in balls:
+                    balls[t] = _backward_ball(t, max_hops - 1, max_frontier)
+                for node, link in balls[t].items():
+                    if link is not None:
+                        meet[s].setdefault(node, []).append((t, link[2]))
+    
+    # Per source: parent pointers (node → (prev, overlay edge | None)),
+    # current layer, targets still open, first hit per target.
+    parents = {s: {s: None} for s in groups}
+    frontier = {s: [s] for s in groups}
+    remaining = {s: set(targets) for s, targets in groups.items()}
+    hits: dict[tuple, tuple] = {}  # (src, tgt) → (last node, overlay edge | None, meeting node | None)
+    truncated = {s: 0 for s in groups}  # nodes dropped by the frontier cap, per source
+    http_requests = 0
+    per_hop: list[dict] = []
+    
+    for hop in range(1, max_hops + 1):
+        active = [s for s in groups if frontier[s] and remaining[s]]
+        if not active:
+            break
+        started = time.perf_counter()
+        
+        halo: dict[str, list] = {}
+        requests = 0
+        layer = [node for s in active for node in frontier[s]]
+        if _physics:
+            halo, requests = _get_halo_neighbors_cached(layer, limit=50)
+            http_requests += requests
+        
+        dropped = 0
+        for s in active:
+            seen, open_targets, meets = parents[s], remaining[s], meet[s]
+            next_layer = []
+            for current in frontier[s]:
+                steps = [(edge.tgt, edge) for edge in _overlay.edges.get(current, [])]
+                steps.extend((n.get("hash8"), None) for n in halo.get(current, ()))
+                for n_hash, edge in steps:
+                    if not n_hash:
+                        continue
+                    if n_hash in open_targets:
+                        open_targets.discard(n_hash)
+                        hits[(s, n_hash)] = (current, edge, None)
+                    for t, to_go in meets.get(n_hash, ()):
+                        if t in open_targets and hop + to_go <= max_hops and n_hash not in seen:
+                            open_targets.discard(t)
+                            hits[(s, t)] = (current, edge, n_hash)
+                    if n_hash not in seen:
+                        if max_frontier is not None and len(next_layer) >= max_frontier:
+                            dropped += 1
+                            truncated[s] += 1
+                            continue
+                        seen[n_hash] = (current, edge)
+                        next_layer.append(n_hash)
+            frontier[s] = next_layer
+        
+        per_hop.append({
+            "hop": hop,
+            "expanded": len(layer),
+            "http_requests": requests,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+            "dropped": dropped,
+        })
+    
+    if mode == "typed":
+        from invariant_sdk.operators import infer_SEQ, InferResult
+    
+    results: list[dict] = [{} for _ in pairs]
+    for s, targets in groups.items():
+        for t, indices in targets.items():
+            hit = hits.get((s, t))
+            if hit is not None:
+                # Node/edge chain s → … → t (edge None = Halo hop)
+                last, step_edge, via = hit
+                nodes, steps = [], []
+                node = last
+                while parents[s][node] is not None:
+                    prev, edge = parents[s][node]
+                    nodes.append(node)
+                    steps.append(edge)
+                    node = prev
+                nodes.reverse()
+                steps.reverse()
+                steps.append(step_edge)
+                node = via
+                while node is not None and node != t:
+                    nodes.append(node)
+                    node, edge, _hops = balls[t][node]
+                    steps.append(edge)
+                final_edge = steps[-1]
+                edges_in_path = [e for e in steps if e is not None]
+            
+            for i in indices:
+                source, target = pairs[i]
+                if hit is None and truncated[s]:
+                    # The cap cut the search short: absence is not established
+                    results[i] = {
+                        "exists": None,
+                        "truncated": True,
+                        "ring": None,
+                        "path": None,
+                        "message": (
+                            f"No path found from '{source}' to '{target}' within {max_hops} hops, "
+                            f"but max_frontier={max_frontier} dropped {truncated[s]} node(s): inconclusive"
+                        ),
+                    }
+                    continue
+                if hit is None:
+                    results[i] = {
+                        "exists": False,
+                        "ring": None,
+                        "path": None,
+                        "message": f"No path found from '{source}' to '{target}' within {max_hops} hops",
+                    }
+                    continue
+                
+                final_path = (
+                    [source]
+                    + [_overlay.get_label(n) or n[:8] for n in nodes]
+                    + [_overlay.get_label(t) or target]
+                )
+                
+                if final_edge is None:
+                    # λ paths have no σ-witness — can't be typed verified
+                    results[i] = {
+                        "exists": True,
+                        "ring": "lambda",  # From halo = ghost edge
+                        "path": final_path,
+                        "doc": None,
+                        "line": None,
+                        "provenance": None,
+                        "mode": mode,
+                        "typed_verified": False if mode == "typed" else None,
+                    }
+                    continue
+                
+                typed_verified = None
+                if mode == "typed":
+                    # dt_observed=1 for ADJACENT edges
+                    typed_verified = all(
+                        infer_SEQ(e, dt_observed=1) == InferResult.TRUE
+                        for e in edges_in_path
+                    )
+                results[i] = {
+                    "exists": True,
+                    "ring": final_edge.ring,
+                    "path": final_path,
+                    "doc": final_edge.doc,
+                    "line": final_edge.line,
+                    "provenance": f"{final_edge.doc}:{final_edge.line}" if final_edge.doc and final_edge.line else None,
+                    "mode": mode,
+                    "typed_verified": typed_verified,
+                }
+    
+    stats = {
+        "hops": per_hop,
+        "http_requests": http_requests,
+        "sources": len(groups),
+        "max_frontier": max_frontier,
+        "bidirectional": bidirectional,
+    }
+    return results, stats
+
+
 # ============================================================================
 # TOOLS — Actions that LLM can take
 # ============================================================================
@@ -284,7 +591,7 @@ def locate(issue_text: str, max_results: int = 0) -> str:
     
     import math
     from invariant_sdk.cli import hash8_hex
-    from invariant_sdk.engine import OverlayIndex, locate_files, tokenize_query
+    from invariant_sdk.engine import OverlayIndex, locate_files, locate_workers_from_env, tokenize_query
     
     # Extract ALL words from issue text (universal tokenization)
     # Let the crystal classify them by mass (solid vs gas)
@@ -309,7 +616,7 @@ def locate(issue_text: str, max_results: int = 0) -> str:
     
     # Build (cached) overlay index once per overlay state.
     global _overlay_index, _overlay_index_key
-    idx_key = (id(_overlay), _overlay.n_edges, len(_overlay.labels or {}))
+    idx_key = _overlay.version
     if _overlay_index is None or _overlay_index_key != idx_key:
         _overlay_index = OverlayIndex.build(_overlay)
         _overlay_index_key = idx_key
@@ -381,6 +688,7 @@ def locate(issue_text: str, max_results: int = 0) -> str:
         preview_files=5,
         preview_occurrences=8,
         resolve_doc_path=_find_doc_path,
+        workers=locate_workers_from_env(),
     )
 
     if locate_out.get("error"):
@@ -440,12 +748,17 @@ def semantic_map(file_path: str) -> str:
     doc_name = path.name
     edges_from_doc = []
     nodes_in_doc = set()
+    label_hashes: dict[str, str] = {}  # label → a labelled node carrying it
     
     for src, edge_list in _overlay.edges.items():
         for edge in edge_list:
             if edge.doc and (edge.doc == doc_name or edge.doc.endswith(f"/{doc_name}")):
                 src_label = _overlay.get_label(src) or src[:8]
                 tgt_label = _overlay.get_label(edge.tgt) or edge.tgt[:8]
+                if src in _overlay.labels:
+                    label_hashes.setdefault(src_label, src)
+                if edge.tgt in _overlay.labels:
+                    label_hashes.setdefault(tgt_label, edge.tgt)
                 edges_from_doc.append({
                     "src": src_label,
                     "tgt": tgt_label,
@@ -465,10 +778,9 @@ def semantic_map(file_path: str) -> str:
         # Collect hashes for batch lookup
         hash_to_label = {}
         for node_label in list(nodes_in_doc)[:20]:
-            for h, l in _overlay.labels.items():
-                if l == node_label:
-                    hash_to_label[h] = node_label
-                    break
+            h = label_hashes.get(node_label)
+            if h:
+                hash_to_label[h] = node_label
         
         if hash_to_label:
             try:
@@ -500,7 +812,14 @@ def semantic_map(file_path: str) -> str:
 
 
 @mcp.tool()
-def prove_path(source: str, target: str, max_hops: int = 5, mode: str = "physics") -> str:
+def prove_path(
+    source: str,
+    target: str,
+    max_hops: int = 5,
+    mode: str = "physics",
+    max_frontier: int = _PROVE_MAX_FRONTIER,
+    bidirectional: bool = False,
+) -> str:
     """
     Verify a connection exists before claiming it.
     
@@ -513,6 +832,9 @@ def prove_path(source: str, target: str, max_hops: int = 5, mode: str = "physics
         
         prove_path("coffee", "database")  
         → {"exists": false} — don't claim this connection!
+        
+        → {"exists": null, "truncated": true} — the frontier cap stopped the
+          search early; raise max_frontier before concluding anything.
     
     Ring types:
         "sigma" = proven in documents (strong evidence)
@@ -525,135 +847,90 @@ def prove_path(source: str, target: str, max_hops: int = 5, mode: str = "physics
                   Use higher values only for exploring distant connections.
         mode: "physics" (default) = path exists
               "typed" = path exists AND all edges pass infer_SEQ
+        max_frontier: Max nodes kept per hop (bounds Halo fetches per hop);
+                      a miss after dropping nodes is reported as truncated
+        bidirectional: Also search backward from target through local
+                       documents and stop when both sides meet
+    
+    Each hop's Halo neighbors are fetched in one batched (cached) request;
+    "stats" reports nodes expanded, requests and latency per hop.
     """
     _ensure_initialized()
     
-    from invariant_sdk.cli import hash8_hex
-    
-    # Hash the concepts
-    src_hash = hash8_hex(f"Ġ{source.lower()}")
-    tgt_hash = hash8_hex(f"Ġ{target.lower()}")
-    
-    # BFS for path (track edges for typed mode)
-    visited = {src_hash}
-    queue = [(src_hash, [source], [])]  # (hash, path, edges_in_path)
-    
-    for _ in range(max_hops):
-        if not queue:
-            break
-        
-        next_queue = []
-        for current, path, edges_in_path in queue:
-            # Check overlay edges
-            for edge in _overlay.edges.get(current, []):
-                if edge.tgt == tgt_hash:
-                    # Found!
-                    final_path = path + [_overlay.get_label(edge.tgt) or target]
-                    all_edges = edges_in_path + [edge]
-                    
-                    # Typed mode: verify all edges pass infer_SEQ
-                    typed_verified = True
-                    if mode == "typed":
-                        from invariant_sdk.operators import infer_SEQ, InferResult
-                        for e in all_edges:
-                            # dt_observed=1 for ADJACENT edges
-                            result = infer_SEQ(e, dt_observed=1)
-                            if result != InferResult.TRUE:
-                                typed_verified = False
-                                break
-                    
-                    return json.dumps({
-                        "exists": True,
-                        "ring": edge.ring,
-                        "path": final_path,
-                        "doc": edge.doc,
-                        "line": edge.line,
-                        "provenance": f"{edge.doc}:{edge.line}" if edge.doc and edge.line else None,
-                        "mode": mode,
-                        "typed_verified": typed_verified if mode == "typed" else None,
-                    }, indent=2)
-                
-                if edge.tgt not in visited:
-                    visited.add(edge.tgt)
-                    label = _overlay.get_label(edge.tgt) or edge.tgt[:8]
-                    next_queue.append((edge.tgt, path + [label], edges_in_path + [edge]))
-            
-            # Check halo edges (if physics available)
-            if _physics:
-                try:
-                    neighbors = _physics.get_neighbors(current, limit=50)
-                    for n in neighbors:
-                        n_hash = n.get("hash8")
-                        if n_hash == tgt_hash:
-                            final_path = path + [_overlay.get_label(n_hash) or target]
-                            # λ paths have no σ-witness — can't be typed verified
-                            return json.dumps({
-                                "exists": True,
-                                "ring": "lambda",  # From halo = ghost edge
-                                "path": final_path,
-                                "doc": None,
-                                "line": None,
-                                "provenance": None,
-                                "mode": mode,
-                                "typed_verified": False if mode == "typed" else None,  # λ can't pass
-                            }, indent=2)
-                        
-                        if n_hash and n_hash not in visited:
-                            visited.add(n_hash)
-                            label = _overlay.get_label(n_hash) or n_hash[:8]
-                            # λ edges have no edge object, so pass empty list
-                            next_queue.append((n_hash, path + [label], edges_in_path))
-                except Exception:
-                    pass
-        
-        queue = next_queue
-    
-    return json.dumps({
-        "exists": False,
-        "ring": None,
-        "path": None,
-        "message": f"No path found from '{source}' to '{target}' within {max_hops} hops",
-    }, indent=2)
+    results, stats = _prove_paths(
+        [(source, target)],
+        max_hops,
+        mode,
+        max_frontier=max_frontier,
+        bidirectional=bidirectional,
+    )
+    return json.dumps({**results[0], "stats": stats}, indent=2)
 
 
 @mcp.tool()
-def prove_paths_batch(pairs: list) -> str:
+def prove_paths_batch(pairs: list, max_hops: int = 4) -> str:
     """
     Verify multiple concept connections at once (batch version of prove_path).
     
-    More efficient than calling prove_path multiple times.
+    More efficient than calling prove_path multiple times: pairs sharing a
+    source share one search, and each hop fetches Halo neighbors for all
+    frontiers in one batched request (50 claims ≈ max_hops round trips).
     
     Args:
         pairs: List of [source, target] pairs to verify, e.g. [["user", "auth"], ["api", "database"]]
+        max_hops: Search depth per pair
     
     Returns:
-        JSON with results for each pair: {pair: [src, tgt], exists: bool, ring: str|null}
+        JSON with results for each pair: {pair: [src, tgt], exists: bool|null, ring: str|null}
+        (exists null + truncated: the frontier cap cut the search short)
+        plus stats: {hops, http_requests, sources}
     """
     _ensure_initialized()
     
-    results = []
+    valid: list[tuple[int, tuple[str, str]]] = []
+    results: list[dict] = []
     for pair in pairs:
-        if len(pair) != 2:
+        if not isinstance(pair, (list, tuple)) or len(pair) != 2:
             results.append({"pair": pair, "error": "Invalid pair format"})
             continue
-        
-        src, tgt = pair
-        result = json.loads(prove_path(src, tgt, max_hops=4))
-        results.append({
-            "pair": [src, tgt],
-            "exists": result.get("exists", False),
-            "ring": result.get("ring"),
-            "path": result.get("path"),
-            "provenance": result.get("provenance"),
+        src, tgt = str(pair[0]), str(pair[1])
+        valid.append((len(results), (src, tgt)))
+        results.append({"pair": [src, tgt]})
+    
+    proofs, stats = _prove_paths([p for _i, p in valid], max_hops, max_frontier=_PROVE_MAX_FRONTIER)
+    for (i, _pair), proof in zip(valid, proofs):
+        results[i].update({
+            "exists": proof.get("exists", False),
+            "ring": proof.get("ring"),
+            "path": proof.get("path"),
+            "provenance": proof.get("provenance"),
         })
+        if proof.get("truncated"):
+            results[i]["truncated"] = True
     
     return json.dumps({
         "total": len(results),
         "proven": sum(1 for r in results if r.get("exists")),
+        "truncated": sum(1 for r in results if r.get("truncated")),
         "results": results,
+        "stats": stats,
     }, indent=2)
 
 
+def _get_overlay_label_search():
+    """Substring index over overlay labels, rebuilt when the overlay changes."""
+    global _overlay_label_search, _overlay_label_search_key
+    from invariant_sdk.labelindex import LabelIndex
+    
+    key = _overlay.version
+    if _overlay_label_search is None or _overlay_label_search_key != key:
+        _overlay_label_search = LabelIndex(
+            (str(label).lower(), h8) for h8, label in (_overlay.labels or {}).items() if label
+        )
+        _overlay_label_search_key = key
+    return _overlay_label_search
+
+
 @mcp.tool()
 def search_concept(concept: str, limit: int = 20) -> str:
     """
@@ -673,20 +950,33 @@ def search_concept(concept: str, limit: int = 20) -> str:
     from invariant_sdk.cli import hash8_hex
     
     concept_hash = hash8_hex(f"Ġ{concept.lower()}")
+    q = concept.lower()
     occurrences = []
     
-    # Find edges where this concept is source or target
+    # Nodes whose label contains the concept (label index, not a scan), and
+    # the sources of every edge that can touch them: matched src or src → matched tgt.
+    matched = None
+    sources = None
+    if q:
+        search = _get_overlay_label_search()
+        matched = {search.payloads[i] for i in search.find_all_ids(q)}
+        sources = set(matched)
+        for h in matched:
+            for src, _edge in _overlay.reverse_edges.get(h, ()):
+                sources.add(src)
+    
+    # Find edges where this concept is source or target (overlay order)
     for src, edges in _overlay.edges.items():
+        if sources is not None and src not in sources:
+            continue
+        src_label = _overlay.get_label(src) or ""
         for edge in edges:
-            src_label = _overlay.get_label(src) or ""
-            tgt_label = _overlay.get_label(edge.tgt) or ""
-            
-            if concept.lower() in src_label.lower() or concept.lower() in tgt_label.lower():
+            if matched is None or src in matched or edge.tgt in matched:
                 occurrences.append({
                     "doc": edge.doc,
                     "line": edge.line,
                     "src": src_label,
-                    "tgt": tgt_label,
+                    "tgt": _overlay.get_label(edge.tgt) or "",
                     "ring": edge.ring,
                 })
             
@@ -809,6 +1099,8 @@ def context(doc: str, line: int, ctx_hash: Optional[str] = None) -> str:
         JSON with content, status (fresh/relocated/broken/unchecked), actual_line
     """
     _ensure_initialized()
+    from invariant_sdk.filecache import shared_file_cache
+    from invariant_sdk.ingest import CtxHashIndex
     from invariant_sdk.tokenize import tokenize_with_lines
     
     path = _find_doc_path(doc)
@@ -816,22 +1108,28 @@ def context(doc: str, line: int, ctx_hash: Optional[str] = None) -> str:
         return json.dumps({"error": f"Document not found: {doc}", "status": "broken"})
     
     try:
-        text = path.read_text(encoding='utf-8')
-        lines = text.split('\n')
+        entry = shared_file_cache().get(path, strict=True)
+        if entry is not None:
+            lines = entry.line_view(newline_only=True)
+        else:
+            text = path.read_text(encoding='utf-8')
+            lines = text.split('\n')
         
         if line < 1 or line > len(lines):
             return json.dumps({"error": f"Line {line} out of range", "status": "broken"})
         
-        # Tokenize for hash verification
-        tokens = tokenize_with_lines(text)
+        # ctx_hash windows for verification (memoized per file version)
+        if entry is not None:
+            ctx_index = entry.memo("ctx_hash_index", lambda t: CtxHashIndex(tokenize_with_lines(t)))
+        else:
+            ctx_index = CtxHashIndex(tokenize_with_lines(text))
         
         status = "unchecked"
         actual_line = line
         
         if ctx_hash:
             # Verify hash at expected line
-            line_hashes = _compute_hashes_at_line(tokens, line)
-            if ctx_hash in line_hashes:
+            if any(h == ctx_hash for h, _w in ctx_index.hashes_at_line(line)):
                 status = "fresh"
             else:
                 # Scan ±50 lines for relocated content
@@ -839,7 +1137,7 @@ def context(doc: str, line: int, ctx_hash: Optional[str] = None) -> str:
                 for offset in range(1, 51):
                     for check in [line - offset, line + offset]:
                         if 1 <= check <= len(lines):
-                            if ctx_hash in _compute_hashes_at_line(tokens, check):
+                            if any(h == ctx_hash for h, _w in ctx_index.hashes_at_line(check)):
                                 found = check
                                 break
                     if found:
@@ -1013,293 +1311,90 @@ def ingest(file_path: str) -> str:
         ingest("/path/to/repo")  # Indexes the entire repo
         ingest("utils.py")        # Indexes single file
     """
+    global _overlay, _window_stats, _window_stats_key
     _ensure_initialized()
-    import hashlib
-    import math
-    import time
-    from invariant_sdk.tokenize import tokenize_with_lines
-    
-    from invariant_sdk.cli import hash8_hex
+    from invariant_sdk.ingest import HUB_ANCHORS, IngestWriter, MetaFetchError, ingest_path
+    from invariant_sdk.operators import window_stats_path
     
     path = Path(file_path)
     if not path.exists():
         return json.dumps({"error": f"Path not found: {file_path}"})
     
-    # Collect files (support both single file and folder)
-    if path.is_file():
-        files = [path]
-    else:
-        # Helper: Check if file is text (UTF-8 decodable)
-        # Theory: Observable property, not heuristic - works for ALL languages
-        def is_text_file(file_path: Path) -> bool:
-            if not file_path.is_file():
-                return False
-            try:
-                # Read first 512 bytes to check (optimization)
-                with open(file_path, 'rb') as f:
-                    sample = f.read(512)
-                # Try decode as UTF-8
-                sample.decode('utf-8', errors='strict')
-                return True
-            except (UnicodeDecodeError, OSError):
-                return False
-        
-        # Find ALL files (no extension filtering)
-        all_files = [f for f in path.rglob("*") if f.is_file()]
-        
-        # Filter using .gitignore if present (Theory: Explicit user declaration)
-        gitignore_path = path / '.gitignore'
-        if gitignore_path.exists():
-            try:
-                import pathspec
-                gitignore_text = gitignore_path.read_text(encoding='utf-8')
-                spec = pathspec.PathSpec.from_lines('gitwildmatch', gitignore_text.splitlines())
-                files_after_gitignore = [f for f in all_files if not spec.match_file(str(f.relative_to(path)))]
-            except Exception:
-                files_after_gitignore = all_files
-        else:
-            files_after_gitignore = all_files
-
-        # Always ignore protocol / build artifacts (prevents self-indexing .invariant, etc.)
-        def is_default_ignored(p: Path) -> bool:
-            try:
-                rel = p.relative_to(path)
-            except Exception:
-                rel = p
-            for part in rel.parts:
-                if part in {".git", ".invariant", "__pycache__", ".venv", "venv", "node_modules", "dist", "build"}:
-                    return True
-                if part.endswith(".egg-info"):
-                    return True
-            return False
-
-        files_after_gitignore = [f for f in files_after_gitignore if not is_default_ignored(f)]
-        
-        # Filter to text files only (UTF-8 decodable)
-        files = [f for f in files_after_gitignore if is_text_file(f)]
-        
-        if not files:
-            return json.dumps({"error": f"No text files found in {file_path}"})
-
     t0 = time.perf_counter()
-    try:
-        print(f"[invariant] ingest: scanning {len(files)} files", flush=True)
-    except Exception:
-        pass
-    
-    # OPTIMIZATION: Mega-batch all words from all files (Theory: MDL - 1 request < N requests)
-    # Step 1: Collect all unique words from ALL files first
-    all_words_set = set()
-    file_words_map = {}  # file_path -> list of unique words
-    
-    for scanned_i, file_path_obj in enumerate(files, 1):
-        if scanned_i == 1 or (scanned_i % 100 == 0) or scanned_i == len(files):
-            try:
-                print(f"[invariant] ingest: scanned {scanned_i}/{len(files)}", flush=True)
-            except Exception:
-                pass
-        try:
-            text = file_path_obj.read_text(encoding='utf-8')
-        except Exception:
-            continue
-        
-        # Tokenize
-        tokens = tokenize_with_lines(text)
-        
-        if len(tokens) < 2:
-            continue
-        
-        words = [w for w, _ in tokens]
-        unique_words = list(dict.fromkeys(words))  # L0: Crystal decides Solid vs Gas via Phase Separation
-        
-        if len(unique_words) < 2:
-            continue
-        
-        file_words_map[file_path_obj] = (tokens, unique_words)
-        all_words_set.update(unique_words)
-
-    if not all_words_set:
-        return json.dumps({"error": "No words found in any files"})
-
-    t_scan = time.perf_counter()
-    try:
-        print(
-            f"[invariant] ingest: vocabulary {len(all_words_set)} words from {len(file_words_map)} files",
-            flush=True,
-        )
-    except Exception:
-        pass
-    
-    # Step 2: ONE mega-batch request for ALL words
-    all_words_list = list(all_words_set)
-    word_to_hash = {w: hash8_hex(f"Ġ{w}") for w in all_words_list}
-    
-    try:
-        # Mega-batch meta lookup (chunked + cached)
-        batch_results, http_requests = _get_halo_meta_cached(word_to_hash.values(), chunk_size=4000)
-    except Exception as e:
-        return json.dumps({"error": f"Crystal server error: {e}"})
-
-    t_meta = time.perf_counter()
-    try:
-        print(f"[invariant] ingest: crystal meta ok ({http_requests} HTTP)", flush=True)
-    except Exception:
-        pass
+    http_requests = 0
     
-    mean_mass = _physics.mean_mass
+    def fetch_meta(chunk):
+        # Mega-batch meta lookup (memory + disk cached)
+        nonlocal http_requests
+        results, n_http = _get_halo_meta_cached(chunk, chunk_size=4000)
+        http_requests += n_http
+        return results
     
-    # Step 3: Process each file using cached batch_results
-    total_files = len(file_words_map)
-    total_edges = 0
-    total_anchors_found = 0
+    files_details = []  # Track progress for the first files
     files_processed = 0
-    files_details = []  # Track progress for each file
-    
-    for file_path_obj, (tokens, unique_words) in file_words_map.items():
-        # Use cached batch_results (no new HTTP request)
-        candidates = []
-        for word in unique_words:
-            h8 = word_to_hash.get(word)
-            if not h8:
-                continue
-            result = batch_results.get(h8) or {}
-            if not result.get('exists'):
-                # Unknown words = Local Anchors (solid)
-                candidates.append((word, h8, 1.0, 0, False))
-                continue
-            meta = result.get('meta') or {}
-            degree_total = int(meta.get('degree_total') or 0)
-            mass = 1.0 / math.log(2 + max(0, degree_total)) if degree_total > 0 else 0
-            candidates.append((word, h8, mass, degree_total, True))
-        
-        # === INVARIANT VII: σ-PRESENCE WINS (RUNTIME_CONTRACT v1.7) ===
-        # σ-index MUST contain ALL unique tokens observed in document.
-        # Filtering happens via α-coefficient at query time, not at ingest.
-        #
-        # Only exclusion: Hub-words (degree > √N_vocab) which are noise.
-        # This ensures names like "Eric", "Bass", "Arnold" are ALWAYS indexed.
-        
-        # Hub threshold: √N_vocab (derived, not magic)
-        n_labels = int((_physics.meta or {}).get("n_labels") or 150000)
-        hub_threshold = math.sqrt(max(1, n_labels))  # ≈ 387 for 150k vocab
-        
-        # Index ALL tokens, except Hubs
-        solid = {
-            (w, h8)
-            for (w, h8, mass, degree, exists) in candidates
-            if (
-                not exists  # OOV → always index (local discovery)
-                or degree <= hub_threshold  # Not a hub → index
-            )
-        }
-        
-        # Fallback only if filter killed everything (shouldn't happen)
-        if len(solid) < 2:
-            # Take all non-hub words unconditionally
-            solid = {
-                (w, h8) 
-                for (w, h8, m, deg, exists) in candidates 
-                if not exists or deg <= hub_threshold
-            }
-            # Still nothing? Take top by mass
-            if len(solid) < 2:
-                top = sorted(candidates, key=lambda x: x[2], reverse=True)[:64]
-                solid = {(w, h8) for (w, h8, _m, _deg, _exists) in top}
-        
-        if len(solid) >= 2:
-            anchors = list(solid)
-        else:
-            top = sorted(candidates, key=lambda x: x[2], reverse=True)[:64]
-            top_set = {h8 for (_w, h8, _m, _deg, _exists) in top}
-            anchors = [(w, h8) for (w, h8, _m, _deg, _exists) in candidates if h8 in top_set]
-        
-        if len(anchors) < 2:
-            continue
-        
-        anchor_words = {w for w, _ in anchors}
-        
-        # Collect occurrences
-        def compute_ctx_hash(idx: int, k: int = 2) -> str:
-            start = max(0, idx - k)
-            end = min(len(tokens), idx + k + 1)
-            window = [tokens[i][0] for i in range(start, end)]
-            normalized = ' '.join(w.lower() for w in window)
-            return hashlib.sha256(normalized.encode('utf-8')).hexdigest()[:8]
-        
-        occurrences = []
-        for idx, (word, line_num) in enumerate(tokens):
-            if word in anchor_words:
-                h8 = word_to_hash.get(word) or hash8_hex(f"Ġ{word}")
-                occurrences.append((word, h8, line_num, compute_ctx_hash(idx)))
-        
-        if len(occurrences) < 2:
-            continue
-        
-        
-        # doc_name = path to file relative to cwd
-        # file_path_obj is already the correct relative path (from path.rglob)
-        doc_name = str(file_path_obj)
-        edges_added = 0
-        
-        for i in range(len(occurrences) - 1):
-            src_word, src_h8, _, _ = occurrences[i]
-            tgt_word, tgt_h8, tgt_line, tgt_ctx = occurrences[i + 1]
-            
-            _overlay.add_edge(
-                src_h8, tgt_h8,
-                weight=1.0,
-                doc=doc_name,
-                ring="sigma",  # All document edges are σ (facts)
-                phase="solid",
-                line=tgt_line,
-                ctx_hash=tgt_ctx,
-            )
-            _overlay.define_label(src_h8, src_word)
-            _overlay.define_label(tgt_h8, tgt_word)
-            edges_added += 1
-        
-        total_edges += edges_added
-        total_anchors_found += len(anchor_words)
-        files_processed += 1
-
-        if files_processed == 1 or (files_processed % 100 == 0) or files_processed == total_files:
+    
+    def on_doc(scanned, _removed, added):
+        nonlocal files_processed
+        n = writer.report.docs
+        if n == 1 or n % 100 == 0:
             try:
-                print(f"[invariant] ingest: indexed {files_processed}/{total_files}", flush=True)
+                print(f"[invariant] ingest: indexed {n} files", flush=True)
             except Exception:
                 pass
-        
-        # Track first 10 files for progress visibility
+        if not added:
+            return
+        files_processed += 1
         if len(files_details) < 10:
-            files_details.append({
-                "file": doc_name,
-                "edges": edges_added,
-                "anchors": len(anchor_words)
-            })
+            files_details.append({"file": scanned.doc, "edges": added})
+    
+    # INVARIANT VII (σ-presence wins): every non-hub token is indexed.
+    # Hub threshold: √N_vocab (derived, not magic)
+    # Window stats beside the overlay are kept current by delta
+    stats = _take_window_stats()
+    # Copy-on-write: a run that fails partway leaves _overlay untouched
+    overlay = _overlay.copy()
+    writer = IngestWriter(
+        overlay=overlay,
+        fetch_meta=fetch_meta,
+        mean_mass=_physics.mean_mass,
+        stats=stats,
+        on_doc=on_doc,
+        policy=HUB_ANCHORS,
+        n_labels=int((_physics.meta or {}).get("n_labels") or 150000),
+    )
+    try:
+        # doc_name = path as walked (relative to cwd for relative inputs)
+        report = ingest_path(path, writer, doc_name=str)
+    except MetaFetchError as e:
+        return json.dumps({"error": f"Crystal server error: {e}"})
     
+    if not report.files_found:
+        return json.dumps({"error": f"No text files found in {file_path}"})
+    if not report.docs:
+        return json.dumps({"error": "No words found in any files"})
     
-    # Save overlay
-    _overlay_path.parent.mkdir(parents=True, exist_ok=True)
-    _overlay.save(_overlay_path)
-
-    t_save = time.perf_counter()
+    # Save, then swap in the new overlay
+    with report.timings.stage("save"):
+        _overlay_path.parent.mkdir(parents=True, exist_ok=True)
+        overlay.save(_overlay_path)
+        stats.save(window_stats_path(_overlay_path), overlay)
+    _overlay = overlay
+    _window_stats, _window_stats_key = stats, overlay.version
     
     return json.dumps({
         "success": True,
         "path": file_path,
-        "total_files": total_files,
+        "total_files": report.docs,
         "files_processed": files_processed,
-        "total_edges": total_edges,
-        "total_anchors": total_anchors_found,
-        "unique_words_processed": len(all_words_set),
+        "total_edges": report.edges,
+        "total_anchors": report.anchors,
+        "replaced_edges": report.replaced_edges,
+        "unique_words_processed": report.meta_hashes,
         "http_requests": http_requests,  # Mega-batch optimization (chunked)
         "files_sample": files_details,  # First 10 files
         "overlay_path": str(_overlay_path),
-        "timing_s": {
-            "scan": round(t_scan - t0, 3),
-            "crystal_meta": round(t_meta - t_scan, 3),
-            "index": round(t_save - t_meta, 3),
-            "total": round(t_save - t0, 3),
-        },
+        "discovery": report.discovery.as_dict(),
+        "timing_s": {**report.timings.as_dict(), "total": round(time.perf_counter() - t0, 3)},
     }, indent=2)
 
 
@@ -1308,6 +1403,22 @@ def ingest(file_path: str) -> str:
 # HELPERS
 # ============================================================================
 
+def _take_window_stats():
+    """
+    Window stats of _overlay for an ingest: the in-memory copy if it is
+    current, else the persisted one (rebuilt if stale). The ingest mutates
+    them, so they are cached again only after a successful save.
+    """
+    global _window_stats, _window_stats_key
+    from invariant_sdk.operators import load_or_build_window_stats
+    
+    stats, key = _window_stats, _window_stats_key
+    _window_stats = _window_stats_key = None
+    if stats is not None and key == _overlay.version:
+        return stats
+    return load_or_build_window_stats(_overlay_path, _overlay)
+
+
 def _find_doc_path(doc: str) -> Optional[Path]:
     """Find document in project. Supports both full paths and basename fallback."""
     # Try exact path first (new overlay format with relative path)
@@ -1339,24 +1450,6 @@ def _find_doc_path(doc: str) -> Optional[Path]:
     return None
 
 
-def _compute_hashes_at_line(tokens: list, target_line: int, k: int = 2) -> list:
-    """Compute all ctx_hashes for tokens at a given line."""
-    import hashlib
-    
-    line_tokens = [(i, t) for i, t in enumerate(tokens) if t[1] == target_line]
-    hashes = []
-    
-    for anchor_idx, _ in line_tokens:
-        start = max(0, anchor_idx - k)
-        end = min(len(tokens), anchor_idx + k + 1)
-        window = [tokens[i][0] for i in range(start, end)]
-        normalized = ' '.join(window)
-        h = hashlib.sha256(normalized.encode('utf-8')).hexdigest()[:8]
-        hashes.append(h)
-    
-    return hashes
-
-
 # ============================================================================
 # MAIN
 # ============================================================================
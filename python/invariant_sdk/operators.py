@@ -19,13 +19,22 @@ from __future__ import annotations
 
 import hashlib
 import math
+import pickle
 import re
-from dataclasses import dataclass
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum
+from itertools import combinations, repeat
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
+from .filecache import iter_lines, shared_file_cache
 from .overlay import OverlayEdge, OverlayGraph
+from .pathsearch import find_path
 
 
 # =============================================================================
@@ -52,6 +61,9 @@ CONTEXT_WINDOW_K = 2
 # Sweet spot: 0.20–0.35. We use 0.30 as center of validated range.
 GAS_DF_THRESHOLD = 0.30
 
+# Pair incidences expanded per co-occurrence counting block (bounds peak memory)
+_PAIR_BLOCK = 500_000
+
 
 # =============================================================================
 # VERIFY RESULT (3-valued)
@@ -111,18 +123,96 @@ def read_context_window(path: Path, line: int, k: int = CONTEXT_WINDOW_K) -> Opt
     Returns:
         Concatenated text of lines [line-k, line+k] or None if file unreadable
     """
-    try:
-        lines = path.read_text(encoding='utf-8', errors='ignore').splitlines()
-    except Exception:
+    cache = shared_file_cache()
+    entry = cache.get(path)
+    if entry is None:
+        # Unreadable or above the cache bound: stream only the window.
+        lines = cache.read_lines(path, line - k, line + k)
+        if lines is None or line < 1:
+            return None
+        return ' '.join(lines)
+    
+    if entry.line_count() == 0 or line < 1:
         return None
     
-    if not lines or line < 1:
+    return ' '.join(entry.lines(line - k, line + k))
+
+
+class _AnchorWindows:
+    """
+    ±k line windows of one document, hashed from a single line array.
+
+    normalize_text works token by token and the window joins lines with a
+    space, so normalize(window) == ' '.join(non-empty normalize(line)).
+    Each line is normalized at most once; each candidate hash then costs
+    O(window) instead of a file re-read.
+    """
+
+    def __init__(self, lines: Sequence[str], k: int = CONTEXT_WINDOW_K):
+        self.lines = lines
+        self.k = k
+        self._norm: Dict[int, str] = {}
+        self._hash: Dict[int, Optional[str]] = {}
+
+    def _normalized(self, idx: int) -> str:
+        norm = self._norm.get(idx)
+        if norm is None:
+            norm = normalize_text(self.lines[idx])
+            self._norm[idx] = norm
+        return norm
+
+    def _bounds(self, line: int) -> Tuple[int, int]:
+        return max(0, line - 1 - self.k), min(len(self.lines), line + self.k)
+
+    def content(self, line: int) -> str:
+        start, end = self._bounds(line)
+        return ' '.join(self.lines[start:end])
+
+    def ctx_hash(self, line: int) -> Optional[str]:
+        """Hash of the window at `line`; None where read_context_window is empty."""
+        if line in self._hash:
+            return self._hash[line]
+        start, end = self._bounds(line)
+        h: Optional[str] = None
+        # read_context_window() yields '' (falsy) for an empty single-line window.
+        if line >= 1 and (end - start > 1 or (end - start == 1 and self.lines[start])):
+            parts = [self._normalized(i) for i in range(start, end)]
+            normalized = ' '.join(p for p in parts if p)
+            h = hashlib.sha256(normalized.encode('utf-8')).hexdigest()[:8]
+        self._hash[line] = h
+        return h
+
+    def relocate(self, line: int, ctx_hash: str) -> Tuple[Optional[str], int, int]:
+        """Same search order as the protocol: exact line, then +d/-d for d ≤ R."""
+        if not self.lines:
+            return (None, line, OverlayEdge.DECOHERENT)
+        if self.ctx_hash(line) == ctx_hash:
+            return (self.content(line), line, OverlayEdge.COHERENT)
+        total_lines = len(self.lines)
+        for offset in range(1, RELOCATION_RADIUS + 1):
+            for candidate in (line + offset, line - offset):
+                if candidate < 1 or candidate > total_lines:
+                    continue
+                if self.ctx_hash(candidate) == ctx_hash:
+                    return (self.content(candidate), candidate, OverlayEdge.RELOCATED)
+        return (None, line, OverlayEdge.DECOHERENT)
+
+
+def _resolve_doc(doc: str, base_path: Optional[Path]) -> Path:
+    return base_path / doc if base_path else Path(doc)
+
+
+def _document_lines(path: Path) -> Optional[Sequence[str]]:
+    """One read of the document (cached view, or streamed for huge files)."""
+    if not path.exists():
+        return None
+    entry = shared_file_cache().get(path)
+    if entry is not None:
+        return entry.line_view()
+    try:
+        return list(iter_lines(path))
+    except OSError:
         return None
-    
-    start = max(0, line - 1 - k)
-    end = min(len(lines), line + k)
-    
-    return ' '.join(lines[start:end])
 
 
 def reread_context_window(
@@ -146,148 +236,1009 @@ def reread_context_window(
         - new_line: Updated line number (may differ if RELOCATED)
         - anchor_state: 0=COHERENT, 1=RELOCATED, 2=DECOHERENT
     """
-    # Resolve path
-    if base_path:
-        path = base_path / doc
-    else:
-        path = Path(doc)
-    
-    if not path.exists():
+    lines = _document_lines(_resolve_doc(doc, base_path))
+    if lines is None:
         return (None, line, OverlayEdge.DECOHERENT)
-    
+    return _AnchorWindows(lines).relocate(line, ctx_hash)
+
+
+def reread_context_windows(
+    doc: str,
+    anchors: Sequence[Tuple[int, str]],
+    base_path: Optional[Path] = None,
+) -> List[Tuple[Optional[str], int, int]]:
+    """
+    Batch Anchor Integrity Protocol: relocate all (line, ctx_hash) anchors of
+    one document with a single read; window hashes are shared across anchors.
+
+    Returns one (content, new_line, anchor_state) per anchor, in input order.
+    """
+    lines = _document_lines(_resolve_doc(doc, base_path))
+    if lines is None:
+        return [(None, line, OverlayEdge.DECOHERENT) for line, _h in anchors]
+    windows = _AnchorWindows(lines)
+    return [windows.relocate(line, ctx_hash) for line, ctx_hash in anchors]
+
+
+# -----------------------------------------------------------------------------
+# Bulk sweep (inv doctor)
+# -----------------------------------------------------------------------------
+
+@dataclass
+class AnchorSweepReport:
+    """Outcome of a bulk anchor-integrity sweep over an overlay."""
+    n_edges: int
+    n_docs: int
+    coherent: int
+    relocated: int
+    decoherent: int
+    changed: int  # edges whose anchor_state or line was updated in place
+    elapsed_s: float
+
+    @property
+    def edges_per_s(self) -> float:
+        return self.n_edges / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "edges": self.n_edges,
+            "docs": self.n_docs,
+            "coherent": self.coherent,
+            "relocated": self.relocated,
+            "decoherent": self.decoherent,
+            "changed": self.changed,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "edges_per_s": round(self.edges_per_s, 1),
+        }
+
+
+def token_window_hashes(
+    tokens: Sequence[Tuple[str, int]],
+    k: int = CONTEXT_WINDOW_K,
+) -> Dict[str, List[int]]:
+    """
+    Index ingest-style ctx_hashes of one tokenized document.
+
+    Ingest anchors each σ-edge on the ±k token window around its target token
+    (sha256 of the lowercased, space-joined words). Returns
+    {ctx_hash: sorted lines where that window occurs}.
+    """
+    from .ingest import CtxHashIndex
+
+    index: Dict[str, List[int]] = {}
+    for h, (_w, line) in zip(CtxHashIndex(tokens, k).hashes(), tokens):
+        lines = index.setdefault(h, [])
+        if not lines or lines[-1] != line:
+            lines.append(line)
+    return index
+
+
+def _nearest_anchor_line(lines: List[int], line: int, radius: int) -> Tuple[int, int]:
+    """(anchor_state, line) for one anchor given the lines where its hash occurs."""
+    if not lines:
+        return (OverlayEdge.DECOHERENT, line)
+    i = bisect_left(lines, line)
+    if i < len(lines) and lines[i] == line:
+        return (OverlayEdge.COHERENT, line)
+    up = lines[i - 1] if i > 0 else None
+    down = lines[i] if i < len(lines) else None
+    # Nearest wins; ties go upward (same scan order as MCP/UI context).
+    best = up
+    if down is not None and (up is None or down - line < line - up):
+        best = down
+    if best is not None and abs(best - line) <= radius:
+        return (OverlayEdge.RELOCATED, best)
+    return (OverlayEdge.DECOHERENT, line)
+
+
+def _sweep_document(
+    path: str,
+    anchors: List[Tuple[int, str]],
+    radius: int = RELOCATION_RADIUS,
+) -> List[Tuple[int, int]]:
+    """Worker entry point: one read + one tokenization per document."""
+    from .tokenize import tokenize_with_lines
+
     try:
-        lines = path.read_text(encoding='utf-8', errors='ignore').splitlines()
-    except Exception:
-        return (None, line, OverlayEdge.DECOHERENT)
-    
-    total_lines = len(lines)
-    
-    # 1. Check original line
-    content = read_context_window(path, line)
-    if content and compute_ctx_hash(content) == ctx_hash:
-        return (content, line, OverlayEdge.COHERENT)
-    
-    # 2. Scan radius ±R
-    for offset in range(1, RELOCATION_RADIUS + 1):
-        for candidate in [line + offset, line - offset]:
-            if candidate < 1 or candidate > total_lines:
-                continue
-            content = read_context_window(path, candidate)
-            if content and compute_ctx_hash(content) == ctx_hash:
-                return (content, candidate, OverlayEdge.RELOCATED)
-    
-    # 3. Not found
-    return (None, line, OverlayEdge.DECOHERENT)
+        text = Path(path).read_text(encoding='utf-8', errors='ignore')
+    except OSError:
+        return [(OverlayEdge.DECOHERENT, line) for line, _h in anchors]
+    index = token_window_hashes(tokenize_with_lines(text))
+    return [_nearest_anchor_line(index.get(h, []), line, radius) for line, h in anchors]
+
+
+def sweep_anchor_integrity(
+    overlay: OverlayGraph,
+    base_path: Optional[Path] = None,
+    *,
+    workers: int = 0,
+    radius: int = RELOCATION_RADIUS,
+) -> AnchorSweepReport:
+    """
+    Check every σ-edge anchor of an overlay at once (MYCELIUM v2.3 §2.2).
+
+    Edges are grouped by document; each document is read and tokenized once
+    and all of its anchors are relocated against one window-hash index.
+    `anchor_state` (and `line` for RELOCATED) is updated in place; the report's
+    `changed` count tells the caller whether anything needs persisting.
+
+    workers > 1 spreads documents over a process pool.
+    """
+    started = time.perf_counter()
+    by_doc: Dict[str, List[OverlayEdge]] = {}
+    for edge_list in overlay.edges.values():
+        for edge in edge_list:
+            if edge.has_provenance() and edge.has_integrity():
+                by_doc.setdefault(edge.doc, []).append(edge)
+
+    docs = sorted(by_doc)
+    paths = [str(_resolve_doc(doc, base_path)) for doc in docs]
+    anchors = [[(e.line, e.ctx_hash) for e in by_doc[doc]] for doc in docs]
+
+    if workers > 1 and len(docs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(docs) // (workers * 4))
+            results = list(pool.map(_sweep_document, paths, anchors, repeat(radius), chunksize=chunksize))
+    else:
+        results = [_sweep_document(p, a, radius) for p, a in zip(paths, anchors)]
+
+    counts = {OverlayEdge.COHERENT: 0, OverlayEdge.RELOCATED: 0, OverlayEdge.DECOHERENT: 0}
+    changed = 0
+    for doc, outcome in zip(docs, results):
+        for edge, (state, line) in zip(by_doc[doc], outcome):
+            counts[state] += 1
+            if edge.anchor_state != state or edge.line != line:
+                edge.anchor_state = state
+                edge.line = line
+                changed += 1
+    if changed:
+        overlay.touch()
+
+    return AnchorSweepReport(
+        n_edges=sum(counts.values()),
+        n_docs=len(docs),
+        coherent=counts[OverlayEdge.COHERENT],
+        relocated=counts[OverlayEdge.RELOCATED],
+        decoherent=counts[OverlayEdge.DECOHERENT],
+        changed=changed,
+        elapsed_s=time.perf_counter() - started,
+    )
 
 
 # =============================================================================
 # MATCHED NULL (L0-Pure, W-terms)
 # =============================================================================
 
+def _sorted_contains(values: Sequence[int], x: int) -> bool:
+    i = bisect_left(values, x)
+    return i < len(values) and values[i] == x
+
+
+class CooccurMatrix:
+    """
+    Sparse window × token incidence with integer ids (pure accelerator).
+
+    - hash8 → dense id, assigned in sorted hash order at build/compaction
+      (tokens first seen by a later add_window are appended)
+    - windows stored as CSR: window i = indices[indptr[i]:indptr[i+1]] (sorted ids)
+    - inverted postings (CSC): token t = post_idx[post_ptr[t]:post_ptr[t+1]]
+      (sorted window ids), so k-way co-occurrence is a posting intersection
+    - co-occurrence by sorted-pair counting: packed keys (a << 32) | b (a < b)
+      in a sorted array with parallel counts, looked up by bisect
+
+    Gas-token pruning (optional) skips Gas ids before the O(k²) pair expansion;
+    weights for pruned pairs are then counted exactly on demand from the CSR
+    rows, so answers never change — only the memory/time profile does.
+
+    Incremental maintenance (add_window / remove_doc) keeps the CSR base
+    immutable and records deltas beside it: appended rows + postings, a set of
+    dead window ids and signed pair-count deltas. compact() folds them back
+    into a fresh base once they outgrow it.
+    """
+
+    __slots__ = (
+        "tokens", "ids", "indptr", "indices", "post_ptr", "post_idx",
+        "df", "gas", "pair_keys", "pair_counts", "prune_gas",
+        "window_docs", "doc_windows", "extra_rows", "extra_post", "dead",
+        "pair_delta", "_extra",
+    )
+
+    def __init__(
+        self,
+        tokens: List[str],
+        indptr: array,
+        indices: array,
+        window_docs: Optional[List[str]] = None,
+        *,
+        prune_gas: bool = False,
+    ):
+        self.tokens = tokens
+        self.ids: Dict[str, int] = {h: i for i, h in enumerate(tokens)}
+        self.indptr = indptr
+        self.indices = indices
+        self.prune_gas = prune_gas
+
+        n = len(tokens)
+        df = array('q', bytes(8 * n))
+        for t in indices:
+            df[t] += 1
+        self.df = df
+
+        n_windows = len(indptr) - 1
+        # Transpose CSR → CSC by counting sort; window ids come out sorted.
+        post_ptr = array('q', [0])
+        for t in range(n):
+            post_ptr.append(post_ptr[-1] + df[t])
+        fill = array('q', post_ptr[:-1])
+        post_idx = array('l', bytes(array('l').itemsize * len(indices)))
+        for w in range(n_windows):
+            for t in indices[indptr[w]:indptr[w + 1]]:
+                post_idx[fill[t]] = w
+                fill[t] += 1
+        self.post_ptr = post_ptr
+        self.post_idx = post_idx
+
+        # Owning document per window (drives remove_doc)
+        self.window_docs: List[str] = window_docs if window_docs is not None else [""] * n_windows
+        self.doc_windows: Dict[str, List[int]] = {}
+        for w, doc in enumerate(self.window_docs):
+            self.doc_windows.setdefault(doc, []).append(w)
+
+        self.extra_rows: List[array] = []  # windows added since the base was built
+        self.extra_post: Dict[int, List[int]] = {}  # their postings (ascending)
+        self.dead: Set[int] = set()  # removed window ids (base or extra)
+        self.pair_delta: Dict[int, int] = {}  # signed pair-count changes
+
+        gas_threshold = int(n_windows * GAS_DF_THRESHOLD)
+        self.gas: Set[int] = {i for i in range(n) if df[i] > gas_threshold} if prune_gas else set()
+
+        self.pair_keys, self.pair_counts = self._count_pairs()
+        self._extra: Dict[int, int] = {}  # on-demand counts for pruned (Gas) pairs
+
+    def _count_pairs(self) -> Tuple[array, array]:
+        """
+        Sorted-pair counting → (sorted packed keys, counts), ~12 bytes per pair.
+
+        Pairs are expanded in blocks of first-id so the transient Counter stays
+        bounded (~_PAIR_BLOCK incidences) however dense the windows are.
+        """
+        n = len(self.tokens)
+        gas = self.gas
+        rows: List[Sequence[int]] = []
+        per_first = array('q', bytes(8 * max(n, 1)))
+        for w in range(self.n_base):
+            row = self.row(w)
+            if gas:
+                row = array('l', [t for t in row if t not in gas])
+            rows.append(row)
+            k = len(row)
+            for i, t in enumerate(row):
+                per_first[t] += k - 1 - i
+
+        # Block boundaries over first ids, ~_PAIR_BLOCK pair incidences each.
+        bounds = [0]
+        acc = 0
+        for t in range(n):
+            acc += per_first[t]
+            if acc >= _PAIR_BLOCK:
+                bounds.append(t + 1)
+                acc = 0
+        if bounds[-1] != n:
+            bounds.append(n)
+
+        keys = array('q')
+        counts = array('l')
+        for lo, hi in zip(bounds, bounds[1:]):
+            block: Counter = Counter()
+            for row in rows:
+                k = len(row)
+                if k < 2:
+                    continue
+                i0 = bisect_left(row, lo)
+                i1 = min(bisect_left(row, hi, i0), k - 1)
+                if i0 < i1:
+                    block.update([(row[i] << 32) | y for i in range(i0, i1) for y in row[i + 1:]])
+            for key in sorted(block):
+                keys.append(key)
+                counts.append(block[key])
+        return keys, counts
+
+    @property
+    def n_base(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def n_windows(self) -> int:
+        """Live windows (base + added − removed)."""
+        return self.n_base + len(self.extra_rows) - len(self.dead)
+
+    def live_windows(self) -> Iterator[int]:
+        dead = self.dead
+        for w in range(self.n_base + len(self.extra_rows)):
+            if w not in dead:
+                yield w
+
+    def row(self, w: int) -> Sequence[int]:
+        base = self.n_base
+        if w >= base:
+            return self.extra_rows[w - base]
+        return self.indices[self.indptr[w]:self.indptr[w + 1]]
+
+    def postings(self, t: int) -> Sequence[int]:
+        """Sorted ids of the live windows containing token id t."""
+        if t + 1 < len(self.post_ptr):
+            out: Sequence[int] = self.post_idx[self.post_ptr[t]:self.post_ptr[t + 1]]
+        else:
+            out = ()
+        extra = self.extra_post.get(t)
+        if extra:
+            out = list(out) + extra  # extra ids are all above the base ids
+        if self.dead:
+            dead = self.dead
+            out = [w for w in out if w not in dead]
+        return out
+
+    def windows_with(self, *hashes: str) -> List[int]:
+        """Sorted ids of windows containing every given token (posting intersection)."""
+        ids = []
+        for h in hashes:
+            t = self.ids.get(h)
+            if t is None:
+                return []
+            ids.append(t)
+        if not ids:
+            return list(self.live_windows())
+        # Drive from the shortest posting list; probe the others by bisect.
+        lists = sorted((self.postings(t) for t in set(ids)), key=len)
+        out = list(lists[0])
+        for other in lists[1:]:
+            out = [w for w in out if _sorted_contains(other, w)]
+            if not out:
+                break
+        return out
+
+    def count_windows_with(self, *hashes: str) -> int:
+        """Number of windows containing every given token."""
+        return len(self.windows_with(*hashes))
+
+    def weight(self, a: str, b: str) -> int:
+        """W(A ∧ B): windows where both tokens occur (0 for a == b)."""
+        ia, ib = self.ids.get(a), self.ids.get(b)
+        if ia is None or ib is None or ia == ib:
+            return 0
+        if ia > ib:
+            ia, ib = ib, ia
+        key = (ia << 32) | ib
+        if ia in self.gas or ib in self.gas:
+            count = self._extra.get(key)
+            if count is None:
+                count = self._extra[key] = self.count_windows_with(a, b)
+            return count
+        count = self.pair_delta.get(key, 0)
+        i = bisect_left(self.pair_keys, key)
+        if i < len(self.pair_keys) and self.pair_keys[i] == key:
+            count += self.pair_counts[i]
+        return count
+
+    def iter_pairs(self) -> Iterator[Tuple[Tuple[str, str], int]]:
+        """((a, b), count) with a < b for every counted (non-pruned) pair."""
+        tokens = self.tokens
+        delta = self.pair_delta
+        mask = (1 << 32) - 1
+        for key, count in zip(self.pair_keys, self.pair_counts):
+            count += delta.get(key, 0)
+            if count:
+                a, b = tokens[key >> 32], tokens[key & mask]
+                yield ((a, b) if a < b else (b, a)), count
+        for key, count in delta.items():
+            if count and not _sorted_contains(self.pair_keys, key):
+                a, b = tokens[key >> 32], tokens[key & mask]
+                yield ((a, b) if a < b else (b, a)), count
+
+    # -- incremental maintenance --------------------------------------------
+
+    def _bump_pairs(self, row: Sequence[int], sign: int) -> None:
+        gas = self.gas
+        if gas:
+            row = [t for t in row if t not in gas]
+        delta = self.pair_delta
+        for i in range(len(row) - 1):
+            hi = row[i] << 32
+            for y in row[i + 1:]:
+                key = hi | y
+                count = delta.get(key, 0) + sign
+                if count:
+                    delta[key] = count
+                else:
+                    del delta[key]
+
+    def add_window(self, doc: str, hashes: Set[str]) -> int:
+        """Append one window (token hash set) owned by `doc`; returns its id."""
+        ids = self.ids
+        row = array('l')
+        for h in hashes:
+            t = ids.get(h)
+            if t is None:
+                t = ids[h] = len(self.tokens)
+                self.tokens.append(h)
+                self.df.append(0)
+            row.append(t)
+        row = array('l', sorted(row))
+
+        w = self.n_base + len(self.extra_rows)
+        self.extra_rows.append(row)
+        self.window_docs.append(doc)
+        self.doc_windows.setdefault(doc, []).append(w)
+        for t in row:
+            self.df[t] += 1
+            self.extra_post.setdefault(t, []).append(w)
+        self._bump_pairs(row, +1)
+        self._extra.clear()
+        return w
+
+    def remove_doc(self, doc: str) -> List[Sequence[int]]:
+        """Drop every window owned by `doc`; returns their rows (token ids)."""
+        removed = []
+        for w in self.doc_windows.pop(doc, ()):
+            row = self.row(w)
+            for t in row:
+                self.df[t] -= 1
+            self._bump_pairs(row, -1)
+            self.dead.add(w)
+            removed.append(row)
+        if removed:
+            self._extra.clear()
+        return removed
+
+    @property
+    def n_pending(self) -> int:
+        """Delta size (added + removed windows) not yet folded into the base."""
+        return len(self.extra_rows) + len(self.dead)
+
+    def compact(self) -> None:
+        """Fold deltas into a fresh base (ids re-sorted, zero-df tokens dropped)."""
+        live = list(self.live_windows())
+        tokens = sorted(self.tokens[t] for t in range(len(self.tokens)) if self.df[t] > 0)
+        new_ids = {h: i for i, h in enumerate(tokens)}
+        remap = [new_ids.get(h, -1) for h in self.tokens]
+        indptr = array('q', [0])
+        indices = array('l')
+        for w in live:
+            indices.extend(sorted(remap[t] for t in self.row(w)))
+            indptr.append(len(indices))
+        window_docs = [self.window_docs[w] for w in live]
+        fresh = CooccurMatrix(tokens, indptr, indices, window_docs, prune_gas=self.prune_gas)
+        for name in self.__slots__:
+            setattr(self, name, getattr(fresh, name))
+
+
+# Stats file format version (bump on any incompatible layout change)
+WINDOW_STATS_VERSION = 3
+
+# Deltas are folded into the CSR base once they exceed max(this, base size)
+_COMPACT_MIN_WINDOWS = 4096
+
+
+def _doc_provable_edges(overlay: OverlayGraph, doc: str) -> Iterator[Tuple[str, OverlayEdge]]:
+    """Provable edges of one document (those with a line are window observations)."""
+    for src in overlay.doc_to_nodes.get(doc, ()):
+        for edge in overlay.edges.get(src, ()):
+            if edge.doc == doc and edge.is_provable():
+                yield src, edge
+
+
+def _edge_dt(edge: OverlayEdge) -> int:
+    # ADJACENT implies dt=1
+    return 1 if (edge.witness & OverlayEdge.ADJACENT) else 2
+
+
+@dataclass
+class WindowStatsDelta:
+    """What one add_doc / remove_doc changed (input to update_dt_null_cache)."""
+    doc: str
+    windows_added: int = 0
+    windows_removed: int = 0
+    df_changes: Dict[str, Tuple[int, int]] = field(default_factory=dict)  # token → (df before, df after)
+    touched: Set[str] = field(default_factory=set)  # tokens whose windows/adjacency changed
+    dt_targets: Set[str] = field(default_factory=set)  # tgt of every changed dt_distances entry
+
+    def merge(self, other: "WindowStatsDelta") -> None:
+        """Fold a later delta into this one (earliest 'before', latest 'after')."""
+        self.windows_added += other.windows_added
+        self.windows_removed += other.windows_removed
+        for token, (before, after) in other.df_changes.items():
+            first = self.df_changes.get(token, (before, after))[0]
+            self.df_changes[token] = (first, after)
+        self.touched |= other.touched
+        self.dt_targets |= other.dt_targets
+
+
 @dataclass
 class WindowStats:
     """Statistics for matched null calculation."""
-    windows: List[Set[str]]  # List of token sets per window
     token_df: Dict[str, int]  # Document frequency per token
-    cooccur: Dict[Tuple[str, str], int]  # Co-occurrence counts
     n_windows: int
     # Distance tracking for dt_null computation
     dt_distances: Dict[Tuple[str, str], List[int]]  # (src, tgt) → list of distances
+    # Sparse co-occurrence engine (CSR windows + packed pair counts)
+    matrix: CooccurMatrix = field(repr=False)
+    track_distances: bool = True
+    # Bumped by every add_doc / remove_doc
+    version: int = 0
+    # Derived accelerator for find_matched_null (see matched_null_index)
+    _null_index: Optional["MatchedNullIndex"] = field(default=None, repr=False, compare=False)
+    # dt_null cache kept current across deltas (see dt_null_cache)
+    _dt_null: Optional["DtNullCache"] = field(default=None, repr=False, compare=False)
+    _pending: Optional[WindowStatsDelta] = field(default=None, repr=False, compare=False)
+
+    @property
+    def windows(self) -> List[Set[str]]:
+        """Token set per window (materialized on demand; prefer `matrix`)."""
+        tokens = self.matrix.tokens
+        return [{tokens[t] for t in self.matrix.row(w)} for w in self.matrix.live_windows()]
+
+    @property
+    def cooccur(self) -> Dict[Tuple[str, str], int]:
+        """Co-occurrence counts keyed by sorted hash pair (materialized on demand)."""
+        return dict(self.matrix.iter_pairs())
+
+    def add_doc(self, doc: str, overlay: OverlayGraph) -> WindowStatsDelta:
+        """
+        Count the windows of one document that is already in the overlay.
+        
+        Only df / pair counts / dt lists of that document's tokens move;
+        nothing else is recounted.
+        """
+        matrix = self.matrix
+        if doc in matrix.doc_windows:
+            raise ValueError(f"Document already counted: {doc} (remove_doc first)")
+
+        delta = WindowStatsDelta(doc=doc)
+        window_map: Dict[int, Set[str]] = {}
+        for src, edge in _doc_provable_edges(overlay, doc):
+            delta.touched.add(src)
+            delta.touched.add(edge.tgt)
+            if not edge.line:
+                continue
+            members = window_map.setdefault(edge.line, set())
+            members.add(src)
+            members.add(edge.tgt)
+            if self.track_distances:
+                self.dt_distances.setdefault((src, edge.tgt), []).append(_edge_dt(edge))
+                delta.dt_targets.add(edge.tgt)
+
+        for members in window_map.values():
+            matrix.add_window(doc, members)
+        delta.windows_added = len(window_map)
+        self._apply(delta)
+        return delta
+
+    def remove_doc(self, doc: str, overlay: Optional[OverlayGraph] = None) -> WindowStatsDelta:
+        """
+        Uncount the windows of one document.
+        
+        Windows are subtracted exactly from the stored rows. dt_distances come
+        from the document's edges, so pass the overlay *before* delete_doc.
+        """
+        matrix = self.matrix
+        delta = WindowStatsDelta(doc=doc)
+        rows = matrix.remove_doc(doc)
+        for row in rows:
+            delta.touched.update(matrix.tokens[t] for t in row)
+        delta.windows_removed = len(rows)
+
+        for src, edge in _doc_provable_edges(overlay, doc) if overlay is not None else ():
+            delta.touched.add(src)
+            delta.touched.add(edge.tgt)
+            if self.track_distances and edge.line:
+                pair = (src, edge.tgt)
+                dists = self.dt_distances.get(pair)
+                if dists is None:
+                    continue
+                try:
+                    dists.remove(_edge_dt(edge))
+                except ValueError:
+                    continue
+                if not dists:
+                    del self.dt_distances[pair]
+                delta.dt_targets.add(edge.tgt)
+
+        self._apply(delta)
+        return delta
+
+    def _apply(self, delta: WindowStatsDelta) -> None:
+        """Sync token_df with the matrix for touched tokens, then invalidate caches."""
+        matrix = self.matrix
+        for h in delta.touched:
+            old = self.token_df.get(h, 0)
+            t = matrix.ids.get(h)
+            new = matrix.df[t] if t is not None else 0
+            if new:
+                self.token_df[h] = new
+            else:
+                self.token_df.pop(h, None)
+            if new != old:
+                delta.df_changes[h] = (old, new)
+        self.n_windows = matrix.n_windows
+        if matrix.n_pending > max(_COMPACT_MIN_WINDOWS, matrix.n_base):
+            matrix.compact()
+        self.version += 1
+        self._null_index = None
+        if self._dt_null is not None:
+            if self._pending is None:
+                self._pending = WindowStatsDelta(doc=delta.doc)
+            self._pending.merge(delta)
+
+    def dt_null_cache(self, overlay: OverlayGraph) -> "DtNullCache":
+        """
+        compute_dt_null_cache, kept current across add_doc / remove_doc.
+        
+        Deltas are applied lazily here, when the overlay reflects them.
+        """
+        if self._dt_null is None:
+            self._dt_null = compute_dt_null_cache(self, overlay)
+        elif self._pending is not None:
+            update_dt_null_cache(self._dt_null, self, overlay, self._pending)
+        self._pending = None
+        return self._dt_null
 
+    def save(self, path: Path, overlay: OverlayGraph) -> None:
+        """
+        Persist next to the overlay (see window_stats_path), stamped with the
+        overlay's save token: save the overlay first, or the file never loads.
+        """
+        null_index, self._null_index = self._null_index, None
+        try:
+            payload = {
+                'version': WINDOW_STATS_VERSION,
+                'overlay_token': overlay.persisted_token(),
+                'stats': self,
+            }
+            path = Path(path)
+            tmp = path.with_suffix(path.suffix + '.tmp')
+            with open(tmp, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp.replace(path)
+        finally:
+            self._null_index = null_index
 
-def build_window_stats(overlay: OverlayGraph, track_distances: bool = True) -> WindowStats:
+
+def build_window_stats(
+    overlay: OverlayGraph,
+    track_distances: bool = True,
+    prune_gas: bool = False,
+) -> WindowStats:
     """
     Build window statistics for matched null calculation.
     
     Each edge with doc+line represents a window observation.
+    prune_gas skips Gas tokens before pair expansion (see CooccurMatrix).
     """
-    windows: List[Set[str]] = []
-    token_df: Dict[str, int] = {}
-    cooccur: Dict[Tuple[str, str], int] = {}
     dt_distances: Dict[Tuple[str, str], List[int]] = {}
     
-    # Group edges by (doc, line) to form windows
-    window_map: Dict[Tuple[str, int], Set[str]] = {}
+    # Group edges by (doc, line) to form windows (first-seen integer ids)
+    seen_ids: Dict[str, int] = {}
+    window_map: Dict[Tuple[str, int], Set[int]] = {}
     
     for src, edges in overlay.edges.items():
         for edge in edges:
             if edge.doc and edge.line and edge.is_provable():
                 key = (edge.doc, edge.line)
-                if key not in window_map:
-                    window_map[key] = set()
-                window_map[key].add(src)
-                window_map[key].add(edge.tgt)
+                members = window_map.get(key)
+                if members is None:
+                    members = window_map[key] = set()
+                members.add(seen_ids.setdefault(src, len(seen_ids)))
+                members.add(seen_ids.setdefault(edge.tgt, len(seen_ids)))
                 
                 # Track inter-token distance (approximated by witness)
                 if track_distances:
                     pair = (src, edge.tgt)
                     if pair not in dt_distances:
                         dt_distances[pair] = []
-                    # ADJACENT implies dt=1
-                    dt = 1 if (edge.witness & OverlayEdge.ADJACENT) else 2
-                    dt_distances[pair].append(dt)
-    
-    # Convert to list and compute statistics
-    for tokens in window_map.values():
-        windows.append(tokens)
-        
-        # Document frequency
-        for t in tokens:
-            token_df[t] = token_df.get(t, 0) + 1
-        
-        # Co-occurrence (unordered pairs)
-        token_list = sorted(tokens)
-        for i, t1 in enumerate(token_list):
-            for t2 in token_list[i+1:]:
-                pair = (t1, t2)
-                cooccur[pair] = cooccur.get(pair, 0) + 1
+                    dt_distances[pair].append(_edge_dt(edge))
+    
+    # Renumber to sorted hash order and pack windows as CSR
+    tokens = sorted(seen_ids)
+    remap = array('l', bytes(array('l').itemsize * len(tokens)))
+    for new_id, h in enumerate(tokens):
+        remap[seen_ids[h]] = new_id
+    indptr = array('q', [0])
+    indices = array('l')
+    window_docs: List[str] = []
+    for (doc, _line), members in window_map.items():
+        indices.extend(sorted(remap[t] for t in members))
+        indptr.append(len(indices))
+        window_docs.append(doc)
+    window_map.clear()
+    
+    matrix = CooccurMatrix(tokens, indptr, indices, window_docs, prune_gas=prune_gas)
+    token_df = {tokens[t]: matrix.df[t] for t in range(len(tokens)) if matrix.df[t]}
     
     return WindowStats(
-        windows=windows,
         token_df=token_df,
-        cooccur=cooccur,
-        n_windows=len(windows),
+        n_windows=matrix.n_windows,
         dt_distances=dt_distances,
+        matrix=matrix,
+        track_distances=track_distances,
     )
 
 
+def window_stats_path(overlay_path: Path) -> Path:
+    """Stats file stored next to an overlay: overlay.jsonl → overlay.winstats.pkl."""
+    return Path(overlay_path).with_suffix('.winstats.pkl')
+
+
+def load_window_stats(path: Path, overlay: OverlayGraph) -> Optional[WindowStats]:
+    """
+    Persisted WindowStats, or None if missing, unreadable, another version or stale.
+    
+    Fresh means stamped with `overlay.persisted_token()`: the overlay is
+    unchanged since the save that wrote the stats (O(1), no edge scan).
+    """
+    token = overlay.persisted_token()
+    if token is None:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(payload, dict) or payload.get('version') != WINDOW_STATS_VERSION:
+        return None
+    if payload.get('overlay_token') != token:
+        return None
+    stats = payload.get('stats')
+    return stats if isinstance(stats, WindowStats) else None
+
+
+def load_or_build_window_stats(
+    overlay_path: Path,
+    overlay: OverlayGraph,
+    prune_gas: bool = False,
+) -> WindowStats:
+    """Reload the stats persisted beside `overlay_path`, rebuilding (and saving) if stale."""
+    path = window_stats_path(overlay_path)
+    stats = load_window_stats(path, overlay)
+    if stats is None:
+        stats = build_window_stats(overlay, prune_gas=prune_gas)
+        if overlay.persisted_token() is not None:
+            try:
+                stats.save(path, overlay)
+            except OSError:
+                pass
+    return stats
+
+
+@dataclass
+class MatchedNullIndex:
+    """
+    Precomputed accelerator for matched-null lookup (MYCELIUM v2.3 §3.2).
+
+    Tokens are grouped by df (ascending; hashes sorted inside a group), so
+    argmin |log df(x) - log df(target)| is a bidirectional walk outward from
+    the target's rank instead of a scan of every token. Provable adjacency is
+    collected once instead of per lookup. Pure accelerator: same answers as
+    the exhaustive definition, including the min(hash8) tie-break.
+    """
+    token_df: Dict[str, int]
+    dfs: List[int]  # distinct df values, ascending
+    groups: List[List[str]]  # hashes per df value, sorted
+    rank: Dict[int, int]  # df → position in dfs
+    connected: Dict[str, Set[str]]  # provable σ-neighbours (both directions)
+    suppressed: Set[Tuple[str, str]]
+    dt_by_tgt: Dict[str, List[Tuple[str, List[int]]]]  # tgt → [(src, distances)]
+    key: int  # overlay.version at build time
+
+    @classmethod
+    def build(cls, stats: WindowStats, overlay: OverlayGraph) -> "MatchedNullIndex":
+        by_df: Dict[int, List[str]] = {}
+        for h, df in stats.token_df.items():
+            by_df.setdefault(df, []).append(h)
+        dfs = sorted(by_df)
+
+        connected: Dict[str, Set[str]] = {}
+        for src, edges in overlay.edges.items():
+            for edge in edges:
+                if edge.is_provable():
+                    connected.setdefault(edge.tgt, set()).add(src)
+                    connected.setdefault(src, set()).add(edge.tgt)
+
+        dt_by_tgt: Dict[str, List[Tuple[str, List[int]]]] = {}
+        for (src, tgt), dists in stats.dt_distances.items():
+            dt_by_tgt.setdefault(tgt, []).append((src, dists))
+
+        return cls(
+            token_df=stats.token_df,
+            dfs=dfs,
+            groups=[sorted(by_df[df]) for df in dfs],
+            rank={df: i for i, df in enumerate(dfs)},
+            connected=connected,
+            suppressed=overlay.suppressed,
+            dt_by_tgt=dt_by_tgt,
+            key=overlay.version,
+        )
+
+    def _first_eligible(self, target: str, group: List[str], excluded: Set[str]) -> Optional[str]:
+        for h in group:
+            if h == target or h in excluded:
+                continue
+            if (target, h) in self.suppressed or (h, target) in self.suppressed:
+                continue
+            return h
+        return None
+
+    def find(self, target_hash: str) -> Optional[str]:
+        """Nearest-log-df token that is not connected to / suppressed with target."""
+        return self.find_with_distance(target_hash)[0]
+
+    def find_with_distance(self, target_hash: str) -> Tuple[Optional[str], float]:
+        """(null, |log df(null) - log df(target)|); distance is inf when no null exists."""
+        target_df = self.token_df.get(target_hash)
+        if target_df is None:
+            return None, float('inf')
+        log_target_df = math.log(target_df + 1)
+        excluded = self.connected.get(target_hash, set())
+
+        r = self.rank[target_df]
+        best = self._first_eligible(target_hash, self.groups[r], excluded)
+        if best is not None:
+            return best, 0.0
+
+        lo, hi = r - 1, r + 1
+        n = len(self.dfs)
+        while lo >= 0 or hi < n:
+            d_lo = abs(math.log(self.dfs[lo] + 1) - log_target_df) if lo >= 0 else float('inf')
+            d_hi = abs(math.log(self.dfs[hi] + 1) - log_target_df) if hi < n else float('inf')
+            found: List[str] = []
+            # Equal diffs on both sides are one tie class (min hash8 wins).
+            if d_lo <= d_hi:
+                h = self._first_eligible(target_hash, self.groups[lo], excluded)
+                if h is not None:
+                    found.append(h)
+                lo -= 1
+            if d_hi <= d_lo:
+                h = self._first_eligible(target_hash, self.groups[hi], excluded)
+                if h is not None:
+                    found.append(h)
+                hi += 1
+            if found:
+                return min(found), min(d_lo, d_hi)
+        return None, float('inf')
+
+    def null_distances(self, null_hash: str, sources: Optional[Dict[str, int]] = None) -> List[int]:
+        """All dt(A, null) observations (optionally only for A in `sources`)."""
+        distances: List[int] = []
+        for src, dists in self.dt_by_tgt.get(null_hash, ()):
+            if sources is None or src in sources:
+                distances.extend(dists)
+        return distances
+
+
+def matched_null_index(stats: WindowStats, overlay: OverlayGraph) -> MatchedNullIndex:
+    """Cached MatchedNullIndex for (stats, overlay); rebuilt whenever the overlay is mutated."""
+    index = stats._null_index
+    if index is None or index.key != overlay.version or index.token_df is not stats.token_df:
+        index = MatchedNullIndex.build(stats, overlay)
+        stats._null_index = index
+    return index
+
+
+class DtNullCache(dict):
+    """
+    {token_hash: dt_null} plus what each answer depended on.
+
+    nulls[token] is the matched null used (None if none), spans[token] the
+    df interval within which another token's df could change that choice.
+    update_dt_null_cache uses both to recompute only affected tokens.
+    """
+
+    def __init__(self, n_suppressed: int = 0):
+        super().__init__()
+        self.nulls: Dict[str, Optional[str]] = {}
+        self.spans: Dict[str, Tuple[int, float]] = {}
+        self.n_suppressed = n_suppressed
+
+    def __reduce__(self):
+        return (_restore_dt_null_cache, (dict(self), self.nulls, self.spans, self.n_suppressed))
+
+
+def _restore_dt_null_cache(values, nulls, spans, n_suppressed) -> DtNullCache:
+    cache = DtNullCache(n_suppressed)
+    cache.update(values)
+    cache.nulls = nulls
+    cache.spans = spans
+    return cache
+
+
+def _fill_dt_null(cache: DtNullCache, token_hash: str, index: MatchedNullIndex, token_df: Dict[str, int]) -> None:
+    # Find matched null pair
+    null_hash, dist = index.find_with_distance(token_hash)
+    cache.nulls[token_hash] = null_hash
+    if null_hash is None:
+        cache.spans[token_hash] = (0, float('inf'))
+        return
+    # Any df within dist (log space) of the target could displace the null;
+    # widened by one on each side so float rounding can only over-invalidate.
+    base = token_df[token_hash] + 1
+    cache.spans[token_hash] = (
+        max(0, math.floor(base * math.exp(-dist)) - 2),
+        math.ceil(base * math.exp(dist)),
+    )
+    
+    # Get all distances to null pair
+    distances = index.null_distances(null_hash, token_df)
+    
+    if distances:
+        # Median distance
+        distances.sort()
+        median_idx = len(distances) // 2
+        cache[token_hash] = distances[median_idx]
+
+
 def compute_dt_null_cache(
     stats: WindowStats,
     overlay: OverlayGraph,
-) -> Dict[str, int]:
+) -> DtNullCache:
     """
     Compute dt_null for each token (MYCELIUM v2.3 §3.3).
     
     dt_null(B) = median(dt(A, B')) over all windows
     where B' is matched null pair for B.
     
+    One MatchedNullIndex serves every lookup and distances are pre-grouped
+    by target, so the whole cache costs ~O(T log T) instead of O(T²·E).
+    
     Returns:
         {token_hash: dt_null} cache for use in infer_SEQ
     """
-    dt_null_cache: Dict[str, int] = {}
+    dt_null_cache = DtNullCache(len(overlay.suppressed))
+    index = matched_null_index(stats, overlay)
     
     for token_hash in stats.token_df:
-        # Find matched null pair
-        null_hash = find_matched_null(token_hash, stats, overlay)
-        if null_hash is None:
-            continue
-        
-        # Get all distances to null pair
-        distances: List[int] = []
-        for src in stats.token_df:
-            pair = (src, null_hash)
-            if pair in stats.dt_distances:
-                distances.extend(stats.dt_distances[pair])
-        
-        if distances:
-            # Median distance
-            distances.sort()
-            median_idx = len(distances) // 2
-            dt_null_cache[token_hash] = distances[median_idx]
+        _fill_dt_null(dt_null_cache, token_hash, index, stats.token_df)
     
     return dt_null_cache
 
 
+def update_dt_null_cache(
+    cache: DtNullCache,
+    stats: WindowStats,
+    overlay: OverlayGraph,
+    delta: WindowStatsDelta,
+) -> Set[str]:
+    """
+    Bring a dt_null cache up to date after add_doc / remove_doc (in place).
+    
+    A token is recomputed only if it was touched, a changed df landed in its
+    span, or its null's distances changed; everything else provably keeps
+    its value. Suppression changes fall back to a full recompute.
+    
+    Returns:
+        The set of recomputed tokens.
+    """
+    index = matched_null_index(stats, overlay)
+    if cache.n_suppressed != len(overlay.suppressed):
+        affected = set(cache.nulls) | set(stats.token_df)
+        cache.n_suppressed = len(overlay.suppressed)
+    else:
+        moved = sorted({df for pair in delta.df_changes.values() for df in pair if df > 0})
+        affected = set(delta.touched)
+        for token_hash, (lo, hi) in cache.spans.items():
+            if token_hash in affected:
+                continue
+            i = bisect_left(moved, lo)
+            if (i < len(moved) and moved[i] <= hi) or cache.nulls[token_hash] in delta.dt_targets:
+                affected.add(token_hash)
+    
+    for token_hash in affected:
+        cache.pop(token_hash, None)
+        cache.nulls.pop(token_hash, None)
+        cache.spans.pop(token_hash, None)
+        if token_hash in stats.token_df:
+            _fill_dt_null(cache, token_hash, index, stats.token_df)
+    return affected
+
+
 def find_matched_null(
     target_hash: str,
     stats: WindowStats,
@@ -300,49 +1251,14 @@ def find_matched_null(
     subject to: no σ-edge with any source, not suppressed
     
     Deterministic: tie-break by min(hash8).
+    Served from the cached MatchedNullIndex (see matched_null_index).
     """
-    if target_hash not in stats.token_df:
-        return None
-    
-    target_df = stats.token_df[target_hash]
-    log_target_df = math.log(target_df + 1)
-    
-    # Get all tokens connected to target (to exclude)
-    connected: Set[str] = set()
-    for src, edges in overlay.edges.items():
-        for edge in edges:
-            if edge.tgt == target_hash and edge.is_provable():
-                connected.add(src)
-    for edge in overlay.edges.get(target_hash, []):
-        if edge.is_provable():
-            connected.add(edge.tgt)
-    
-    # Find best match
-    best_hash: Optional[str] = None
-    best_diff = float('inf')
-    
-    for h, df in stats.token_df.items():
-        if h == target_hash or h in connected:
-            continue
-        
-        # Check not suppressed (either direction)
-        if (target_hash, h) in overlay.suppressed or (h, target_hash) in overlay.suppressed:
-            continue
-        
-        log_df = math.log(df + 1)
-        diff = abs(log_df - log_target_df)
-        
-        if diff < best_diff or (diff == best_diff and (best_hash is None or h < best_hash)):
-            best_diff = diff
-            best_hash = h
-    
-    return best_hash
+    return matched_null_index(stats, overlay).find(target_hash)
 
 
 def get_cooccur_weight(a: str, b: str, stats: WindowStats) -> int:
     """Get co-occurrence weight W(A ∧ B)."""
-    pair = tuple(sorted([a, b]))
-    return stats.cooccur.get(pair, 0)
+    return stats.matrix.weight(a, b)
 
 
 # =============================================================================
@@ -406,10 +1322,7 @@ def infer_SEQ(
     
     # Compute dt_null from distances if available
     if edge.tgt in stats.dt_distances:
-        distances = []
-        for src_tgt, dist_list in stats.dt_distances.items():
-            if src_tgt[1] == null_hash:
-                distances.extend(dist_list)
+        distances = matched_null_index(stats, overlay).null_distances(null_hash)
         if distances:
             distances.sort()
             dt_null = distances[len(distances) // 2]
@@ -464,6 +1377,19 @@ def infer_INHIB(
         return InferResult.FALSE
 
 
+def _gate_from_counts(w_abc: int, w_ab: int, w_c: int, n_windows: int) -> InferResult:
+    """ΔW(C) = W(A∧B∧C) - W(A∧B) × W(C) / |W|; gate active iff ΔW ≥ W_unit (1)."""
+    # Expected co-occurrence without gate effect
+    expected = w_ab * w_c / n_windows if n_windows > 0 else 0
+    
+    # Gate active if context increases co-occurrence by at least W_unit=1
+    delta_w = w_abc - expected
+    if delta_w >= 1.0:
+        return InferResult.TRUE
+    else:
+        return InferResult.FALSE
+
+
 def infer_GATE(
     src: str,
     tgt: str,
@@ -497,27 +1423,58 @@ def infer_GATE(
     if ctx_df > gas_threshold:
         return InferResult.UNKNOWN  # Gas context cannot prove GATE
     
-    # Count windows with all three
-    w_abc = 0
-    for window in stats.windows:
-        if src in window and tgt in window and context in window:
-            w_abc += 1
+    # W(A∧B∧C): posting intersection
+    w_abc = stats.matrix.count_windows_with(src, tgt, context)
     
-    # W(A∧B)
+    # W(A∧B), W(C)
     w_ab = get_cooccur_weight(src, tgt, stats)
-    
-    # W(C)
     w_c = stats.token_df.get(context, 0)
     
-    # Expected co-occurrence without gate effect
-    expected = w_ab * w_c / stats.n_windows if stats.n_windows > 0 else 0
+    return _gate_from_counts(w_abc, w_ab, w_c, stats.n_windows)
+
+
+def infer_GATE_many(
+    src: str,
+    tgt: str,
+    contexts: Sequence[str],
+    stats: WindowStats,
+) -> Dict[str, InferResult]:
+    """
+    Batch gate operator: infer_GATE(src, tgt, C) for many candidate contexts.
     
-    # Gate active if context increases co-occurrence by at least W_unit=1
-    delta_w = w_abc - expected
-    if delta_w >= 1.0:
-        return InferResult.TRUE
-    else:
-        return InferResult.FALSE
+    Windows(A∧B) are intersected once; one pass over their CSR rows then
+    yields W(A∧B∧C) for every context at the same time, so the cost is
+    O(|A∧B| · window size) instead of O(|W| · |contexts|).
+    
+    Returns:
+        {context: InferResult} in input order (same values as infer_GATE).
+    """
+    if stats.n_windows == 0:
+        return {c: InferResult.UNKNOWN for c in contexts}
+    
+    matrix = stats.matrix
+    gas_threshold = int(stats.n_windows * GAS_DF_THRESHOLD)
+    wanted: Dict[int, str] = {}
+    for c in contexts:
+        if c in stats.token_df and stats.token_df[c] <= gas_threshold:
+            wanted[matrix.ids[c]] = c
+    
+    w_abc: Dict[str, int] = {c: 0 for c in wanted.values()}
+    ab_windows = matrix.windows_with(src, tgt) if wanted else []
+    for w in ab_windows:
+        for t in matrix.row(w):
+            c = wanted.get(t)
+            if c is not None:
+                w_abc[c] += 1
+    
+    w_ab = len(ab_windows) if src != tgt else 0
+    out: Dict[str, InferResult] = {}
+    for c in contexts:
+        if c not in w_abc:
+            out[c] = InferResult.UNKNOWN
+        else:
+            out[c] = _gate_from_counts(w_abc[c], w_ab, stats.token_df[c], stats.n_windows)
+    return out
 
 
 # =============================================================================
@@ -552,33 +1509,15 @@ def verify_path(
     if src == tgt:
         return (VerifyResult.PROVEN, [])
     
-    # BFS with budget
-    visited: Set[str] = {src}
-    queue: List[Tuple[str, List[OverlayEdge]]] = [(src, [])]
-    edges_examined = 0
-    
-    while queue and edges_examined < max_edges:
-        current, path = queue.pop(0)
-        
-        if len(path) >= max_hops:
-            continue
-        
-        for edge in overlay.edges.get(current, []):
-            edges_examined += 1
-            
-            # Only provable edges (anchor + live state valid)
-            if not edge.is_provable():
-                continue
-            
-            if edge.tgt == tgt:
-                return (VerifyResult.PROVEN, path + [edge])
-            
-            if edge.tgt not in visited:
-                visited.add(edge.tgt)
-                queue.append((edge.tgt, path + [edge]))
-            
-            if edges_examined >= max_edges:
-                break
+    # Bidirectional BFS over provable edges (anchor + live state valid)
+    search = find_path(
+        overlay, src, tgt,
+        accept=OverlayEdge.is_provable,
+        max_hops=max_hops,
+        max_edges=max_edges,
+    )
+    if search.found:
+        return (VerifyResult.PROVEN, search.path)
     
     # Budget exhausted or no path found
     # Return UNKNOWN because we can't prove non-existence without full enumeration
@@ -592,10 +1531,13 @@ def verify_path(
 def relocate_and_verify(
     edge: OverlayEdge,
     base_path: Optional[Path] = None,
+    overlay: Optional[OverlayGraph] = None,
 ) -> Tuple[Optional[str], int]:
     """
     Relocate edge and update anchor_state (MYCELIUM v2.3 §2.2).
     
+    Pass the owning `overlay` to have it touched when the edge changes.
+    
     Returns:
         (content, new_anchor_state)
     """
@@ -610,8 +1552,47 @@ def relocate_and_verify(
     )
     
     # Update edge if relocated (caller should persist if needed)
+    changed = edge.anchor_state != anchor_state
     if anchor_state == OverlayEdge.RELOCATED and new_line != edge.line:
         edge.line = new_line
+        changed = True
     
     edge.anchor_state = anchor_state
+    if changed and overlay is not None:
+        overlay.touch()
     return (content, anchor_state)
+
+
+def relocate_and_verify_many(
+    edges: Sequence[OverlayEdge],
+    base_path: Optional[Path] = None,
+    overlay: Optional[OverlayGraph] = None,
+) -> List[Tuple[Optional[str], int]]:
+    """
+    Batch relocate_and_verify: edges are grouped by document so each document
+    is read once (see reread_context_windows). `overlay`, if given, is
+    touched once when any edge changed.
+
+    Returns one (content, new_anchor_state) per edge, in input order.
+    """
+    out: List[Tuple[Optional[str], int]] = [(None, OverlayEdge.DECOHERENT)] * len(edges)
+    by_doc: Dict[str, List[int]] = {}
+    for i, edge in enumerate(edges):
+        if not edge.doc or not edge.line or not edge.ctx_hash:
+            continue
+        by_doc.setdefault(edge.doc, []).append(i)
+
+    changed = False
+    for doc, idxs in by_doc.items():
+        anchors = [(edges[i].line, edges[i].ctx_hash) for i in idxs]
+        for i, (content, new_line, anchor_state) in zip(idxs, reread_context_windows(doc, anchors, base_path)):
+            edge = edges[i]
+            if anchor_state == OverlayEdge.RELOCATED and new_line != edge.line:
+                edge.line = new_line
+                changed = True
+            changed = changed or edge.anchor_state != anchor_state
+            edge.anchor_state = anchor_state
+            out[i] = (content, anchor_state)
+    if changed and overlay is not None:
+        overlay.touch()
+    return out
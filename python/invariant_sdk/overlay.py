@@ -19,15 +19,24 @@ File Format (.overlay.jsonl):
 from __future__ import annotations
 
 import json
+import os
+from bisect import bisect_left, insort
 from collections import defaultdict
 from dataclasses import dataclass, field
+from itertools import count
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple, Iterator
 
+from .pathsearch import find_path
+
 
 # Ring priority (higher number = higher priority)
 RING_PRIORITY = {"eta": 0, "lambda": 1, "sigma": 2, "alpha": 3}
 
+# Overlay versions are drawn from one process-wide sequence, so a version
+# never repeats across graphs (unlike id(), which is reused after GC).
+_VERSIONS = count(1)
+
 
 @dataclass
 class OverlayEdge:
@@ -160,9 +169,45 @@ class OverlayGraph:
     # Private cache for provenance_map (cleared on mutations)
     _provenance_cache: Optional[Dict[str, str]] = field(default=None, repr=False)
     
+    # Normalized label -> [(rank, hash8), ...] sorted by first definition (see lookup_label)
+    _label_index: Dict[str, List[Tuple[int, str]]] = field(default_factory=dict, repr=False)
+    _label_rank: Dict[str, int] = field(default_factory=dict, repr=False)
+    
     # Format version for compatibility (v2.3 = witness field added)
     format_version: str = field(default="2.3")
     
+    # Mutation counter for derived caches (see touch); unique across graphs
+    version: int = field(default=0, repr=False, compare=False)
+    
+    # Random token written by the last save()/read by load(); valid while
+    # `version` is unchanged since then (see persisted_token)
+    save_token: Optional[str] = field(default=None, repr=False, compare=False)
+    _saved_version: int = field(default=-1, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        self.version = next(_VERSIONS)
+        if self.labels and not self._label_index:
+            self._rebuild_label_index()
+    
+    def persisted_token(self) -> Optional[str]:
+        """
+        Token of the saved file this graph still equals, or None.
+        
+        O(1) stamp for sidecar files derived from the overlay (window stats):
+        any mutation since load()/save() invalidates it.
+        """
+        return self.save_token if self._saved_version == self.version else None
+    
+    def touch(self) -> None:
+        """
+        Mark the graph mutated: derived caches keyed on `version` rebuild.
+        
+        add_edge / suppress_edge / define_label / delete_doc / merge call
+        this themselves; call it after editing edges in place (anchor_state,
+        live_state, line).
+        """
+        self.version = next(_VERSIONS)
+    
     @property
     def provenance_map(self) -> Dict[str, str]:
         """
@@ -207,6 +252,7 @@ class OverlayGraph:
                 graph.edges = defaultdict(list, loaded_edges)
                 graph.suppressed = data.get('suppressed', graph.suppressed)
                 graph.labels = data.get('labels', graph.labels)
+                graph._rebuild_label_index()
                 
                 # Rebuild reverse_edges for bidirectional lookup (backward compat)
                 loaded_reverse = data.get('reverse_edges', {})
@@ -230,6 +276,8 @@ class OverlayGraph:
                                 graph.doc_to_nodes[edge.doc].add(src)
                 
                 graph.sources.add(str(pkl_path))
+                graph.save_token = data.get('save_token')
+                graph._saved_version = graph.version
                 return graph
             except Exception:
                 pass  # Fall back to JSONL
@@ -238,6 +286,9 @@ class OverlayGraph:
         with open(path, 'r', encoding='utf-8') as f:
             for line in f:
                 line = line.strip()
+                if line.startswith('# save_token:'):
+                    graph.save_token = line.split(':', 1)[1].strip() or None
+                    continue
                 if not line or line.startswith('#'):
                     continue
                 
@@ -248,6 +299,7 @@ class OverlayGraph:
                     continue
         
         graph.sources.add(str(path))
+        graph._saved_version = graph.version
         return graph
     
     @classmethod
@@ -307,7 +359,7 @@ class OverlayGraph:
             node = entry.get("node", "")
             label = entry.get("label", "")
             if node and label:
-                self.labels[node] = label
+                self.define_label(node, label)
     
     def merge(self, other: "OverlayGraph") -> None:
         """Merge another overlay into this one (other takes priority)."""
@@ -323,11 +375,17 @@ class OverlayGraph:
                         if e.doc != new_edge.doc:  # Different source = conflict
                             self.conflicts.append((e, new_edge))
             self.edges[src].extend(edge_list)
+            for new_edge in edge_list:
+                self.reverse_edges[new_edge.tgt].append((src, new_edge))
+                if new_edge.doc:
+                    self.doc_to_nodes[new_edge.doc].add(src)
         
         self.suppressed.update(other.suppressed)
-        self.labels.update(other.labels)
+        for node, label in other.labels.items():
+            self.define_label(node, label)
         self.sources.update(other.sources)
         self.conflicts.extend(other.conflicts)
+        self.touch()
     
     def save(self, path: Path) -> None:
         """Save overlay to .jsonl file. Optimized with buffered writes."""
@@ -335,7 +393,8 @@ class OverlayGraph:
         path.parent.mkdir(parents=True, exist_ok=True)
         
         # Build all lines in memory first (faster than many small writes)
-        lines = []
+        token = os.urandom(8).hex()
+        lines = [f"# save_token: {token}"]
         
         # Edges
         for src, edge_list in self.edges.items():
@@ -386,7 +445,35 @@ class OverlayGraph:
                 'suppressed': self.suppressed,
                 'labels': self.labels,
                 'doc_to_nodes': dict(self.doc_to_nodes),  # O(1) doc deletion index
+                'save_token': token,
             }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.save_token = token
+        self._saved_version = self.version
+    
+    def copy(self) -> "OverlayGraph":
+        """
+        Independent copy for copy-on-write updates.
+    
+        Containers are copied, OverlayEdge objects are shared: add_edge,
+        define_label and delete_doc on the copy never touch the original.
+        """
+        dup = OverlayGraph(
+            edges=defaultdict(list, {src: list(es) for src, es in self.edges.items()}),
+            reverse_edges=defaultdict(list, {tgt: list(es) for tgt, es in self.reverse_edges.items()}),
+            suppressed=set(self.suppressed),
+            labels=dict(self.labels),
+            sources=set(self.sources),
+            conflicts=list(self.conflicts),
+            doc_to_nodes=defaultdict(set, {doc: set(ns) for doc, ns in self.doc_to_nodes.items()}),
+            _provenance_cache=self._provenance_cache,
+            _label_index={key: list(bucket) for key, bucket in self._label_index.items()},
+            _label_rank=dict(self._label_rank),
+            format_version=self.format_version,
+        )
+        # Same contents as this graph: still equal to its saved file, if any
+        dup.save_token = self.persisted_token()
+        dup._saved_version = dup.version
+        return dup
     
     def add_edge(
         self, 
@@ -434,14 +521,66 @@ class OverlayGraph:
             self.doc_to_nodes[doc].add(src)
             # Invalidate provenance_cache (V.3.2)
             self._provenance_cache = None
+        self.touch()
     
     def suppress_edge(self, src: str, tgt: str) -> None:
         """Suppress a global edge (hide from results)."""
         self.suppressed.add((src, tgt))
+        self.touch()
     
     def define_label(self, node: str, label: str) -> None:
         """Define custom label for a hash8."""
+        old = self.labels.get(node)
         self.labels[node] = label
+        self._index_label(node, old, label)
+        self.touch()
+    
+    @staticmethod
+    def _label_key(label: Optional[str]) -> str:
+        return str(label).strip().lower() if label else ""
+    
+    def _index_label(self, node: str, old: Optional[str], new: Optional[str]) -> None:
+        """Move node between label_index buckets (O(log k) per bucket)."""
+        rank = self._label_rank.setdefault(node, len(self._label_rank))
+        old_key, new_key = self._label_key(old), self._label_key(new)
+        if old is not None and old_key == new_key:
+            return
+        entry = (rank, node)
+        if old_key:
+            bucket = self._label_index.get(old_key, [])
+            i = bisect_left(bucket, entry)
+            if i < len(bucket) and bucket[i] == entry:
+                del bucket[i]
+            if not bucket:
+                self._label_index.pop(old_key, None)
+        if new_key:
+            insort(self._label_index.setdefault(new_key, []), entry)
+    
+    def _rebuild_label_index(self) -> None:
+        self._label_index = {}
+        self._label_rank = {}
+        for node, label in self.labels.items():
+            self._label_rank[node] = rank = len(self._label_rank)
+            key = self._label_key(label)
+            if key:
+                self._label_index.setdefault(key, []).append((rank, node))
+    
+    def lookup_label(self, label: str) -> Optional[str]:
+        """
+        hash8 whose label matches (case/whitespace-insensitive), or None.
+        
+        O(1) via the label index; ties resolve to the first-defined label.
+        """
+        bucket = self._label_index.get(self._label_key(label))
+        return bucket[0][1] if bucket else None
+    
+    def is_target(self, node: str) -> bool:
+        """True if any local edge points at node (O(1) via reverse_edges)."""
+        return bool(self.reverse_edges.get(node))
+    
+    def has_node(self, node: str) -> bool:
+        """True if node is the source or target of any local edge."""
+        return bool(self.edges.get(node)) or self.is_target(node)
     
     def delete_doc(self, doc: str) -> int:
         """Delete all edges belonging to a document.
@@ -459,18 +598,34 @@ class OverlayGraph:
             return 0
             
         deleted = 0
+        targets: Set[str] = set()
         nodes = list(self.doc_to_nodes[doc])
         for src in nodes:
             original_len = len(self.edges[src])
-            self.edges[src] = [e for e in self.edges[src] if e.doc != doc]
-            deleted += original_len - len(self.edges[src])
+            kept = []
+            for e in self.edges[src]:
+                if e.doc != doc:
+                    kept.append(e)
+                else:
+                    targets.add(e.tgt)
+            self.edges[src] = kept
+            deleted += original_len - len(kept)
             # Clean up empty source nodes
             if not self.edges[src]:
                 del self.edges[src]
         
+        # Keep the reverse index in step (bidirectional path search reads it)
+        for tgt in targets:
+            incoming = [(s, e) for s, e in self.reverse_edges.get(tgt, ()) if e.doc != doc]
+            if incoming:
+                self.reverse_edges[tgt] = incoming
+            else:
+                self.reverse_edges.pop(tgt, None)
+        
         del self.doc_to_nodes[doc]
         # Invalidate provenance_cache (V.3.2)
         self._provenance_cache = None
+        self.touch()
         return deleted
     
     def get_neighbors(self, node: str, ring_filter: Optional[str] = None, bidirectional: bool = True) -> List[Dict]:
@@ -546,25 +701,11 @@ class OverlayGraph:
             if edge.tgt == tgt and edge.ring == "sigma":
                 return (edge.has_provenance(), [edge])
         
-        # BFS for 2-hop path (A → B → C)
-        visited = {src}
-        queue = [(src, [])]
-        
-        while queue:
-            current, path = queue.pop(0)
-            
-            for edge in self.edges.get(current, []):
-                if edge.ring != "sigma":
-                    continue
-                    
-                if edge.tgt == tgt:
-                    full_path = path + [edge]
-                    has_provenance = any(e.has_provenance() for e in full_path)
-                    return (has_provenance, full_path)
-                
-                if edge.tgt not in visited and len(path) < 2:  # max 2 hops
-                    visited.add(edge.tgt)
-                    queue.append((edge.tgt, path + [edge]))
+        # Multi-hop σ-path (A → B → C → D: up to 2 intermediate nodes)
+        search = find_path(self, src, tgt, accept=lambda e: e.ring == "sigma", max_hops=3)
+        if search.found:
+            has_provenance = any(e.has_provenance() for e in search.path)
+            return (has_provenance, search.path)
         
         return (False, [])
     
@@ -583,24 +724,12 @@ class OverlayGraph:
             if edge.tgt == tgt:
                 return (True, [edge], edge.ring)
         
-        # BFS for multi-hop path
-        visited = {src}
-        queue = [(src, [])]
-        
-        while queue:
-            current, path = queue.pop(0)
-            
-            for edge in self.edges.get(current, []):
-                new_path = path + [edge]
-                
-                if edge.tgt == tgt:
-                    # Determine ring: sigma only if ALL edges are sigma
-                    ring = "sigma" if all(e.ring == "sigma" for e in new_path) else "lambda"
-                    return (True, new_path, ring)
-                
-                if edge.tgt not in visited and len(path) < max_hops:
-                    visited.add(edge.tgt)
-                    queue.append((edge.tgt, new_path))
+        # Multi-hop path: max_hops intermediate expansions → max_hops + 1 edges
+        search = find_path(self, src, tgt, max_hops=max_hops + 1)
+        if search.found:
+            # Determine ring: sigma only if ALL edges are sigma
+            ring = "sigma" if all(e.ring == "sigma" for e in search.path) else "lambda"
+            return (True, search.path, ring)
         
         return (False, [], "")
     
@@ -0,0 +1,201 @@
+"""
+pathsearch.py — Shared bounded path search over an OverlayGraph
+
+One engine behind operators.verify_path, OverlayGraph.has_path /
+has_sigma_path and HaloPhysics.verify:
+
+  - deque frontier + parent pointers: no per-node path copies, the path is
+    rebuilt once when the target is reached
+  - bidirectional meet-in-the-middle over `reverse_edges` when both ends are
+    known: the smaller frontier is expanded one whole layer at a time, so the
+    first meeting is a shortest path
+  - hop budget (edges in the returned path) and edge budget (edges examined)
+
+Invariant III (Energy Law): every search is bounded by both budgets.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .overlay import OverlayEdge, OverlayGraph
+
+EdgeFilter = Callable[["OverlayEdge"], bool]
+
+# node → (neighbour it was reached from, edge between them); None for the root
+_Parents = Dict[str, Optional[Tuple[str, "OverlayEdge"]]]
+
+
+@dataclass
+class PathSearchResult:
+    """Outcome of one bounded search."""
+    path: List["OverlayEdge"] = field(default_factory=list)  # src → tgt edges (empty if not found)
+    found: bool = False
+    edges_examined: int = 0
+    exhausted: bool = False  # edge budget ran out before the search space did
+
+
+def _accept_all(edge: "OverlayEdge") -> bool:
+    return True
+
+
+def _forward_chain(parents: _Parents, node: str) -> List["OverlayEdge"]:
+    chain: List["OverlayEdge"] = []
+    link = parents[node]
+    while link is not None:
+        node, edge = link
+        chain.append(edge)
+        link = parents[node]
+    chain.reverse()
+    return chain
+
+
+def _backward_chain(parents: _Parents, node: str) -> List["OverlayEdge"]:
+    chain: List["OverlayEdge"] = []
+    link = parents[node]
+    while link is not None:
+        node, edge = link
+        chain.append(edge)
+        link = parents[node]
+    return chain
+
+
+def find_path(
+    overlay: "OverlayGraph",
+    src: str,
+    tgt: str,
+    *,
+    accept: Optional[EdgeFilter] = None,
+    max_hops: int = 3,
+    max_edges: Optional[int] = None,
+    bidirectional: bool = True,
+) -> PathSearchResult:
+    """
+    Shortest accepted-edge path src → tgt within the hop and edge budgets.
+
+    Args:
+        accept: Edge filter (e.g. OverlayEdge.is_provable); all edges if None
+        max_hops: Maximum number of edges in the returned path
+        max_edges: Maximum edges examined (both directions); unbounded if None
+        bidirectional: Meet in the middle via the reverse index
+
+    src == tgt searches for a cycle (forward only); callers that treat it as
+    trivially reachable check that first.
+    """
+    accept = accept or _accept_all
+    budget = max_edges if max_edges is not None else float('inf')
+    if bidirectional and src != tgt and max_hops > 1:
+        return _bidirectional(overlay, src, tgt, accept, max_hops, budget)
+    return _forward(overlay, src, tgt, accept, max_hops, budget)
+
+
+def _forward(
+    overlay: "OverlayGraph",
+    src: str,
+    tgt: str,
+    accept: EdgeFilter,
+    max_hops: int,
+    budget: float,
+) -> PathSearchResult:
+    result = PathSearchResult()
+    parents: _Parents = {src: None}
+    queue = deque([(src, 0)])
+    edges = overlay.edges
+    examined = 0
+
+    while queue and examined < budget:
+        current, depth = queue.popleft()
+        if depth >= max_hops:
+            continue
+        for edge in edges.get(current, ()):
+            examined += 1
+            if accept(edge):
+                if edge.tgt == tgt:
+                    result.path = _forward_chain(parents, current) + [edge]
+                    result.found = True
+                    result.edges_examined = examined
+                    return result
+                if edge.tgt not in parents:
+                    parents[edge.tgt] = (current, edge)
+                    queue.append((edge.tgt, depth + 1))
+            if examined >= budget:
+                break
+
+    result.edges_examined = examined
+    result.exhausted = examined >= budget and bool(queue)
+    return result
+
+
+def _expand_layer(
+    frontier: List[str],
+    neighbours: Callable[[str], Iterable[Tuple[str, "OverlayEdge"]]],
+    accept: EdgeFilter,
+    own: _Parents,
+    other: _Parents,
+    state: List[float],
+) -> Tuple[List[str], Optional[Tuple[str, str, "OverlayEdge"]]]:
+    """Expand one layer; returns (next layer, meeting (from, to, edge) or None)."""
+    nxt: List[str] = []
+    examined, budget = state
+    for node in frontier:
+        for other_node, edge in neighbours(node):
+            examined += 1
+            if accept(edge) and other_node not in own:
+                own[other_node] = (node, edge)
+                if other_node in other:
+                    state[0] = examined
+                    return nxt, (node, other_node, edge)
+                nxt.append(other_node)
+            if examined >= budget:
+                state[0] = examined
+                return nxt, None
+    state[0] = examined
+    return nxt, None
+
+
+def _bidirectional(
+    overlay: "OverlayGraph",
+    src: str,
+    tgt: str,
+    accept: EdgeFilter,
+    max_hops: int,
+    budget: float,
+) -> PathSearchResult:
+    result = PathSearchResult()
+    edges = overlay.edges
+    reverse = overlay.reverse_edges
+
+    def out_edges(node: str) -> Iterable[Tuple[str, "OverlayEdge"]]:
+        return ((edge.tgt, edge) for edge in edges.get(node, ()))
+
+    def in_edges(node: str) -> Iterable[Tuple[str, "OverlayEdge"]]:
+        return reverse.get(node, ())
+
+    fwd: _Parents = {src: None}
+    bwd: _Parents = {tgt: None}
+    f_layer, b_layer = [src], [tgt]
+    hops = 0
+    state = [0, budget]  # [edges examined, budget]
+
+    while f_layer and b_layer and hops < max_hops and state[0] < budget:
+        if len(f_layer) <= len(b_layer):
+            f_layer, meet = _expand_layer(f_layer, out_edges, accept, fwd, bwd, state)
+            if meet is not None:
+                node, nxt, edge = meet
+                result.path = _forward_chain(fwd, node) + [edge] + _backward_chain(bwd, nxt)
+        else:
+            b_layer, meet = _expand_layer(b_layer, in_edges, accept, bwd, fwd, state)
+            if meet is not None:
+                node, prev, edge = meet
+                result.path = _forward_chain(fwd, prev) + [edge] + _backward_chain(bwd, node)
+        hops += 1
+        if meet is not None:
+            result.found = True
+            break
+
+    result.edges_examined = int(state[0])
+    result.exhausted = not result.found and state[0] >= budget
+    return result
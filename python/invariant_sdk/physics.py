@@ -777,11 +777,8 @@ class HaloPhysics:
         for candidate in [f"Ġ{object.lower()}", object.lower(), f"▁{object.lower()}"]:
             h8 = hash8_hex(candidate)
             # Check if this hash appears as target in any edge
-            for src, edges in self._overlay.edges.items():
-                if any(e.tgt == h8 for e in edges):
-                    object_hash = h8
-                    break
-            if object_hash:
+            if self._overlay.is_target(h8):
+                object_hash = h8
                 break
         
         if not object_hash:
@@ -14,15 +14,246 @@ Theory (RUNTIME_CONTRACT v1.9.5):
   
 Formula:
   Ψ² = Σα² + 2Σαᵢαⱼ (presence + interference)
+
+Implementation:
+  One kernel (compute_dyadic_profile) encodes events as a max-alpha matrix
+  and reduces adjacent windows scale by scale; the public compute_* functions
+  are views of its DyadicProfile.
 """
 
 from __future__ import annotations
 
 import math
 import warnings
+from dataclasses import dataclass
+from operator import mul
 from typing import Dict, List, Optional, Tuple, Set
 
 
+# =============================================================================
+# DYADIC KERNEL (matrix form, single sweep)
+# =============================================================================
+
+@dataclass(frozen=True)
+class DyadicProfile:
+    """
+    All dyadic aggregates of one σ-event stream, from one filtered pass.
+
+    energy:       Σₛ wₛ Σ_windows Ψ²                      (Full Hamiltonian)
+    presence:     Σₛ wₛ Σ_windows Σα²
+    interference: Σₛ wₛ Σ_windows (Ψ² − Σα²)              (unfiltered 2Σαᵢαⱼ)
+    coherence:    Σₛ wₛ Σ_windows binding-filtered 2αᵢαⱼ  (Invariants X + IV)
+    peak:         max_window Σα² + binding-filtered 2αᵢαⱼ (Invariant IX)
+    free_energy:  (1/β) log Σ_windows exp(β Ψ²)           (Invariant IX')
+    min_scale:    smallest scale with ≥2 anchors in a window
+    """
+    energy: float = 0.0
+    presence: float = 0.0
+    interference: float = 0.0
+    coherence: float = 0.0
+    peak: float = 0.0
+    free_energy: float = 0.0
+    min_scale: int = 8
+    n_events: int = 0
+
+
+def _event_matrix(
+    sigma_events: List[Dict[str, float]],
+    query_anchors: Set[str],
+) -> Tuple[List[str], List[List[float]]]:
+    """
+    Encode query-relevant σ-events as a dense (n_events × n_anchors) matrix.
+
+    Cell = MAX alpha of the anchor in that event (presence 0/1 semantics).
+    Events without any relevant anchor are dropped. Columns are anchors in
+    first-seen order.
+    """
+    columns: Dict[str, int] = {}
+    filtered: List[Dict[str, float]] = []
+    for event in sigma_events:
+        relevant = {h8: alpha for h8, alpha in event.items()
+                    if h8 in query_anchors and alpha > 0}
+        if relevant:
+            for h8 in relevant:
+                if h8 not in columns:
+                    columns[h8] = len(columns)
+            filtered.append(relevant)
+
+    width = len(columns)
+    rows: List[List[float]] = []
+    for event in filtered:
+        row = [0.0] * width
+        for h8, alpha in event.items():
+            col = columns[h8]
+            if alpha > row[col]:
+                row[col] = alpha
+        rows.append(row)
+    return list(columns), rows
+
+
+def _pair_sum(values: List[float], threshold: float) -> float:
+    """
+    Σ vᵢvⱼ over pairs i<j with vᵢvⱼ ≥ threshold (values sorted descending).
+
+    Two-pointer sweep: the admissible partners of vᵢ form a prefix of the
+    remaining values, and that prefix only shrinks as vᵢ decreases, so the
+    thresholded cross-term costs O(k) after sorting instead of O(k²).
+    """
+    n = len(values)
+    if n < 2:
+        return 0.0
+    prefix = [0.0]
+    for v in values:
+        prefix.append(prefix[-1] + v)
+    total = 0.0
+    end = n  # exclusive end of admissible partners
+    for i in range(n - 1):
+        vi = values[i]
+        while end > i + 1 and vi * values[end - 1] < threshold:
+            end -= 1
+        if end <= i + 1:
+            break
+        total += vi * (prefix[end] - prefix[i + 1])
+    return total
+
+
+def compute_dyadic_profile(
+    sigma_events: List[Dict[str, float]],
+    query_anchors: Set[str],
+    max_scale: int = 8,
+    query_amplitudes: Optional[Dict[str, float]] = None,
+    direct_anchors: Optional[Set[str]] = None,
+    beta: Optional[float] = None,
+    binding: bool = True,
+) -> DyadicProfile:
+    """
+    Single-sweep dyadic kernel behind every σ-energy function in this module.
+
+    Events are filtered once into a max-alpha matrix. Window maxima for scale
+    s+1 are the element-wise max of adjacent scale-s windows (clean dyadic
+    tiling, partial tail windows included), so every scale is one reduction
+    of the previous one. Per window: Ψ = Σ row, Σα² = Σ row², and the
+    binding-filtered cross-term comes from `_pair_sum` plus the
+    Direct-to-Direct pairs that Intent-Sovereignty lets bypass ε(q).
+
+    Args:
+        query_amplitudes: Query-level binding (v1.9.4); falls back to doc alphas.
+        direct_anchors: Direct query terms (v1.9.5, Invariant IV).
+        beta: If set (> 0), also compute free energy (Invariant IX').
+        binding: If False, skip binding-filtered terms (coherence/peak stay 0).
+    """
+    columns, rows = _event_matrix(sigma_events or [], query_anchors)
+    n_events = len(rows)
+    if not n_events:
+        return DyadicProfile(min_scale=max_scale)
+
+    threshold = 0.0
+    direct_cols: List[int] = []
+    if binding:
+        # v1.9.4: Query-level binding threshold (constant per query)
+        if query_amplitudes:
+            threshold = binding_threshold(query_amplitudes)
+        else:
+            # Fallback: compute from all anchors in doc (column maxima)
+            col_max = list(map(max, *rows)) if n_events > 1 else list(rows[0])
+            threshold = binding_threshold(dict(zip(columns, col_max)))
+        if direct_anchors:
+            direct_cols = [c for c, h8 in enumerate(columns) if h8 in direct_anchors]
+
+    total_energy = 0.0
+    total_presence = 0.0
+    total_interference = 0.0
+    total_coherence = 0.0
+    max_energy = 0.0
+    min_resonance_scale = max_scale
+    window_energies: List[float] = []
+    want_free = beta is not None and beta > 0
+
+    level = rows
+    for s in range(max_scale):
+        window_size = 2 ** s
+        if window_size > n_events:
+            break
+        if s:
+            # Dyadic reduction: window t at scale s = max(windows 2t, 2t+1 at s-1)
+            level = [
+                list(map(max, level[i], level[i + 1])) if i + 1 < len(level) else level[i]
+                for i in range(0, len(level), 2)
+            ]
+
+        weight_s = 1.0 / (2 ** s)
+        scale_energy = 0.0
+        scale_presence = 0.0
+        scale_interference = 0.0
+        scale_coherence = 0.0
+
+        for row in level:
+            psi = sum(row)
+            sum_sq = sum(map(mul, row, row))
+            psi_sq = psi ** 2
+            interference = max(0.0, psi_sq - sum_sq)
+            n_present = len(row) - row.count(0.0)
+
+            scale_energy += psi_sq
+            scale_presence += sum_sq
+            scale_interference += interference
+            if want_free:
+                window_energies.append(psi_sq)
+
+            # Track minimum scale with resonance (≥2 different anchors)
+            if n_present >= 2 and s < min_resonance_scale:
+                min_resonance_scale = s
+
+            if not binding:
+                continue
+
+            # v1.9.5: Binding-protected energy with Intent-Sovereignty
+            # E = Σα² + Σ(filtered 2αᵢαⱼ), Direct pairs ALWAYS pass
+            if n_present < 2:
+                filtered_cross = 0.0
+            elif threshold <= 0.0:
+                filtered_cross = interference  # every pair passes ε(q)
+            else:
+                values = sorted((v for v in row if v), reverse=True)
+                cross = _pair_sum(values, threshold)
+                if len(direct_cols) >= 2:
+                    direct = sorted((row[c] for c in direct_cols if row[c]), reverse=True)
+                    if len(direct) >= 2:
+                        cross += _pair_sum(direct, float("-inf")) - _pair_sum(direct, threshold)
+                filtered_cross = 2 * cross
+
+            scale_coherence += filtered_cross
+            window_energy = sum_sq + filtered_cross
+            if window_energy > max_energy:
+                max_energy = window_energy
+
+        total_energy += weight_s * scale_energy
+        total_presence += weight_s * scale_presence
+        total_interference += weight_s * scale_interference
+        total_coherence += weight_s * scale_coherence
+
+    free_energy = 0.0
+    if want_free and window_energies:
+        # Log-sum-exp trick for numerical stability
+        # F = (1/β) * log Σ exp(β*E) = max_E + (1/β) * log Σ exp(β*(E - max_E))
+        max_e = max(window_energies)
+        if max_e > 0:
+            log_sum = beta * max_e + math.log(sum(math.exp(beta * (e - max_e)) for e in window_energies))
+            free_energy = log_sum / beta
+
+    return DyadicProfile(
+        energy=total_energy,
+        presence=total_presence,
+        interference=total_interference,
+        # Interaction needs ≥2 σ-events (v1.9.3 contract)
+        coherence=total_coherence if n_events >= 2 else 0.0,
+        peak=max_energy,
+        free_energy=free_energy,
+        min_scale=min_resonance_scale,
+        n_events=n_events,
+    )
+
+
 # =============================================================================
 # σ-EVENT BASED ENERGY (Theory-Correct v1.9.5)
 # =============================================================================
@@ -48,60 +279,7 @@ def compute_sigma_energy(
         Partial windows at the end ARE included with same weight.
         No event is "lost" due to not fitting a complete tile.
     """
-    if not sigma_events:
-        return 0.0
-    
-    # Filter events to only include query-relevant anchors
-    filtered_events: List[Dict[str, float]] = []
-    for event in sigma_events:
-        relevant = {h8: alpha for h8, alpha in event.items() 
-                   if h8 in query_anchors and alpha > 0}
-        if relevant:
-            filtered_events.append(relevant)
-    
-    if not filtered_events:
-        return 0.0
-    
-    n_events = len(filtered_events)
-    total_energy = 0.0
-    
-    for s in range(max_scale):
-        window_size = 2 ** s
-        if window_size > n_events:
-            break
-        
-        # Derived weight: smaller scales contribute more (local structure)
-        weight_s = 1.0 / (2 ** s)
-        scale_energy = 0.0
-        
-        # CLEAN DYADIC TILING: step = window_size
-        step = window_size
-        
-        for start in range(0, n_events, step):
-            end = min(start + window_size, n_events)
-            # v1.7.2: Include partial windows (no boundary loss)
-            # Even incomplete windows contribute energy
-            if end <= start:
-                continue
-            
-            window_events = filtered_events[start:end]
-            
-            # Collect unique anchors with max alpha (presence 0/1 semantics)
-            window_anchors: Dict[str, float] = {}
-            for event in window_events:
-                for h8, alpha in event.items():
-                    window_anchors[h8] = max(window_anchors.get(h8, 0), alpha)
-            
-            # Ψ = sum of amplitudes (each anchor counted ONCE per window)
-            psi = sum(window_anchors.values())
-            
-            # E = Ψ² (Full Hamiltonian)
-            window_energy = psi ** 2
-            scale_energy += window_energy
-        
-        total_energy += weight_s * scale_energy
-    
-    return total_energy
+    return compute_dyadic_profile(sigma_events, query_anchors, max_scale, binding=False).energy
 
 
 def compute_sigma_coherence(
@@ -128,83 +306,11 @@ def compute_sigma_coherence(
     Returns:
         Coherence energy (0 if no interaction, positive if anchors co-occur)
     """
-    if not sigma_events:
-        return 0.0
-    
-    filtered_events: List[Dict[str, float]] = []
-    for event in sigma_events:
-        relevant = {h8: alpha for h8, alpha in event.items() 
-                   if h8 in query_anchors and alpha > 0}
-        if relevant:
-            filtered_events.append(relevant)
-    
-    if len(filtered_events) < 2:
-        return 0.0
-    
-    n_events = len(filtered_events)
-    total_coherence = 0.0
-    
-    # v1.9.4: Query-level binding (invariant X)
-    # Threshold from QUERY amplitudes (constant per query), not from doc
-    if query_amplitudes:
-        threshold = binding_threshold(query_amplitudes)
-    else:
-        # Fallback: compute from what's in document (legacy behavior)
-        all_query_alphas = {}
-        for event in filtered_events:
-            for h8, alpha in event.items():
-                all_query_alphas[h8] = max(all_query_alphas.get(h8, 0), alpha)
-        threshold = binding_threshold(all_query_alphas)
-    
-    for s in range(max_scale):
-        window_size = 2 ** s
-        if window_size > n_events:
-            break
-        
-        weight_s = 1.0 / (2 ** s)
-        scale_coherence = 0.0
-        step = window_size
-        
-        for start in range(0, n_events, step):
-            end = min(start + window_size, n_events)
-            if end <= start:
-                continue
-            
-            window_events = filtered_events[start:end]
-            
-            window_anchors: Dict[str, float] = {}
-            for event in window_events:
-                for h8, alpha in event.items():
-                    window_anchors[h8] = max(window_anchors.get(h8, 0), alpha)
-            
-            # Need at least 2 different anchors for interaction
-            if len(window_anchors) < 2:
-                continue
-            
-            # v1.9.5: Intent-Sovereignty LAW (Invariant IV)
-            # Direct-to-Direct pairs ALWAYS pass (Will > Observation)
-            # Expansion pairs require pair_product >= threshold
-            anchors_list = list(window_anchors.items())
-            window_coherence = 0.0
-            for i, (h8_i, alpha_i) in enumerate(anchors_list):
-                for h8_j, alpha_j in anchors_list[i+1:]:
-                    pair_product = alpha_i * alpha_j
-                    
-                    # Intent-Sovereignty: direct pairs bypass threshold
-                    is_direct_pair = (
-                        direct_anchors is not None
-                        and h8_i in direct_anchors
-                        and h8_j in direct_anchors
-                    )
-                    
-                    if is_direct_pair or pair_product >= threshold:
-                        window_coherence += 2 * pair_product  # 2αᵢαⱼ
-            
-            scale_coherence += window_coherence
-        
-        total_coherence += weight_s * scale_coherence
-    
-    return total_coherence
+    return compute_dyadic_profile(
+        sigma_events, query_anchors, max_scale,
+        query_amplitudes=query_amplitudes,
+        direct_anchors=direct_anchors,
+    ).coherence
 
 
 def compute_ranking_tuple(
@@ -223,64 +329,35 @@ def compute_ranking_tuple(
     
     Ranking order: (-E desc, -I desc, min_scale asc)
     """
-    if not sigma_events:
-        return (0.0, 0.0, max_scale)
-    
-    # Filter to query-relevant anchors
-    filtered_events: List[Dict[str, float]] = []
-    for event in sigma_events:
-        relevant = {h8: alpha for h8, alpha in event.items() 
-                   if h8 in query_anchors and alpha > 0}
-        if relevant:
-            filtered_events.append(relevant)
-    
-    if not filtered_events:
-        return (0.0, 0.0, max_scale)
-    
-    n_events = len(filtered_events)
-    total_energy = 0.0
-    total_coherence = 0.0
-    min_resonance_scale = max_scale  # Smallest scale with ≥2 different anchors
-    
-    for s in range(max_scale):
-        window_size = 2 ** s
-        if window_size > n_events:
-            break
-        
-        weight_s = 1.0 / (2 ** s)
-        scale_energy = 0.0
-        scale_coherence = 0.0
-        step = window_size
-        
-        for start in range(0, n_events, step):
-            end = min(start + window_size, n_events)
-            if end <= start:
-                continue
-            
-            window_events = filtered_events[start:end]
-            
-            window_anchors: Dict[str, float] = {}
-            for event in window_events:
-                for h8, alpha in event.items():
-                    window_anchors[h8] = max(window_anchors.get(h8, 0), alpha)
-            
-            psi = sum(window_anchors.values())
-            sum_sq = sum(a ** 2 for a in window_anchors.values())
-            
-            window_energy = psi ** 2
-            window_coherence = max(0.0, psi ** 2 - sum_sq)
-            
-            scale_energy += window_energy
-            scale_coherence += window_coherence
-            
-            # Track minimum scale with resonance (≥2 different anchors)
-            if len(window_anchors) >= 2 and s < min_resonance_scale:
-                min_resonance_scale = s
-        
-        total_energy += weight_s * scale_energy
-        total_coherence += weight_s * scale_coherence
-    
-    return (total_energy, total_coherence, min_resonance_scale)
+    profile = compute_dyadic_profile(sigma_events, query_anchors, max_scale, binding=False)
+    return (profile.energy, profile.interference, profile.min_scale)
+
+
+def compute_scoring_tuple(
+    sigma_events: List[Dict[str, float]],
+    query_anchors: Set[str],
+    max_scale: int = 8,
+    query_amplitudes: Optional[Dict[str, float]] = None,
+    direct_anchors: Optional[Set[str]] = None,
+) -> Tuple[float, float, float, int]:
+    """
+    Fused scorer: (peak, E, I, min_scale) from one filtered pass and one tiling.
+
+    Equivalent to compute_peak_score(...) followed by compute_ranking_tuple(...)
+    on the same events, at the cost of a single dyadic sweep.
+
+    Returns:
+        peak: Binding-protected peak window energy (Invariant IX)
+        E: Full Hamiltonian energy
+        I: Pure interference (coherence)
+        min_scale: Smallest scale where ≥2 different anchors in a window
+    """
+    profile = compute_dyadic_profile(
+        sigma_events, query_anchors, max_scale,
+        query_amplitudes=query_amplitudes,
+        direct_anchors=direct_anchors,
+    )
+    return (profile.peak, profile.energy, profile.interference, profile.min_scale)
 
 
 # =============================================================================
@@ -308,81 +385,11 @@ def compute_peak_score(
     
     Score_max(d,q) = max_{window} E_filtered(window, q)
     """
-    if not sigma_events:
-        return 0.0
-    
-    filtered_events: List[Dict[str, float]] = []
-    for event in sigma_events:
-        relevant = {h8: alpha for h8, alpha in event.items() 
-                   if h8 in query_anchors and alpha > 0}
-        if relevant:
-            filtered_events.append(relevant)
-    
-    if not filtered_events:
-        return 0.0
-    
-    n_events = len(filtered_events)
-    max_energy = 0.0
-    
-    # v1.9.4: Query-level binding threshold
-    if query_amplitudes:
-        threshold = binding_threshold(query_amplitudes)
-    else:
-        # Fallback: compute from all anchors in doc
-        all_doc_alphas = {}
-        for event in filtered_events:
-            for h8, alpha in event.items():
-                all_doc_alphas[h8] = max(all_doc_alphas.get(h8, 0), alpha)
-        threshold = binding_threshold(all_doc_alphas)
-    
-    for s in range(max_scale):
-        window_size = 2 ** s
-        if window_size > n_events:
-            break
-        
-        step = window_size
-        
-        for start in range(0, n_events, step):
-            end = min(start + window_size, n_events)
-            if end <= start:
-                continue
-            
-            window_events = filtered_events[start:end]
-            
-            window_anchors: Dict[str, float] = {}
-            for event in window_events:
-                for h8, alpha in event.items():
-                    window_anchors[h8] = max(window_anchors.get(h8, 0), alpha)
-            
-            # v1.9.5: Binding-protected energy with Intent-Sovereignty
-            # E = Σα² + Σ(filtered 2αᵢαⱼ)
-            # Direct pairs ALWAYS pass (Will > Observation)
-            sum_sq = sum(a ** 2 for a in window_anchors.values())
-            
-            # Compute filtered cross-terms
-            filtered_cross = 0.0
-            anchors_list = list(window_anchors.items())
-            for i, (h8_i, alpha_i) in enumerate(anchors_list):
-                for h8_j, alpha_j in anchors_list[i+1:]:
-                    pair_product = alpha_i * alpha_j
-                    
-                    # Intent-Sovereignty: direct pairs bypass threshold
-                    is_direct_pair = (
-                        direct_anchors is not None
-                        and h8_i in direct_anchors
-                        and h8_j in direct_anchors
-                    )
-                    
-                    if is_direct_pair or pair_product >= threshold:
-                        filtered_cross += 2 * pair_product
-            
-            window_energy = sum_sq + filtered_cross
-            
-            # Track maximum
-            if window_energy > max_energy:
-                max_energy = window_energy
-    
-    return max_energy
+    return compute_dyadic_profile(
+        sigma_events, query_anchors, max_scale,
+        query_amplitudes=query_amplitudes,
+        direct_anchors=direct_anchors,
+    ).peak
 
 
 def compute_free_energy_score(
@@ -399,57 +406,11 @@ def compute_free_energy_score(
     β → ∞: Max mode (needle queries)
     β → 0: Sum mode (thematic queries)
     """
-    if not sigma_events or beta <= 0:
-        return 0.0
-    
-    filtered_events: List[Dict[str, float]] = []
-    for event in sigma_events:
-        relevant = {h8: alpha for h8, alpha in event.items() 
-                   if h8 in query_anchors and alpha > 0}
-        if relevant:
-            filtered_events.append(relevant)
-    
-    if not filtered_events:
-        return 0.0
-    
-    n_events = len(filtered_events)
-    window_energies: List[float] = []
-    
-    for s in range(max_scale):
-        window_size = 2 ** s
-        if window_size > n_events:
-            break
-        
-        step = window_size
-        
-        for start in range(0, n_events, step):
-            end = min(start + window_size, n_events)
-            if end <= start:
-                continue
-            
-            window_events = filtered_events[start:end]
-            
-            window_anchors: Dict[str, float] = {}
-            for event in window_events:
-                for h8, alpha in event.items():
-                    window_anchors[h8] = max(window_anchors.get(h8, 0), alpha)
-            
-            psi = sum(window_anchors.values())
-            window_energy = psi ** 2
-            window_energies.append(window_energy)
-    
-    if not window_energies:
+    if beta <= 0:
         return 0.0
-    
-    # Log-sum-exp trick for numerical stability
-    # F = (1/β) * log Σ exp(β*E) = max_E + (1/β) * log Σ exp(β*(E - max_E))
-    max_e = max(window_energies)
-    if max_e <= 0:
-        return 0.0
-    
-    # v1.9.4: Fixed formula - multiply max_e by beta before adding
-    log_sum = beta * max_e + math.log(sum(math.exp(beta * (e - max_e)) for e in window_energies))
-    return log_sum / beta
+    return compute_dyadic_profile(
+        sigma_events, query_anchors, max_scale, beta=beta, binding=False,
+    ).free_energy
 
 
 def beta_from_query(amplitudes: Dict[str, float]) -> float:
@@ -528,52 +489,9 @@ def compute_sigma_decomposition(
             "coherence_ratio": interference / total
         }
     """
-    if not sigma_events:
-        return {"total": 0.0, "presence": 0.0, "interference": 0.0, "coherence_ratio": 0.0}
-    
-    filtered_events: List[Dict[str, float]] = []
-    for event in sigma_events:
-        relevant = {h8: alpha for h8, alpha in event.items() 
-                   if h8 in query_anchors and alpha > 0}
-        if relevant:
-            filtered_events.append(relevant)
-    
-    if not filtered_events:
-        return {"total": 0.0, "presence": 0.0, "interference": 0.0, "coherence_ratio": 0.0}
-    
-    n_events = len(filtered_events)
-    total_presence = 0.0
-    total_interference = 0.0
-    
-    for s in range(max_scale):
-        window_size = 2 ** s
-        if window_size > n_events:
-            break
-        
-        weight_s = 1.0 / (2 ** s)
-        step = window_size
-        
-        for start in range(0, n_events, step):
-            end = min(start + window_size, n_events)
-            if end <= start:
-                continue
-            
-            window_events = filtered_events[start:end]
-            
-            window_anchors: Dict[str, float] = {}
-            for event in window_events:
-                for h8, alpha in event.items():
-                    window_anchors[h8] = max(window_anchors.get(h8, 0), alpha)
-            
-            psi = sum(window_anchors.values())
-            sum_sq = sum(a ** 2 for a in window_anchors.values())
-            
-            presence = sum_sq
-            interference = max(0.0, psi ** 2 - sum_sq)
-            
-            total_presence += weight_s * presence
-            total_interference += weight_s * interference
-    
+    profile = compute_dyadic_profile(sigma_events, query_anchors, max_scale, binding=False)
+    total_presence = profile.presence
+    total_interference = profile.interference
     total = total_presence + total_interference
     
     return {
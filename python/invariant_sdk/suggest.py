@@ -0,0 +1,185 @@
+"""
+suggest.py — Prefix index for autocomplete (frequency-weighted top-k)
+
+Keys are kept in one sorted array, so every key with a given prefix is a
+contiguous range found with two bisects. A segment tree over weight ranks
+answers "heaviest entry in a range" in O(log N), and top-k peels off the
+heaviest entry and splits the range around it: O(k log N) per keystroke,
+however many labels share the prefix.
+
+Two sources feed it:
+  - overlay labels (σ), weighted by how many σ-edges touch the node
+  - crystal vocabulary (α) of a local BinaryCrystal, weighted by degree
+
+Invariant III (Energy Law): the index is a pure accelerator, rebuilt when
+its source changes; it never changes which labels exist.
+"""
+
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .overlay import OverlayEdge, OverlayGraph
+
+# Suggestions returned per query
+SUGGEST_LIMIT = 10
+
+# Upper bound for "every key starting with prefix"
+_KEY_END = "\U0010ffff"
+
+
+class PrefixIndex:
+    """
+    Sorted keys + range-min tree over weight ranks.
+
+    Entries are (key, word, payload, weight); key is the lowercased surface
+    form. Duplicate keys merge: the first word/payload is kept (first-seen
+    tie-break, as in OverlayIndex.label_to_hash) and weights add up.
+    Equal weights rank alphabetically.
+    """
+
+    __slots__ = ("keys", "words", "payloads", "weights", "_order", "_tree", "_size")
+
+    def __init__(self, entries: Iterable[Tuple[str, str, Any, float]] = ()):
+        # Stable sort: the first-seen entry of a duplicate key comes first
+        rows = sorted((e for e in entries if e[0]), key=itemgetter(0))
+        if rows:
+            keys, words, payloads, weights = (list(col) for col in zip(*rows))
+        else:
+            keys, words, payloads, weights = [], [], [], []
+        if len(set(keys)) != len(keys):
+            keys, words, payloads, weights = self._merge(keys, words, payloads, weights)
+        self.keys: List[str] = keys
+        self.words: List[str] = words
+        self.payloads: List[Any] = payloads
+        self.weights: List[float] = weights
+
+        # rank 0 = heaviest; a stable sort keeps equal weights alphabetical
+        n = len(self.keys)
+        self._order = sorted(range(n), key=self.weights.__getitem__, reverse=True)
+        rank = [0] * n
+        for r, i in enumerate(self._order):
+            rank[i] = r
+        size = 1
+        while size < n:
+            size <<= 1
+        tree = [n] * size + rank + [n] * (size - n)  # padding ranks below every entry
+        width = size
+        while width > 1:
+            half = width >> 1
+            tree[half:width] = map(min, tree[width:2 * width:2], tree[width + 1:2 * width:2])
+            width = half
+        self._tree = tree
+        self._size = size
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @staticmethod
+    def _merge(keys, words, payloads, weights):
+        out: Tuple[List[Any], ...] = ([], [], [], [])
+        last = None
+        for key, word, payload, weight in zip(keys, words, payloads, weights):
+            if key == last:
+                out[3][-1] += weight
+                continue
+            last = key
+            out[0].append(key)
+            out[1].append(word)
+            out[2].append(payload)
+            out[3].append(weight)
+        return out
+
+    def _min_rank(self, lo: int, hi: int) -> int:
+        """Best (lowest) rank in [lo, hi)."""
+        tree = self._tree
+        best = len(self.keys)
+        lo += self._size
+        hi += self._size
+        while lo < hi:
+            if lo & 1:
+                if tree[lo] < best:
+                    best = tree[lo]
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                if tree[hi] < best:
+                    best = tree[hi]
+            lo >>= 1
+            hi >>= 1
+        return best
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """[lo, hi) of keys starting with `prefix`."""
+        keys = self.keys
+        return bisect_left(keys, prefix), bisect_left(keys, prefix + _KEY_END)
+
+    def top(self, prefix: str, k: int = SUGGEST_LIMIT) -> List[Tuple[str, Any, float]]:
+        """(word, payload, weight) of the k heaviest keys starting with `prefix`."""
+        lo, hi = self.prefix_range(prefix.lower())
+        out: List[Tuple[str, Any, float]] = []
+        if lo >= hi or k <= 0:
+            return out
+        order = self._order
+        heap = [(self._min_rank(lo, hi), lo, hi)]
+        while heap and len(out) < k:
+            r, a, b = heapq.heappop(heap)
+            i = order[r]
+            out.append((self.words[i], self.payloads[i], self.weights[i]))
+            if a < i:
+                heapq.heappush(heap, (self._min_rank(a, i), a, i))
+            if i + 1 < b:
+                heapq.heappush(heap, (self._min_rank(i + 1, b), i + 1, b))
+        return out
+
+
+def build_label_prefix_index(
+    overlay: "OverlayGraph",
+    incoming: Optional[Dict[str, List[Tuple[str, "OverlayEdge"]]]] = None,
+) -> PrefixIndex:
+    """Overlay labels → hash8, weighted by σ-edges touching the node."""
+    edges = overlay.edges
+    if incoming is None:
+        incoming = overlay.reverse_edges
+    entries = []
+    for h8, label in (overlay.labels or {}).items():
+        if not label:
+            continue
+        weight = len(edges.get(h8, ())) + len(incoming.get(h8, ()))
+        entries.append((str(label).strip().lower(), label, h8, weight))
+    return PrefixIndex(entries)
+
+
+def build_vocab_prefix_index(crystal: Any) -> PrefixIndex:
+    """
+    Word-initial crystal tokens ("Ġword") → raw token, weighted by degree.
+
+    Works with BinaryCrystal in both label modes (vocab index or parsed
+    labels); degree comes from the CSR offsets when they are loaded.
+    """
+    from .crystal import decode_bpe_token
+
+    offsets = getattr(crystal, "offsets", None)
+    degrees = None
+    if offsets is not None:
+        bounds = [int(x) for x in offsets]
+        degrees = [b - a for a, b in zip(bounds, bounds[1:])]
+    tokens = crystal.idx_to_token
+    entries = []
+    for idx in range(crystal.n_labels):
+        token = tokens.get(idx)
+        if not token:
+            continue
+        decoded = decode_bpe_token(token)
+        if not decoded.startswith(" "):
+            continue  # sub-word piece, not a word start
+        word = decoded.strip()
+        if len(word) < 2:
+            continue
+        weight = degrees[idx] if degrees is not None and idx < len(degrees) else 0
+        entries.append((word.lower(), word, token, weight))
+    return PrefixIndex(entries)
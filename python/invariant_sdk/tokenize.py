@@ -6,6 +6,10 @@ This module intentionally implements a small, deterministic tokenizer for:
   - document ingestion (ingest)
   - provenance hashing windows (ctx_hash)
 
+Hot path: surface patterns are compiled once, and normalization is memoized
+per raw surface token (normalize_token), so a corpus pays _normalize once per
+distinct spelling; every token returned is an interned str.
+
 Important: do NOT use `\\b...\\b` word-boundaries for code identifiers.
 Regex `\\b` treats `_` as a word-char, so snake_case like `separability_matrix`
 would produce zero matches with patterns like `\\b[a-zA-Z]{3,}\\b`.
@@ -13,8 +17,10 @@ would produce zero matches with patterns like `\\b[a-zA-Z]{3,}\\b`.
 
 from __future__ import annotations
 
+import codecs
 import re
-from typing import Iterable, List, Literal, Tuple
+import sys
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Literal, Optional, Tuple
 
 # DEFINITION: Two tokenizer modes (measurement instrument choice)
 # This is NOT multiple "profiles" — it's two classes of measurement.
@@ -25,6 +31,20 @@ TokenizerMode = Literal["atomic", "identifier"]
 # v1.8: Also captures numeric IDs and dates.
 _TOKEN_RE = re.compile(r"[A-Za-z0-9_./\-]{2,}")
 
+# tokenize_simple surface patterns (DEFINITION, not POLICY):
+#   "identifier" preserves underscores (code); "atomic" splits on [_./-]
+#   (email, logs, prose), so get_data → [get, data]
+_IDENTIFIER_RE = re.compile(r"[A-Za-z0-9_]{2,}")
+_ATOMIC_RE = re.compile(r"[A-Za-z0-9]{2,}")
+
+# Bytes per read in the streaming line reader
+STREAM_CHUNK = 1 << 20
+
+# Memoized raw → normalized tokens (cleared when full: memory stays bounded)
+NORMALIZE_CACHE_SIZE = 1 << 17
+_NORM_CACHE: Dict[str, Optional[str]] = {}
+_MISS = object()
+
 # Date-like pattern: 2-3 groups of digits separated by / - or .
 _DATE_PATTERN = re.compile(r"^(\d{1,4})[\-/.](\d{1,2})[\-/.](\d{1,4})$")
 
@@ -162,6 +182,32 @@ def normalize_for_hash(text: str) -> str:
     return ' '.join(text.split())
 
 
+def normalize_token(raw: str) -> Optional[str]:
+    """_normalize(raw), memoized and interned (same result, any raw string)."""
+    token = _NORM_CACHE.get(raw, _MISS)
+    if token is _MISS:
+        token = _normalize(raw)
+        if token is not None:
+            token = sys.intern(token)
+        if len(_NORM_CACHE) >= NORMALIZE_CACHE_SIZE:
+            _NORM_CACHE.clear()
+        _NORM_CACHE[raw] = token
+    return token
+
+
+def _normalize_all(raws: List[str], out: List[str]) -> List[str]:
+    """Append the normalized form of every raw token that has one."""
+    get = _NORM_CACHE.get
+    append = out.append
+    for raw in raws:
+        token = get(raw, _MISS)
+        if token is _MISS:
+            token = normalize_token(raw)
+        if token:
+            append(token)
+    return out
+
+
 def tokenize_simple(text: str, mode: TokenizerMode = "atomic") -> List[str]:
     """
     Extract normalized tokens from arbitrary text (may include duplicates).
@@ -174,22 +220,14 @@ def tokenize_simple(text: str, mode: TokenizerMode = "atomic") -> List[str]:
     
     Note: ingest and query MUST use the same mode to avoid split-brain.
     """
-    out: List[str] = []
-    
-    # Mode-specific regex (DEFINITION, not POLICY)
-    if mode == "identifier":
-        # Preserve underscores as part of identifiers (for code)
-        pattern = re.compile(r"[A-Za-z0-9_]{2,}")
-    else:
-        # Atomic mode: split by separators including underscore (for email/logs)
-        # This splits snake_case into parts: get_data → [get, data]
-        pattern = re.compile(r"[A-Za-z0-9]{2,}")
-    
-    for m in pattern.finditer(text):
-        token = _normalize(m.group(0))
-        if token:
-            out.append(token)
-    return out
+    pattern = _IDENTIFIER_RE if mode == "identifier" else _ATOMIC_RE
+    return _normalize_all(pattern.findall(text), [])
+
+
+def tokenize_batch(texts: Iterable[str], mode: TokenizerMode = "atomic") -> List[List[str]]:
+    """tokenize_simple over many texts, sharing one normalization memo."""
+    findall = (_IDENTIFIER_RE if mode == "identifier" else _ATOMIC_RE).findall
+    return [_normalize_all(findall(text), []) for text in texts]
 
 
 def dedupe_preserve_order(tokens: Iterable[str]) -> List[str]:
@@ -204,14 +242,89 @@ def dedupe_preserve_order(tokens: Iterable[str]) -> List[str]:
     return out
 
 
+def iter_binary_lines(
+    stream: BinaryIO,
+    *,
+    chunk_size: int = STREAM_CHUNK,
+) -> Iterator[str]:
+    """
+    Lines of a UTF-8 byte stream, decoded chunk by chunk (universal newlines).
+
+    Same lines as `read_text().split("\\n")` (a trailing empty line included),
+    holding one chunk plus the current line in memory: multi-byte characters
+    and "\\r\\n" pairs split across chunks are carried over. Raises
+    UnicodeDecodeError on invalid UTF-8, possibly after lines were yielded.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pieces: List[str] = []  # current (unterminated) line
+    held_cr = False
+    while True:
+        raw = stream.read(chunk_size)
+        final = not raw
+        text = decoder.decode(raw, final)
+        if held_cr:
+            text = "\r" + text
+        held_cr = not final and text.endswith("\r")
+        if held_cr:
+            text = text[:-1]  # may be the first half of "\r\n"
+        parts = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        if len(parts) > 1:
+            pieces.append(parts[0])
+            yield "".join(pieces)
+            for i in range(1, len(parts) - 1):
+                yield parts[i]
+            pieces = [parts[-1]]
+        else:
+            pieces.append(parts[0])
+        if final:
+            break
+    yield "".join(pieces)
+
+
+def iter_tokens_with_lines(lines: Iterable[str]) -> Iterator[Tuple[str, int]]:
+    """Streaming tokenize_with_lines over an iterable of lines (no newlines)."""
+    findall = _TOKEN_RE.findall
+    get = _NORM_CACHE.get
+    for line_num, line in enumerate(lines, 1):
+        for raw in findall(line):
+            token = get(raw, _MISS)
+            if token is _MISS:
+                token = normalize_token(raw)
+            if token:
+                yield token, line_num
+
+
+def iter_tokens_with_positions(lines: Iterable[str]) -> Iterator[Tuple[str, int, int, int]]:
+    """Streaming tokenize_with_positions; char offsets carry across lines."""
+    finditer = _TOKEN_RE.finditer
+    get = _NORM_CACHE.get
+    char_offset = 0
+    for line_num, line in enumerate(lines, 1):
+        for m in finditer(line):
+            raw = m.group(0)
+            token = get(raw, _MISS)
+            if token is _MISS:
+                token = normalize_token(raw)
+            if not token:
+                continue
+            yield token, line_num, char_offset + m.start(), char_offset + m.end()
+        char_offset += len(line) + 1
+
+
 def tokenize_with_lines(text: str) -> List[Tuple[str, int]]:
     """Tokenize text and attach 1-based line numbers: [(token, line), ...]."""
+    # Same loop as iter_tokens_with_lines, minus the generator overhead
     out: List[Tuple[str, int]] = []
+    append = out.append
+    findall = _TOKEN_RE.findall
+    get = _NORM_CACHE.get
     for line_num, line in enumerate(text.split("\n"), 1):
-        for m in _TOKEN_RE.finditer(line):
-            token = _normalize(m.group(0))
+        for raw in findall(line):
+            token = get(raw, _MISS)
+            if token is _MISS:
+                token = normalize_token(raw)
             if token:
-                out.append((token, line_num))
+                append((token, line_num))
     return out
 
 
@@ -221,14 +334,4 @@ def tokenize_with_positions(text: str) -> List[Tuple[str, int, int, int]]:
 
     Returns: [(token, line, char_start, char_end), ...]
     """
-    out: List[Tuple[str, int, int, int]] = []
-    char_offset = 0
-    for line_num, line in enumerate(text.split("\n"), 1):
-        for m in _TOKEN_RE.finditer(line):
-            token = _normalize(m.group(0))
-            if not token:
-                continue
-            out.append((token, line_num, char_offset + m.start(), char_offset + m.end()))
-        char_offset += len(line) + 1
-    return out
-
+    return list(iter_tokens_with_positions(text.split("\n")))
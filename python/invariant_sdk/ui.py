@@ -19,11 +19,24 @@ from .ui_handler import UIHandler
 DEFAULT_SERVER = "http://165.22.145.158:8080"
 
 
-def run_ui(port: int = 8080, server: str = DEFAULT_SERVER, overlay_path: Optional[Path] = None):
+def run_ui(
+    port: int = 8080,
+    server: str = DEFAULT_SERVER,
+    overlay_path: Optional[Path] = None,
+    crystal_path: Optional[Path] = None,
+    threaded: bool = True,
+):
     """Start UI server."""
     from .ui_server import run_ui as _run_ui
 
-    _run_ui(UIHandler, port=port, server=server, overlay_path=overlay_path)
+    _run_ui(
+        UIHandler,
+        port=port,
+        server=server,
+        overlay_path=overlay_path,
+        crystal_path=crystal_path,
+        threaded=threaded,
+    )
 
 
 def main():
@@ -33,8 +46,10 @@ def main():
     parser.add_argument("--port", "-p", type=int, default=8080)
     parser.add_argument("--server", "-s", default=DEFAULT_SERVER)
     parser.add_argument("--overlay", "-o", type=Path)
+    parser.add_argument("--crystal", "-c", type=Path)
+    parser.add_argument("--single-thread", action="store_true")
     args = parser.parse_args()
-    run_ui(args.port, args.server, args.overlay)
+    run_ui(args.port, args.server, args.overlay, args.crystal, threaded=not args.single_thread)
 
 
 if __name__ == "__main__":
@@ -16,7 +16,9 @@ import json
 import os
 import re
 import subprocess
+import threading
 import urllib.parse
+from contextlib import contextmanager
 from http.server import BaseHTTPRequestHandler
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -25,19 +27,77 @@ try:
     from .halo import hash8_hex
     from .overlay import OverlayGraph, find_overlays
     from .physics import HaloPhysics
-    from .engine import OverlayIndex, locate_files, map_file
+    from .engine import OverlayIndex, locate_files, locate_workers_from_env, map_file
+    from .filecache import shared_file_cache
+    from .ingest import CtxHashIndex
+    from .suggest import SUGGEST_LIMIT, PrefixIndex, build_vocab_prefix_index
     from .ui_pages import render_main_page, render_graph3d_page
 except ImportError:
     from invariant_sdk.halo import hash8_hex
     from invariant_sdk.overlay import OverlayGraph, find_overlays
     from invariant_sdk.physics import HaloPhysics
-    from invariant_sdk.engine import OverlayIndex, locate_files, map_file
+    from invariant_sdk.engine import OverlayIndex, locate_files, locate_workers_from_env, map_file
+    from invariant_sdk.filecache import shared_file_cache
+    from invariant_sdk.ingest import CtxHashIndex
+    from invariant_sdk.suggest import SUGGEST_LIMIT, PrefixIndex, build_vocab_prefix_index
     from invariant_sdk.ui_pages import render_main_page, render_graph3d_page
 
 
 
+class _ReadWriteLock:
+    """
+    Many readers or one writer.
+    
+    A waiting writer blocks new readers, so a steady stream of queries
+    cannot starve an overlay swap. Not reentrant.
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+    
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+    
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
 class UIHandler(BaseHTTPRequestHandler):
-    """HTTP handler for Invariant UI."""
+    """
+    HTTP handler for Invariant UI.
+    
+    Concurrency (threaded server): GET requests run under the shared side of
+    _state_lock. Ingest / reindex / delete are serialized by _write_mutex,
+    apply their changes to a copy of the overlay and swap it in under the
+    exclusive side (copy-on-write), so a request sees one overlay version
+    and the caches derived from it, never a half-applied update.
+    """
     
     physics: Optional[HaloPhysics] = None
     overlay: Optional[OverlayGraph] = None
@@ -49,11 +109,24 @@ class UIHandler(BaseHTTPRequestHandler):
     _degree_total_cache: Dict[str, int] = {}
     _degree_total_crystal_id: Optional[str] = None
     _overlay_index: Optional[OverlayIndex] = None
-    _overlay_index_key: Optional[tuple] = None
+    _overlay_index_key: Optional[int] = None  # overlay.version
     _docs_cache: Optional[list[dict]] = None
     
+    # Autocomplete: crystal vocabulary index (needs _crystal) and halo fallback cache
+    _vocab_prefix: Optional[PrefixIndex] = None
+    _global_suggest_cache: Dict[tuple, List[dict]] = {}
+    _GLOBAL_SUGGEST_CACHE_SIZE = 4096
+    
+    # Window stats of the published overlay, kept by writers (key: overlay.version)
+    _window_stats = None
+    _window_stats_key: Optional[int] = None
+    
     _ANCHOR_SCAN_RADIUS = 50
     
+    _state_lock = _ReadWriteLock()
+    _write_mutex = threading.Lock()  # one overlay writer at a time
+    _index_lock = threading.Lock()  # one OverlayIndex build per overlay version
+    
     def log_message(self, format, *args):
         pass  # Suppress logging
     
@@ -76,42 +149,43 @@ class UIHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         parsed = urllib.parse.urlparse(self.path)
         
-        if parsed.path in ('/', '/index.html'):
-            self.serve_page()
-        elif parsed.path == '/graph3d':
-            self.serve_graph3d_page(parsed.query)
-        elif parsed.path == '/doc':
-            self.serve_doc_page(parsed.query)
-        elif parsed.path == '/api/locate':
-            self.api_locate(parsed.query)
-        elif parsed.path == '/api/structure':
-            self.api_structure(parsed.query)
-        elif parsed.path == '/api/search':
-            self.api_search(parsed.query)
-        elif parsed.path == '/api/suggest':
-            self.api_suggest(parsed.query)
-        elif parsed.path == '/api/mentions':
-            self.api_mentions(parsed.query)
-        elif parsed.path == '/api/graph':
-            self.api_graph(parsed.query)
-        elif parsed.path == '/api/docs':
-            self.api_docs()
-        elif parsed.path == '/api/status':
-            self.api_status()
-        elif parsed.path == '/api/verify':
-            self.api_verify(parsed.query)
-        elif parsed.path == '/api/context':
-            self.api_context(parsed.query)
-        elif parsed.path == '/api/open':
-            self.api_open(parsed.query)
-        elif parsed.path == '/api/conflicts':
-            self.api_conflicts()
-        elif parsed.path == '/api/bicameral':
-            self.api_bicameral(parsed.query)
-        elif parsed.path == '/api/analyze':
-            self.api_analyze(parsed.query)
-        else:
-            self.send_error(404)
+        with UIHandler._state_lock.read():
+            if parsed.path in ('/', '/index.html'):
+                self.serve_page()
+            elif parsed.path == '/graph3d':
+                self.serve_graph3d_page(parsed.query)
+            elif parsed.path == '/doc':
+                self.serve_doc_page(parsed.query)
+            elif parsed.path == '/api/locate':
+                self.api_locate(parsed.query)
+            elif parsed.path == '/api/structure':
+                self.api_structure(parsed.query)
+            elif parsed.path == '/api/search':
+                self.api_search(parsed.query)
+            elif parsed.path == '/api/suggest':
+                self.api_suggest(parsed.query)
+            elif parsed.path == '/api/mentions':
+                self.api_mentions(parsed.query)
+            elif parsed.path == '/api/graph':
+                self.api_graph(parsed.query)
+            elif parsed.path == '/api/docs':
+                self.api_docs()
+            elif parsed.path == '/api/status':
+                self.api_status()
+            elif parsed.path == '/api/verify':
+                self.api_verify(parsed.query)
+            elif parsed.path == '/api/context':
+                self.api_context(parsed.query)
+            elif parsed.path == '/api/open':
+                self.api_open(parsed.query)
+            elif parsed.path == '/api/conflicts':
+                self.api_conflicts()
+            elif parsed.path == '/api/bicameral':
+                self.api_bicameral(parsed.query)
+            elif parsed.path == '/api/analyze':
+                self.api_analyze(parsed.query)
+            else:
+                self.send_error(404)
     
     def do_POST(self):
         if self.path == '/api/ingest':
@@ -150,13 +224,27 @@ class UIHandler(BaseHTTPRequestHandler):
         overlay = cls.overlay
         if not overlay:
             return None
-        key = (id(overlay), overlay.n_edges, len(overlay.labels or {}))
+        key = overlay.version
         if cls._overlay_index is None or cls._overlay_index_key != key:
-            cls._overlay_index = OverlayIndex.build(overlay)
-            cls._overlay_index_key = key
-            cls._docs_cache = None
+            with cls._index_lock:
+                if cls._overlay_index is None or cls._overlay_index_key != key:
+                    index = OverlayIndex.build(overlay)
+                    cls._docs_cache = None
+                    cls._overlay_index_key = key
+                    cls._overlay_index = index
         return cls._overlay_index
 
+    @classmethod
+    def _publish_overlay(cls, overlay: OverlayGraph) -> None:
+        """Swap in a new overlay version (copy-on-write) and drop derived caches."""
+        with cls._state_lock.write():
+            old = cls.overlay
+            cls.overlay = overlay
+            physics = cls.physics
+            if physics is not None and old is not None and getattr(physics, "_overlay", None) is old:
+                physics._overlay = overlay  # σ-merge in halo lookups follows the swap
+            cls._invalidate_overlay_caches()
+
     def api_locate(self, query_string: str):
         """
         File-centric search (SERP): issue text -> ranked files (+ previews).
@@ -196,6 +284,7 @@ class UIHandler(BaseHTTPRequestHandler):
             preview_files=10,
             preview_occurrences=8,
             resolve_doc_path=_resolve,
+            workers=locate_workers_from_env(),
         )
         if out.get("error"):
             self.send_json(out, 400)
@@ -505,11 +594,7 @@ class UIHandler(BaseHTTPRequestHandler):
             if re.fullmatch(r'[0-9a-fA-F]{16}', focus):
                 focus_id = focus.lower()
             else:
-                needle = focus.strip().lower()
-                for h8, label in overlay.labels.items():
-                    if label and label.strip().lower() == needle:
-                        focus_id = h8
-                        break
+                focus_id = overlay.lookup_label(focus)
         
         # Build filtered edge list (doc filter applies only to local edges).
         edge_rows: list[tuple[str, str, float]] = []
@@ -724,7 +809,13 @@ class UIHandler(BaseHTTPRequestHandler):
             self.send_json({'error': str(e)}, 500)
     
     def api_suggest(self, query_string: str):
-        """Autocomplete suggestions from local + global."""
+        """
+        Autocomplete suggestions from local + global.
+
+        Local labels come from the overlay's prefix index (most σ-edges
+        first); global words from the crystal vocabulary prefix index when a
+        local crystal is loaded, else from a cached halo lookup.
+        """
         params = urllib.parse.parse_qs(query_string)
         q = params.get('q', [''])[0].strip().lower()
         
@@ -732,49 +823,23 @@ class UIHandler(BaseHTTPRequestHandler):
             self.send_json({'suggestions': []})
             return
         
-        physics = UIHandler.physics
-        overlay = UIHandler.overlay
         suggestions = []
         
         # 1. Local words (from overlay labels) — highest priority
-        if overlay:
-            for h8, label in overlay.labels.items():
-                if label and label.lower().startswith(q):
-                    suggestions.append({
-                        'word': label,
-                        'source': 'local',
-                        'hash8': h8
-                    })
-        
-        # 2. Global suggestions via halo lookup
-        if physics and len(suggestions) < 10:
-            try:
-                # Try to resolve the prefix and get neighbors
-                h8 = hash8_hex(f"Ġ{q}")
-                result = physics._client.get_halo_page(h8, limit=20)
-                if result.get('exists') or result.get('neighbors'):
-                    # Add the word itself
-                    if not any(s['word'].lower() == q for s in suggestions):
-                        suggestions.append({
-                            'word': q,
-                            'source': 'global',
-                            'hash8': h8
-                        })
-                    # Add top neighbors as suggestions
-                    neighbor_hashes = [n['hash8'] for n in result.get('neighbors', [])[:10]]
-                    if neighbor_hashes:
-                        labels = physics._client.get_labels_batch(neighbor_hashes)
-                        for h8, label in labels.items():
-                            if label and label.lower().startswith(q[:2]):
-                                suggestions.append({
-                                    'word': label,
-                                    'source': 'global',
-                                    'hash8': h8
-                                })
-            except Exception:
-                pass
+        idx = UIHandler._get_overlay_index()
+        if idx:
+            for word, h8, _weight in idx.label_prefix.top(q, SUGGEST_LIMIT):
+                suggestions.append({
+                    'word': word,
+                    'source': 'local',
+                    'hash8': h8
+                })
+        
+        # 2. Global suggestions (crystal vocabulary)
+        if len(suggestions) < SUGGEST_LIMIT:
+            suggestions.extend(UIHandler._global_suggestions(q))
         
-        # Dedupe and limit
+        # Dedupe (local wins) and limit
         seen = set()
         unique = []
         for s in suggestions:
@@ -783,10 +848,59 @@ class UIHandler(BaseHTTPRequestHandler):
                 seen.add(key)
                 unique.append(s)
         
-        # Sort: local first, then alphabetically
-        unique.sort(key=lambda x: (0 if x['source'] == 'local' else 1, x['word'].lower()))
-        
-        self.send_json({'suggestions': unique[:10]})
+        self.send_json({'suggestions': unique[:SUGGEST_LIMIT]})
+
+    @classmethod
+    def _get_vocab_prefix_index(cls) -> Optional[PrefixIndex]:
+        """Prefix index over the local crystal's vocabulary (built once)."""
+        if cls._crystal is None:
+            return None
+        if cls._vocab_prefix is None:
+            cls._vocab_prefix = build_vocab_prefix_index(cls._crystal)
+        return cls._vocab_prefix
+
+    @classmethod
+    def _global_suggestions(cls, q: str) -> List[dict]:
+        """Global words for prefix `q`: local vocab index, else cached halo lookup."""
+        vocab = cls._get_vocab_prefix_index()
+        if vocab is not None:
+            return [
+                {'word': word, 'source': 'global', 'hash8': hash8_hex(token)}
+                for word, token, _weight in vocab.top(q, SUGGEST_LIMIT)
+            ]
+
+        physics = cls.physics
+        if not physics:
+            return []
+        key = (physics.crystal_id, q)
+        cached = cls._global_suggest_cache.get(key)
+        if cached is not None:
+            return cached
+        out: List[dict] = []
+        try:
+            # Try to resolve the prefix and get neighbors
+            h8 = hash8_hex(f"Ġ{q}")
+            result = physics._client.get_halo_page(h8, limit=20)
+            if not result:
+                return out  # HaloClient reports errors as {}: not cached
+            if result.get('exists') or result.get('neighbors'):
+                # Add the word itself
+                out.append({'word': q, 'source': 'global', 'hash8': h8})
+                # Add top neighbors as suggestions
+                neighbor_hashes = [n['hash8'] for n in result.get('neighbors', [])[:10]]
+                if neighbor_hashes:
+                    labels = physics._client.get_labels_batch(neighbor_hashes)
+                    if not any(labels.values()):
+                        return out  # failed batch ({h: None}): not cached
+                    for nh8, label in labels.items():
+                        if label and label.lower().startswith(q[:2]):
+                            out.append({'word': label, 'source': 'global', 'hash8': nh8})
+        except Exception:
+            return out  # transient failure: not cached
+        if len(cls._global_suggest_cache) >= cls._GLOBAL_SUGGEST_CACHE_SIZE:
+            cls._global_suggest_cache.clear()
+        cls._global_suggest_cache[key] = out
+        return out
 
     def api_mentions(self, query_string: str):
         """
@@ -867,13 +981,61 @@ class UIHandler(BaseHTTPRequestHandler):
             'mentions': unique
         })
     
+    @staticmethod
+    def _ingest_writer(physics, overlay: OverlayGraph, stats=None):
+        """Ingest engine writer for UI uploads / reindex (condensed anchors)."""
+        from invariant_sdk.ingest import CONDENSED_ANCHORS, IngestWriter
+        return IngestWriter(
+            overlay=overlay,
+            fetch_meta=lambda chunk: physics._client.get_halo_pages(chunk, limit=0),
+            mean_mass=physics.mean_mass,
+            stats=stats,
+            policy=CONDENSED_ANCHORS,
+            n_labels=int((physics.meta or {}).get("n_labels") or 1),
+        )
+    
+    @classmethod
+    def _take_window_stats(cls, base: Optional[OverlayGraph], overlay: OverlayGraph, overlay_path):
+        """
+        Window stats for a write of `overlay` (a copy of `base`), for delta upkeep.
+        
+        The in-memory stats of the published overlay are reused; otherwise the
+        persisted ones are loaded (or rebuilt). The write mutates them, so they
+        are cached again only by a successful _save_overlay. None if unsaved.
+        """
+        stats, key = cls._window_stats, cls._window_stats_key
+        cls._window_stats = cls._window_stats_key = None
+        if not overlay_path:
+            return None
+        if stats is not None and base is not None and key == base.version:
+            return stats
+        from invariant_sdk.operators import load_or_build_window_stats
+        return load_or_build_window_stats(Path(overlay_path), overlay)
+    
+    @staticmethod
+    def _save_overlay(overlay: OverlayGraph, overlay_path, stats=None) -> None:
+        from invariant_sdk.operators import window_stats_path
+        if overlay_path:
+            overlay.save(overlay_path)
+        else:
+            overlay_path = Path('./.invariant/overlay.jsonl')
+            overlay_path.parent.mkdir(parents=True, exist_ok=True)
+            overlay.save(overlay_path)
+            UIHandler.overlay_path = overlay_path
+        # Stats the write did not maintain are dropped rather than left stale
+        stats_path = window_stats_path(Path(overlay_path))
+        if stats is not None:
+            stats.save(stats_path, overlay)
+            UIHandler._window_stats, UIHandler._window_stats_key = stats, overlay.version
+        else:
+            stats_path.unlink(missing_ok=True)
+    
     def api_ingest(self):
         """Ingest document via POST."""
         content_length = int(self.headers.get('Content-Length', 0))
         body = self.rfile.read(content_length)
         
         try:
-            import math
             data = json.loads(body)
             filename = data.get('filename', 'document.txt')
             text = data.get('text', '')
@@ -896,161 +1058,51 @@ class UIHandler(BaseHTTPRequestHandler):
                 stored_doc = safe_name
             
             physics = UIHandler.physics
-            overlay = UIHandler.overlay
-            overlay_path = UIHandler.overlay_path
-            
             if not physics:
                 self.send_json({'error': 'Not connected'}, 500)
                 return
             
-            # Tokenize with line positions (Anchor Integrity Protocol needs stable coordinates).
-            from invariant_sdk.tokenize import tokenize_with_lines
-            tokens = tokenize_with_lines(text)
-            
-            words = [w for (w, _ln) in tokens]
-            unique_words = list(dict.fromkeys(words))  # L0: Full observation, Crystal decides Solid vs Gas
-            
-            # Find anchors using single BATCH API call (O(1) network round-trip)
-            # Server now properly supports limit=0 for meta-only checks
-            word_to_hash = {w: hash8_hex(f"Ġ{w}") for w in unique_words}
-            
-            # Single HTTP call - meta only (no neighbors, just existence check)
-            try:
-                batch_results = physics._client.get_halo_pages(word_to_hash.values(), limit=0)
-            except Exception as e:
-                self.send_json({'error': f'Server error: {e}'}, 500)
-                return
-            
-            # Mass filter (INVARIANTS.md): keep Solid anchors (mass > mean_mass)
-            mean_mass = physics.mean_mass
-            candidates: list[tuple[str, str, float, int, bool]] = []
-            for word in unique_words:
-                h8 = word_to_hash.get(word)
-                if not h8:
-                    continue
-                result = batch_results.get(h8) or {}
-                if not result.get('exists'):
-                    # Unknown words are local anchors (σ) by definition.
-                    # Treat as high-mass so they survive the phase boundary.
-                    candidates.append((word, h8, 1.0, 0, False))
-                    continue
-                meta = result.get('meta') or {}
-                try:
-                    degree_total = int(meta.get('degree_total') or 0)
-                except Exception:
-                    degree_total = 0
-                try:
-                    mass = 1.0 / math.log(2 + max(0, degree_total)) if degree_total > 0 else 0.0
-                except Exception:
-                    mass = 0.0
-                candidates.append((word, h8, mass, degree_total, True))
-            
-            # === LAW OF CONDENSATION (INVARIANTS V.1) ===
-            # Phase = Solid iff Mass_α > μ_mass OR TF_local > TF_crit
-            from collections import Counter
-            
-            # 1. Global Mass criterion (α-classification)
-            solid_by_mass = {(w, h8) for (w, h8, m, _deg, _exists) in candidates if m > mean_mass}
-
-            # 2. Local TF criterion (σ-observation / Condensation)
-            # Define critical pressure as the mean per-type frequency in this document.
-            word_counts = Counter(w for w, _ in tokens)
-            tf_mean = (sum(word_counts.values()) / len(word_counts)) if word_counts else 0.0
-
-            # Exclude LINK/hub words from condensing (Invariant: LINK if degree > √N).
-            n_labels = int((physics.meta or {}).get("n_labels") or 1)
-            link_degree = math.sqrt(max(1, n_labels))
-
-            cand_by_word = {w: (h8, deg, exists) for (w, h8, _m, deg, exists) in candidates}
-            solid_by_tf = {
-                (w, cand_by_word[w][0])
-                for w, count in word_counts.items()
-                if count > tf_mean
-                and w in cand_by_word
-                and (
-                    not cand_by_word[w][2]  # unknown words can condense
-                    or float(cand_by_word[w][1]) <= link_degree
-                )
-            }
-            
-            # 3. Combined: anchor if EITHER criterion is met
-            solid = solid_by_mass | solid_by_tf
-            
-            if len(solid) >= 2:
-                anchors = list(solid)
-            else:
-                top = sorted(candidates, key=lambda x: x[2], reverse=True)[:64]
-                top_set = {h8 for (_w, h8, _m, _deg, _exists) in top}
-                anchors = [(w, h8) for (w, h8, _m, _deg, _exists) in candidates if h8 in top_set]
-            
-            if len(anchors) < 2:
+            # Same engine as `inv ingest`; edges chain Law-of-Condensation anchors.
+            from invariant_sdk.ingest import CONDENSED_ANCHORS, scan_text
+            scanned = scan_text(text, stored_doc, max_words=None, policy=CONDENSED_ANCHORS)
+            if len(scanned.words) < 2:
                 self.send_json({'error': 'Too few concepts found in document'}, 400)
                 return
             
-            anchor_words = {w for (w, _h8) in anchors}
-            
-            # Anchor Integrity Protocol: ctx_hash for anchor window (±2 words)
-            import hashlib
-            def compute_ctx_hash_at(idx: int, k: int = 2) -> str:
-                start = max(0, idx - k)
-                end = min(len(tokens), idx + k + 1)
-                window_words = [tokens[i][0] for i in range(start, end)]
-                normalized = ' '.join(w.lower() for w in window_words)
-                return hashlib.sha256(normalized.encode('utf-8')).hexdigest()[:8]
-            
-            # Collect anchor occurrences in original order for edge construction.
-            occurrences: list[tuple[str, str, int, str]] = []
-            for idx, (word, line_no) in enumerate(tokens):
-                if word not in anchor_words:
-                    continue
-                h8 = word_to_hash.get(word) or hash8_hex(f"Ġ{word}")
-                occurrences.append((word, h8, line_no, compute_ctx_hash_at(idx)))
-            
-            if len(occurrences) < 2:
-                self.send_json({'error': 'Too few anchor occurrences found'}, 400)
-                return
-            
-            # Create edges
-            if overlay is None:
-                overlay = OverlayGraph()
-                UIHandler.overlay = overlay
-            
-            edges_added = 0
-            for i in range(len(occurrences) - 1):
-                src_word, src_h8, _src_line, _src_ctx = occurrences[i]
-                tgt_word, tgt_h8, tgt_line, tgt_ctx = occurrences[i + 1]
+            with UIHandler._write_mutex:
+                # Copy-on-write: queries keep reading the current overlay until the swap
+                base = UIHandler.overlay
+                overlay = base.copy() if base is not None else OverlayGraph()
+                overlay_path = UIHandler.overlay_path
+                stats = self._take_window_stats(base, overlay, overlay_path)
                 
-                overlay.add_edge(
-                    src_h8,
-                    tgt_h8,
-                    weight=1.0,
-                    doc=stored_doc,
-                    line=tgt_line,
-                    ctx_hash=tgt_ctx,
-                )
-                overlay.define_label(src_h8, src_word)
-                overlay.define_label(tgt_h8, tgt_word)
-                edges_added += 1
-            
-            # Save
-            if overlay_path:
-                overlay.save(overlay_path)
-            else:
-                default_path = Path('./.invariant/overlay.jsonl')
-                default_path.parent.mkdir(parents=True, exist_ok=True)
-                overlay.save(default_path)
-                UIHandler.overlay_path = default_path
-            
-            # Clear caches (graph depends on overlay contents).
-            UIHandler._invalidate_overlay_caches()
+                writer = self._ingest_writer(physics, overlay, stats)
+                writer.add(scanned)
+                try:
+                    writer.flush()
+                except Exception as e:
+                    self.send_json({'error': f'Server error: {e}'}, 500)
+                    return
+                report = writer.report
+                if report.edges == 0:
+                    self.send_json({'error': 'Too few anchor occurrences found'}, 400)
+                    return
+                
+                # Save
+                with report.timings.stage('save'):
+                    self._save_overlay(overlay, overlay_path, stats)
+                
+                # Publish (clears caches: graph depends on overlay contents).
+                UIHandler._publish_overlay(overlay)
             
             self.send_json({
                 'success': True,
                 'filename': stored_doc,
-                'scanned_words': len(unique_words),
-                'candidates': len(candidates),
-                'anchors': len(anchor_words),
-                'edges': edges_added
+                'scanned_words': len(scanned.words),
+                'candidates': len(scanned.words),
+                'anchors': report.anchors,
+                'edges': report.edges,
+                'timing_s': report.timings.as_dict(),
             })
             
         except json.JSONDecodeError:
@@ -1070,7 +1122,6 @@ class UIHandler(BaseHTTPRequestHandler):
         body = self.rfile.read(content_length)
         
         try:
-            import math
             data = json.loads(body)
             doc = (data.get('doc') or '').strip()
             if not doc:
@@ -1078,10 +1129,7 @@ class UIHandler(BaseHTTPRequestHandler):
                 return
             
             physics = UIHandler.physics
-            overlay = UIHandler.overlay
-            overlay_path = UIHandler.overlay_path
-            
-            if not physics or not overlay:
+            if not physics or not UIHandler.overlay:
                 self.send_json({'error': 'No overlay loaded. Ingest documents first.'}, 400)
                 return
             
@@ -1095,136 +1143,41 @@ class UIHandler(BaseHTTPRequestHandler):
                 self.send_json({'error': 'Document is empty'}, 400)
                 return
             
-            # Remove existing edges for this doc (replace)
-            removed = 0
-            for src in list(overlay.edges.keys()):
-                before = len(overlay.edges[src])
-                overlay.edges[src] = [e for e in overlay.edges[src] if e.doc != doc]
-                removed += before - len(overlay.edges[src])
-                if not overlay.edges[src]:
-                    del overlay.edges[src]
-            
-            # Tokenize with line positions
-            from invariant_sdk.tokenize import tokenize_with_lines
-            tokens = tokenize_with_lines(text)
-            
-            words = [w for (w, _ln) in tokens]
-            unique_words = list(dict.fromkeys(words))  # L0: Crystal decides via Phase Separation
-            word_to_hash = {w: hash8_hex(f"Ġ{w}") for w in unique_words}
-            
-            try:
-                batch_results = physics._client.get_halo_pages(word_to_hash.values(), limit=0)
-            except Exception as e:
-                self.send_json({'error': f'Server error: {e}'}, 500)
-                return
-            
-            mean_mass = physics.mean_mass
-            candidates: list[tuple[str, str, float, int, bool]] = []
-            for word in unique_words:
-                h8 = word_to_hash.get(word)
-                if not h8:
-                    continue
-                result = batch_results.get(h8) or {}
-                if not result.get('exists'):
-                    candidates.append((word, h8, 1.0, 0, False))
-                    continue
-                meta = result.get('meta') or {}
-                try:
-                    degree_total = int(meta.get('degree_total') or 0)
-                except Exception:
-                    degree_total = 0
-                try:
-                    mass = 1.0 / math.log(2 + max(0, degree_total)) if degree_total > 0 else 0.0
-                except Exception:
-                    mass = 0.0
-                candidates.append((word, h8, mass, degree_total, True))
-            
-            # === LAW OF CONDENSATION (INVARIANTS V.1) ===
-            from collections import Counter
-            
-            solid_by_mass = {(w, h8) for (w, h8, m, _deg, _exists) in candidates if m > mean_mass}
-            word_counts = Counter(w for w, _ in tokens)
-            tf_mean = (sum(word_counts.values()) / len(word_counts)) if word_counts else 0.0
-            
-            n_labels = int((physics.meta or {}).get("n_labels") or 1)
-            link_degree = math.sqrt(max(1, n_labels))
-            cand_by_word = {w: (h8, deg, exists) for (w, h8, _m, deg, exists) in candidates}
-            solid_by_tf = {
-                (w, cand_by_word[w][0])
-                for w, count in word_counts.items()
-                if count > tf_mean
-                and w in cand_by_word
-                and (
-                    not cand_by_word[w][2]
-                    or float(cand_by_word[w][1]) <= link_degree
-                )
-            }
-            solid = solid_by_mass | solid_by_tf
-            
-            if len(solid) >= 2:
-                anchors = list(solid)
-            else:
-                top = sorted(candidates, key=lambda x: x[2], reverse=True)[:64]
-                top_set = {h8 for (_w, h8, _m, _deg, _exists) in top}
-                anchors = [(w, h8) for (w, h8, _m, _deg, _exists) in candidates if h8 in top_set]
-            
-            if len(anchors) < 2:
+            # The engine replaces the doc's σ-edges (delete_doc keeps indexes in step)
+            from invariant_sdk.ingest import CONDENSED_ANCHORS, scan_text
+            scanned = scan_text(text, doc, path=str(doc_path), max_words=None, policy=CONDENSED_ANCHORS)
+            if len(scanned.words) < 2:
                 self.send_json({'error': 'Too few concepts found in document'}, 400)
                 return
             
-            anchor_words = {w for (w, _h8) in anchors}
-            
-            import hashlib
-            def compute_ctx_hash_at(idx: int, k: int = 2) -> str:
-                start = max(0, idx - k)
-                end = min(len(tokens), idx + k + 1)
-                window_words = [tokens[i][0] for i in range(start, end)]
-                normalized = ' '.join(w.lower() for w in window_words)
-                return hashlib.sha256(normalized.encode('utf-8')).hexdigest()[:8]
-            
-            occurrences: list[tuple[str, str, int, str]] = []
-            for idx, (word, line_no) in enumerate(tokens):
-                if word not in anchor_words:
-                    continue
-                h8 = word_to_hash.get(word) or hash8_hex(f"Ġ{word}")
-                occurrences.append((word, h8, line_no, compute_ctx_hash_at(idx)))
-            
-            if len(occurrences) < 2:
-                self.send_json({'error': 'Too few anchor occurrences found'}, 400)
-                return
-            
-            edges_added = 0
-            for i in range(len(occurrences) - 1):
-                src_word, src_h8, _src_line, _src_ctx = occurrences[i]
-                tgt_word, tgt_h8, tgt_line, tgt_ctx = occurrences[i + 1]
-                overlay.add_edge(
-                    src_h8,
-                    tgt_h8,
-                    weight=1.0,
-                    doc=doc,
-                    line=tgt_line,
-                    ctx_hash=tgt_ctx,
-                )
-                overlay.define_label(src_h8, src_word)
-                overlay.define_label(tgt_h8, tgt_word)
-                edges_added += 1
-            
-            if overlay_path:
-                overlay.save(overlay_path)
-            else:
-                default_path = Path('./.invariant/overlay.jsonl')
-                default_path.parent.mkdir(parents=True, exist_ok=True)
-                overlay.save(default_path)
-                UIHandler.overlay_path = default_path
-            
-            UIHandler._invalidate_overlay_caches()
+            with UIHandler._write_mutex:
+                base = UIHandler.overlay
+                overlay = base.copy()  # copy-on-write
+                overlay_path = UIHandler.overlay_path
+                stats = self._take_window_stats(base, overlay, overlay_path)
+                
+                writer = self._ingest_writer(physics, overlay, stats)
+                writer.add(scanned)
+                try:
+                    writer.flush()
+                except Exception as e:
+                    self.send_json({'error': f'Server error: {e}'}, 500)
+                    return
+                report = writer.report
+                removed = report.replaced_edges
+                
+                with report.timings.stage('save'):
+                    self._save_overlay(overlay, overlay_path, stats)
+                
+                UIHandler._publish_overlay(overlay)
             
             self.send_json({
                 'success': True,
                 'doc': doc,
                 'removed_edges': removed,
-                'edges': edges_added,
-                'anchors': len(anchor_words),
+                'edges': report.edges,
+                'anchors': report.anchors,
+                'timing_s': report.timings.as_dict(),
             })
         except json.JSONDecodeError:
             self.send_json({'error': 'Invalid JSON'}, 400)
@@ -1243,25 +1196,32 @@ class UIHandler(BaseHTTPRequestHandler):
                 self.send_json({'error': 'Missing doc'}, 400)
                 return
             
-            overlay = UIHandler.overlay
-            overlay_path = UIHandler.overlay_path
-            
-            if not overlay:
+            if not UIHandler.overlay:
                 self.send_json({'error': 'No overlay loaded'}, 400)
                 return
             
-            # Delete all edges for this doc
-            deleted = overlay.delete_doc(doc)
-            
-            if deleted == 0:
-                self.send_json({'error': f'No edges found for doc: {doc}'}, 404)
-                return
-            
-            # Save overlay
-            if overlay_path:
-                overlay.save(overlay_path)
-            
-            UIHandler._invalidate_overlay_caches()
+            with UIHandler._write_mutex:
+                base = UIHandler.overlay
+                overlay = base.copy()  # copy-on-write
+                overlay_path = UIHandler.overlay_path
+                
+                # Persisted window stats are updated by delta
+                stats = self._take_window_stats(base, overlay, overlay_path)
+                if stats is not None:
+                    stats.remove_doc(doc, overlay)
+                
+                # Delete all edges for this doc
+                deleted = overlay.delete_doc(doc)
+                
+                if deleted == 0:
+                    self.send_json({'error': f'No edges found for doc: {doc}'}, 404)
+                    return
+                
+                # Save overlay
+                if overlay_path:
+                    self._save_overlay(overlay, overlay_path, stats)
+                
+                UIHandler._publish_overlay(overlay)
             
             self.send_json({
                 'success': True,
@@ -1502,8 +1462,12 @@ class UIHandler(BaseHTTPRequestHandler):
             return
         
         try:
-            text = doc_path.read_text(encoding='utf-8')
-            lines = text.split('\n')
+            entry = shared_file_cache().get(doc_path, strict=True)
+            if entry is not None:
+                lines = entry.line_view(newline_only=True)
+            else:
+                text = doc_path.read_text(encoding='utf-8')
+                lines = text.split('\n')
             
             if target_line < 1 or target_line > len(lines):
                 self.send_json({
@@ -1512,12 +1476,15 @@ class UIHandler(BaseHTTPRequestHandler):
                 }, 400)
                 return
             
-            # Tokenize entire file for hash computation
-            tokens = self._tokenize_file(text)
+            # ctx_hash windows of the file (memoized per file version)
+            if entry is not None:
+                ctx_index = entry.memo('ctx_hash_index', self._ctx_hash_index)
+            else:
+                ctx_index = self._ctx_hash_index(text)
             
             status, actual_line, anchor_word = self._resolve_anchor_coordinate(
                 lines=lines,
-                tokens=tokens,
+                ctx_index=ctx_index,
                 requested_line=target_line,
                 ctx_hash=ctx_hash or None,
             )
@@ -1546,7 +1513,7 @@ class UIHandler(BaseHTTPRequestHandler):
         self,
         *,
         lines: list[str],
-        tokens: list[tuple[str, int]],
+        ctx_index: CtxHashIndex,
         requested_line: int,
         ctx_hash: Optional[str],
     ) -> tuple[str, int, Optional[str]]:
@@ -1564,7 +1531,7 @@ class UIHandler(BaseHTTPRequestHandler):
         if not ctx_hash:
             return status, actual_line, anchor_word
 
-        for h, w in self._compute_hashes_at_line(tokens, requested_line):
+        for h, w in ctx_index.hashes_at_line(requested_line):
             if h == ctx_hash:
                 return 'fresh', requested_line, w
 
@@ -1572,13 +1539,13 @@ class UIHandler(BaseHTTPRequestHandler):
         for offset in range(1, scan_radius + 1):
             up = requested_line - offset
             if up >= 1:
-                for h, w in self._compute_hashes_at_line(tokens, up):
+                for h, w in ctx_index.hashes_at_line(up):
                     if h == ctx_hash:
                         return 'relocated', up, w
 
             down = requested_line + offset
             if down <= len(lines):
-                for h, w in self._compute_hashes_at_line(tokens, down):
+                for h, w in ctx_index.hashes_at_line(down):
                     if h == ctx_hash:
                         return 'relocated', down, w
 
@@ -1738,10 +1705,9 @@ class UIHandler(BaseHTTPRequestHandler):
         try:
             text = doc_path.read_text(encoding='utf-8')
             lines = text.split('\n')
-            tokens = self._tokenize_file(text)
             status, actual_line, _anchor_word = self._resolve_anchor_coordinate(
                 lines=lines,
-                tokens=tokens,
+                ctx_index=self._ctx_hash_index(text),
                 requested_line=target_line,
                 ctx_hash=ctx_hash or None,
             )
@@ -1777,39 +1743,10 @@ class UIHandler(BaseHTTPRequestHandler):
         except Exception as e:
             self.send_json({'error': str(e), 'status': status}, 500)
     
-    def _tokenize_file(self, text: str) -> list:
-        """Tokenize text with position info for hash computation."""
+    def _ctx_hash_index(self, text: str) -> CtxHashIndex:
+        """ctx_hash windows + line→token ranges of a file (Anchor Integrity Protocol)."""
         from invariant_sdk.tokenize import tokenize_with_lines
-        return tokenize_with_lines(text)
-    
-    def _compute_hashes_at_line(self, tokens: list, target_line: int, k: int = 2) -> list[tuple[str, str]]:
-        """
-        Compute all possible ctx_hashes for tokens at given line.
-        
-        Returns list of (ctx_hash, anchor_word) (one per token on that line).
-        This is needed because we don't know which token was the anchor.
-        """
-        import hashlib
-        
-        # Find all tokens on this line
-        line_tokens = [(i, t) for i, t in enumerate(tokens) if t[1] == target_line]
-        
-        if not line_tokens:
-            return []
-        
-        out: list[tuple[str, str]] = []
-        for anchor_idx, token in line_tokens:
-            # Get window
-            start = max(0, anchor_idx - k)
-            end = min(len(tokens), anchor_idx + k + 1)
-            
-            window_words = [tokens[i][0] for i in range(start, end)]
-            normalized = ' '.join(w.lower() for w in window_words)
-            
-            h = hashlib.sha256(normalized.encode('utf-8')).hexdigest()[:8]
-            out.append((h, token[0]))
-        
-        return out
+        return CtxHashIndex(tokenize_with_lines(text))
     
     def _extract_semantic_block(self, lines: list, target_line: int, max_lines: int = 10):
         """
@@ -2069,9 +2006,7 @@ class UIHandler(BaseHTTPRequestHandler):
                     solid_count += 1
                 
                 # Check if word is indexed anchor (has edges)
-                is_anchor = h8 in overlay.edges or any(
-                    h8 == e.tgt for edges in overlay.edges.values() for e in edges
-                )
+                is_anchor = overlay.has_node(h8)
                 
                 result_tokens.append({
                     'word': word,
@@ -4,6 +4,7 @@ import socket
 import subprocess
 import time
 from http.server import HTTPServer
+from socketserver import ThreadingMixIn
 from pathlib import Path
 from typing import Optional, Type
 
@@ -16,24 +17,35 @@ DEFAULT_SERVER = "http://165.22.145.158:8080"
 
 class ReuseHTTPServer(HTTPServer):
     allow_reuse_address = True
+    request_queue_size = 64  # the page fires several API calls at once
 
     def server_bind(self):
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         super().server_bind()
 
 
+class ThreadingReuseHTTPServer(ThreadingMixIn, ReuseHTTPServer):
+    """One thread per request: a slow ingest or halo fetch does not block queries."""
+
+    daemon_threads = True
+
+
 def run_ui(
     handler_cls: Type,
     *,
     port: int = 8080,
     server: str = DEFAULT_SERVER,
     overlay_path: Optional[Path] = None,
+    crystal_path: Optional[Path] = None,
+    threaded: bool = True,
 ) -> None:
     """
     Start the UI server for a given handler class.
 
     `handler_cls` is expected to be a `BaseHTTPRequestHandler` subclass that
     exposes the same class attributes as `invariant_sdk.ui.UIHandler`.
+    With `threaded`, requests are served concurrently; the handler guards
+    overlay swaps with its readers-writer lock.
     """
     print("Invariant UI")
     print("=" * 40)
@@ -83,12 +95,27 @@ def run_ui(
     if overlay:
         print(f"  Local: {overlay.n_edges} edges, {len(overlay.labels)} labels")
 
+    # Local crystal (optional): offline vocabulary for autocomplete
+    if crystal_path:
+        try:
+            from .crystal import BinaryCrystal
+
+            handler_cls._crystal = BinaryCrystal(crystal_path)
+            handler_cls._crystal_path = crystal_path
+            handler_cls._vocab_prefix = None
+            vocab = handler_cls._get_vocab_prefix_index()
+            print(f"  Vocabulary: {len(vocab):,} words from {crystal_path.name}")
+        except Exception as e:
+            handler_cls._crystal = None
+            print(f"  Vocabulary: unavailable ({e})")
+
     print()
     print(f"→ Open http://localhost:{port}")
     print("  Ctrl+C to stop")
     print()
 
-    httpd = ReuseHTTPServer(("localhost", port), handler_cls)
+    server_cls = ThreadingReuseHTTPServer if threaded else ReuseHTTPServer
+    httpd = server_cls(("localhost", port), handler_cls)
 
     try:
         httpd.serve_forever()
@@ -0,0 +1,131 @@
+"""
+conftest.py — Shared stand-ins for the Halo server (MCP / UI tests)
+
+HaloStub mirrors HaloClient's failure contract: an unreachable server is
+not an exception but an empty response ({} for halo pages, None labels).
+"""
+
+import threading
+import time
+
+import pytest
+
+
+class HaloStub:
+    """In-memory HaloClient: `halo` maps hash8 → neighbor hash8s."""
+
+    def __init__(self, halo=None, labels=None, *, delay=0.0):
+        self.halo = halo or {}
+        self.labels = labels or {}
+        self.delay = delay
+        self.down = 0  # next N calls fail the way HaloClient does
+        self.calls = 0
+        self.active = 0  # calls in flight right now
+        self.max_active = 0
+        self._lock = threading.Lock()  # called from UI server threads
+
+    def _enter(self) -> bool:
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            if self.delay:
+                time.sleep(self.delay)  # network round-trip
+        finally:
+            with self._lock:
+                self.active -= 1
+        with self._lock:
+            if self.down:
+                self.down -= 1
+                return False
+        return True
+
+    def _page(self, h8):
+        return {"exists": h8 in self.halo, "neighbors": [{"hash8": n} for n in self.halo.get(h8, [])]}
+
+    def get_halo_page(self, h8, limit=20, **_kw):
+        return self._page(h8) if self._enter() else {}
+
+    def get_halo_pages(self, chunk, limit=500, **_kw):
+        return {h8: self._page(h8) for h8 in chunk} if self._enter() else {}
+
+    def get_labels_batch(self, hashes):
+        ok = self._enter()
+        return {h8: self.labels.get(h8) if ok else None for h8 in hashes}
+
+
+class PhysicsStub:
+    """HaloPhysics surface used by the MCP tools and the UI handler."""
+
+    crystal_id = "test"
+    mean_mass = 0.3
+    meta = {}
+
+    def __init__(self, client):
+        self._client = client
+
+    def get_neighbors(self, node, limit=50):
+        return [{"hash8": n} for n in self._client.halo.get(node, [])]
+
+
+class DiskCacheStub:
+    """_DiskCache without SQLite."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get_many(self, keys):
+        return {k: self.store[k] for k in keys if k in self.store}
+
+    def set_many(self, items):
+        self.store.update(items)
+
+    def set(self, key, value):
+        self.store[key] = value
+
+
+@pytest.fixture
+def halo_stub():
+    """Factory: HaloStub(halo, labels, delay=...)."""
+    return HaloStub
+
+
+@pytest.fixture
+def mcp_env(monkeypatch):
+    """Point mcp_server at an overlay and a HaloStub; returns the disk cache stub."""
+    from invariant_sdk import mcp_server
+
+    def install(overlay, client):
+        disk = DiskCacheStub()
+        monkeypatch.setattr(mcp_server, "_physics", PhysicsStub(client))
+        monkeypatch.setattr(mcp_server, "_overlay", overlay)
+        monkeypatch.setattr(mcp_server, "_disk_cache", disk)
+        monkeypatch.setattr(mcp_server, "_halo_neighbors_cache", {})
+        monkeypatch.setattr(mcp_server, "_halo_meta_cache", {})
+        monkeypatch.setattr(mcp_server, "_window_stats", None)
+        monkeypatch.setattr(mcp_server, "_window_stats_key", None)
+        return disk
+
+    return install
+
+
+@pytest.fixture
+def ui_env(monkeypatch):
+    """Point UIHandler at an overlay and a HaloStub (no local crystal)."""
+    from invariant_sdk.ui_handler import UIHandler
+
+    def install(overlay, client, crystal=None):
+        monkeypatch.setattr(UIHandler, "overlay", overlay)
+        monkeypatch.setattr(UIHandler, "overlay_path", None)
+        monkeypatch.setattr(UIHandler, "physics", PhysicsStub(client) if client else None)
+        monkeypatch.setattr(UIHandler, "_crystal", crystal)
+        monkeypatch.setattr(UIHandler, "_vocab_prefix", None)
+        monkeypatch.setattr(UIHandler, "_global_suggest_cache", {})
+        monkeypatch.setattr(UIHandler, "_window_stats", None)
+        monkeypatch.setattr(UIHandler, "_window_stats_key", None)
+        UIHandler._invalidate_overlay_caches()
+        return UIHandler
+
+    yield install
+    UIHandler._invalidate_overlay_caches()
@@ -0,0 +1,65 @@
+"""
+test_filecache.py — Shared file cache (line slices, invalidation)
+"""
+
+import pytest
+
+
+@pytest.mark.parametrize("text", [
+    "alpha\r\nbeta\n\ngamma\x0cdelta\rend tail\n",
+    "crlf one\r\ncrlf two\r\n\r\nlast",
+    "cr one\rcr two\r\rcr last\r",
+])
+def test_file_cache_line_slices_match_split(tmp_path, text):
+    """Cached offsets and the streamed (over-bound) path agree with read_text() split semantics."""
+    from invariant_sdk.filecache import FileCache
+    from invariant_sdk.tokenize import tokenize_with_lines
+
+    path = tmp_path / "doc.txt"
+    path.write_bytes(text.encode("utf-8"))
+    decoded = path.read_text(encoding="utf-8")  # universal newlines, as ingest numbers lines
+
+    for cache in (FileCache(), FileCache(max_file_bytes=0)):
+        for newline_only, expected in ((False, decoded.splitlines()), (True, decoded.split("\n"))):
+            n = len(expected)
+            assert cache.read_lines(path, 1, n + 5, newline_only=newline_only) == expected
+            assert cache.read_lines(path, 2, 3, newline_only=newline_only) == expected[1:3]
+
+    cache = FileCache()
+    entry = cache.get(path, strict=True)
+    assert list(entry.line_view(newline_only=True)) == decoded.split("\n")
+    assert entry.memo("tokens_with_lines", tokenize_with_lines) == tokenize_with_lines(decoded)
+    assert cache.get(path) is entry
+
+    path.write_text("changed\n", encoding="utf-8")
+    assert cache.read_lines(path, 1, 10) == ["changed"]
+
+    path.write_bytes(b"bad \xff byte\r\nok\n")
+    assert cache.read_lines(path, 1, 10) == ["bad  byte", "ok"]
+    with pytest.raises(UnicodeDecodeError):
+        cache.get(path, strict=True)
+
+
+def test_file_cache_bound_counts_derived_data(tmp_path):
+    """Memos, offsets and the lowercase copy are charged to the LRU bound, not just raw bytes."""
+    from invariant_sdk.filecache import FileCache, approx_size
+
+    paths = []
+    for name in ("a.txt", "b.txt", "c.txt"):
+        path = tmp_path / name
+        path.write_text("Alpha beta\n" * 50, encoding="utf-8")
+        paths.append(path)
+
+    cache = FileCache(max_bytes=20_000)
+    a, b, c = (cache.get(p) for p in paths)
+    assert len(cache) == 3 and cache._bytes == sum(p.stat().st_size for p in paths)
+
+    a.lower
+    a.line_count()
+    assert a.cost > a.size and cache._bytes == a.cost + b.cost + c.cost
+
+    words = a.memo("words", lambda text: [w * 200 for w in text.split()])
+    assert a.cost >= a.size + approx_size(words)
+    assert list(cache._entries) == [str(a.path)]  # b and c evicted for a's memo
+    assert cache._bytes == a.cost
+    assert cache.get(paths[1]) is not b  # re-read after eviction
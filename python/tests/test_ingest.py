@@ -0,0 +1,425 @@
+"""
+test_ingest.py — Ingest engine: pipeline, manifest, anchor policies, discovery, streaming
+"""
+
+import pytest
+
+
+def test_ingest_pipeline_parallel_matches_serial(tmp_path):
+    """Process-pool scan + batched meta writer builds the same overlay as a serial pass."""
+    from invariant_sdk.cli import compute_ctx_hash, tokenize_with_positions
+    from invariant_sdk.halo import hash8_hex
+    from invariant_sdk.ingest import IngestWriter, iter_scanned, word_phase
+    from invariant_sdk.overlay import OverlayEdge, OverlayGraph
+
+    docs = {}
+    for i in range(12):
+        words = [f"w{(i * 7 + j * 3) % 260}" for j in range(300)]
+        docs[f"d{i}.txt"] = "\n".join(" ".join(words[k:k + 9]) for k in range(0, len(words), 9))
+    docs["short.txt"] = "lonely"
+    for name, text in docs.items():
+        (tmp_path / name).write_text(text, encoding="utf-8")
+    items = [(str(tmp_path / name), name) for name in sorted(docs)]
+
+    def meta(h8):
+        degree = int(h8[:2], 16)
+        return {"exists": degree % 5 != 0, "meta": {"degree_total": degree}}
+
+    calls = []
+
+    def fetch_meta(chunk):
+        calls.append(len(chunk))
+        return {h8: meta(h8) for h8 in chunk}
+
+    # Reference: the original per-file build (first 200 unique words classified).
+    expected = OverlayGraph()
+    for _path, name in items:
+        toks = tokenize_with_positions(docs[name])
+        if len(toks) < 2:
+            continue
+        unique = list(dict.fromkeys(w for w, _, _, _ in toks))[:200]
+        phases = {w: word_phase(meta(hash8_hex(f"Ġ{w}")), 0.3) for w in unique}
+        for j in range(len(toks) - 1):
+            src, tgt = toks[j][0], toks[j + 1][0]
+            sp, tp = phases.get(src, "gas"), phases.get(tgt, "gas")
+            if sp == "gas" and tp == "gas":
+                continue
+            sh, th = hash8_hex(f"Ġ{src}"), hash8_hex(f"Ġ{tgt}")
+            expected.add_edge(sh, th, doc=name, ring="sigma", phase=tp, line=toks[j + 1][1],
+                              ctx_hash=compute_ctx_hash(toks, j + 1), witness=OverlayEdge.ADJACENT)
+            expected.define_label(sh, src)
+            expected.define_label(th, tgt)
+
+    def snapshot(graph):
+        return sorted(
+            (src, e.tgt, e.doc, e.line, e.ctx_hash, e.phase, e.witness)
+            for src, lst in graph.edges.items() for e in lst
+        ), graph.labels
+
+    for workers in (1, 2):
+        graph = OverlayGraph()
+        writer = IngestWriter(graph, fetch_meta=fetch_meta, mean_mass=0.3, meta_chunk=150, max_buffered=4)
+        for scanned in iter_scanned(iter(items), workers=workers, window=3):
+            writer.add(scanned)
+        writer.flush()
+        assert snapshot(graph) == snapshot(expected)
+        assert writer.report.docs == 12 and writer.report.edges == expected.n_edges
+        assert writer.report.meta_requests > 1 and max(calls) <= 150
+        # Each hash8 is fetched at most once per run.
+        assert writer.report.meta_hashes == sum(calls) <= 260
+        calls.clear()
+
+    # Re-ingest replaces instead of accumulating.
+    writer = IngestWriter(expected, fetch_meta=fetch_meta, mean_mass=0.3)
+    for scanned in iter_scanned(items[:1]):
+        writer.add(scanned)
+    writer.flush()
+    assert writer.report.replaced_edges == writer.report.edges
+    assert snapshot(expected) == snapshot(graph)
+
+
+def test_ingest_manifest_skips_unchanged_and_drops_vanished(tmp_path):
+    """Digest manifest: touch → skipped, edit → changed, delete → σ-edges removed."""
+    import os
+
+    from invariant_sdk.ingest import IngestManifest, IngestWriter, iter_scanned, manifest_path
+    from invariant_sdk.operators import build_window_stats
+    from invariant_sdk.overlay import OverlayGraph
+
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(3):
+        (src / f"f{i}.txt").write_text(f"alpha beta gamma{i} delta\nepsilon zeta{i}\n", encoding="utf-8")
+    store = manifest_path(tmp_path / "overlay.jsonl")
+    assert store.name == "overlay.manifest.json"
+
+    def ingest(graph, stats, manifest):
+        writer = IngestWriter(graph, fetch_meta=lambda chunk: {}, mean_mass=0.3, stats=stats,
+                              manifest=manifest, root=str(src))
+        seen = []
+        for path in sorted(src.iterdir()):
+            seen.append(path.name)
+            entry = manifest.current(path.name, str(src))
+            if entry is not None and IngestManifest.stat_matches(entry, path.stat()):
+                writer.report.skipped += 1
+                continue
+            item = (str(path), path.name) + ((entry.digest,) if entry else ())
+            for scanned in iter_scanned([item]):
+                writer.add(scanned)
+        writer.flush()
+        writer.remove_missing(seen)
+        manifest.save(store)
+        return writer.report
+
+    graph = OverlayGraph()
+    stats = build_window_stats(graph)
+    first = ingest(graph, stats, IngestManifest())
+    assert (first.added, first.changed, first.removed, first.skipped) == (3, 0, 0, 0)
+    manifest = IngestManifest.load(store)
+    assert manifest.docs["f1.txt"].edges == sum(1 for lst in graph.edges.values() for e in lst if e.doc == "f1.txt")
+
+    noop = ingest(graph, stats, manifest)
+    assert (noop.added, noop.changed, noop.removed, noop.skipped, noop.meta_requests) == (0, 0, 0, 3, 0)
+
+    st = (src / "f0.txt").stat()
+    os.utime(src / "f0.txt", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    (src / "f1.txt").write_text("alpha omega\n", encoding="utf-8")
+    (src / "f2.txt").unlink()
+    (src / "f3.txt").write_text("new file words\n", encoding="utf-8")
+    report = ingest(graph, stats, IngestManifest.load(store))
+    assert (report.added, report.changed, report.removed, report.skipped) == (1, 1, 1, 1)
+
+    docs = {e.doc for lst in graph.edges.values() for e in lst}
+    assert docs == {"f0.txt", "f1.txt", "f3.txt"}
+    assert set(IngestManifest.load(store).docs) == docs
+    fresh = build_window_stats(graph)
+    assert stats.token_df == fresh.token_df and stats.n_windows == fresh.n_windows
+
+
+def test_ingest_engine_anchor_policies_match_front_end_rules(tmp_path):
+    """HUB_ANCHORS (MCP) and CONDENSED_ANCHORS (UI) chain the same anchors as the inline builds did."""
+    import math
+    import random
+
+    from invariant_sdk.halo import hash8_hex
+    from invariant_sdk.ingest import (
+        CONDENSED_ANCHORS,
+        HUB_ANCHORS,
+        IngestWriter,
+        compute_ctx_hash,
+        ingest_path,
+        scan_text,
+    )
+    from invariant_sdk.overlay import OverlayGraph
+    from invariant_sdk.tokenize import tokenize_with_lines
+
+    def meta(h8):
+        degree = int(h8[:3], 16) % 900
+        return {"exists": int(h8[3], 16) % 4 != 0, "meta": {"degree_total": degree}}
+
+    def reference(text, doc, policy, mean_mass, n_labels):
+        tokens = tokenize_with_lines(text)
+        unique = list(dict.fromkeys(w for w, _ in tokens))
+        cands = []
+        for w in unique:
+            h8 = hash8_hex(f"Ġ{w}")
+            res = meta(h8)
+            if not res["exists"]:
+                cands.append((w, h8, 1.0, 0, False))
+                continue
+            deg = res["meta"]["degree_total"]
+            cands.append((w, h8, 1.0 / math.log(2 + deg) if deg > 0 else 0.0, deg, True))
+        limit = math.sqrt(max(1, n_labels))
+        if policy == HUB_ANCHORS:
+            solid = {w for (w, _h, _m, deg, ex) in cands if not ex or deg <= limit}
+        else:
+            solid = {w for (w, _h, m, _d, _e) in cands if m > mean_mass}
+            counts = {w: sum(1 for t, _ in tokens if t == w) for w in unique}
+            tf_mean = sum(counts.values()) / len(counts)
+            by_word = {w: (deg, ex) for (w, _h, _m, deg, ex) in cands}
+            solid |= {w for w, c in counts.items() if c > tf_mean and (not by_word[w][1] or by_word[w][0] <= limit)}
+        if len(solid) < 2:
+            solid = {w for (w, *_rest) in sorted(cands, key=lambda x: x[2], reverse=True)[:64]}
+        occ = [(w, line, compute_ctx_hash(tokens, i)) for i, (w, line) in enumerate(tokens) if w in solid]
+        return sorted(
+            (hash8_hex(f"Ġ{a[0]}"), hash8_hex(f"Ġ{b[0]}"), doc, b[1], b[2], "solid")
+            for a, b in zip(occ, occ[1:])
+        )
+
+    def edges(graph):
+        return sorted(
+            (src, e.tgt, e.doc, e.line, e.ctx_hash, e.phase)
+            for src, lst in graph.edges.items() for e in lst
+        )
+
+    rng = random.Random(43)
+    vocab = [f"term{i}" for i in range(80)]
+    docs = {}
+    for i in range(4):
+        lines = [" ".join(rng.choice(vocab[: 10 + i * 20]) for _ in range(8)) for _ in range(12)]
+        docs[f"doc{i}.md"] = "\n".join(lines)
+        (tmp_path / f"doc{i}.md").write_text(docs[f"doc{i}.md"], encoding="utf-8")
+
+    fetch = lambda chunk: {h8: meta(h8) for h8 in chunk}
+    for policy, n_labels in ((HUB_ANCHORS, 150000), (CONDENSED_ANCHORS, 1)):
+        graph = OverlayGraph()
+        writer = IngestWriter(graph, fetch_meta=fetch, mean_mass=0.2, policy=policy, n_labels=n_labels)
+        report = ingest_path(tmp_path, writer)
+        expected = sorted(e for name, text in docs.items() for e in reference(text, name, policy, 0.2, n_labels))
+        assert edges(graph) == expected
+        assert report.docs == 4 and report.meta_requests == 1
+        assert set(report.timings.as_dict()) == {"discover", "read", "tokenize", "meta", "edges", "save"}
+
+        # In-memory docs (UI upload / reindex) replace the same doc's edges.
+        writer = IngestWriter(graph, fetch_meta=fetch, mean_mass=0.2, policy=policy, n_labels=n_labels)
+        writer.add(scan_text(docs["doc1.md"], "doc1.md", max_words=writer.scan_max_words, policy=policy))
+        writer.flush()
+        assert writer.report.replaced_edges == writer.report.edges
+        assert edges(graph) == expected
+
+
+def test_ctx_hash_index_matches_per_window_hashing():
+    """One-buffer window hashes equal compute_ctx_hash; line lookups touch only that line."""
+    import random
+
+    from invariant_sdk.ingest import CtxHashIndex, compute_ctx_hash
+
+    rng = random.Random(44)
+    vocab = ["alpha", "Beta", "straße", "İstanbul", "x1", "gamma_delta"]
+    tokens = [(rng.choice(vocab), 1 + i // 5) for i in range(203)]
+    for k in (0, 1, 2, 3):
+        index = CtxHashIndex(tokens, k=k)
+        expected = [compute_ctx_hash(tokens, i, k=k) for i in range(len(tokens))]
+        assert list(index.hashes()) == expected
+        assert [index.hash_at(i) for i in range(len(tokens))] == expected
+    index = CtxHashIndex(tokens)
+    for line in (1, 7, 41, 999):
+        want = [(compute_ctx_hash(tokens, i), w) for i, (w, ln) in enumerate(tokens) if ln == line]
+        assert index.hashes_at_line(line) == want
+    assert index.line_range(41) == (200, 203) and index.line_range(999) == (0, 0)
+    assert list(CtxHashIndex([]).hashes()) == []
+
+
+def test_discovery_prunes_ignored_dirs_and_honours_nested_gitignore(tmp_path):
+    """Ignored dirs are never entered; deeper .gitignore files override shallower ones."""
+    pytest.importorskip("pathspec")
+    from invariant_sdk.ingest import DiscoveryStats, iter_files, iter_text_files
+
+    def touch(rel, data=b"text\n"):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    for rel in ("node_modules/pkg/index.js", ".git/HEAD", ".venv/lib/site.py", "build_out/gen.py"):
+        touch(rel)
+    touch(".gitignore", b"*.log\nbuild_out/\n")
+    touch("sub/.gitignore", b"!keep.log\nscratch/\n")
+    for rel in ("a.md", "run.log", "sub/keep.log", "sub/drop.log", "sub/scratch/x.md", "sub/b.txt"):
+        touch(rel)
+    touch("sub/blob.bin", b"\xff\xfe\x00binary")
+
+    stats = DiscoveryStats()
+    found = [p.relative_to(tmp_path).as_posix() for p in iter_files(tmp_path, stats=stats)]
+    assert found == [".gitignore", "a.md", "sub/.gitignore", "sub/b.txt", "sub/blob.bin", "sub/keep.log"]
+    assert stats.pruned_dirs == 5 and stats.ignored_files == 2 and stats.files == 6
+
+    files = list(iter_files(tmp_path))
+    serial = list(iter_text_files(files, workers=1))
+    assert list(iter_text_files(files, workers=4, window=2)) == serial
+    assert tmp_path / "sub" / "blob.bin" not in serial and len(serial) == 5
+    assert list(iter_files(tmp_path / "a.md")) == [tmp_path / "a.md"]
+
+
+def test_streaming_tokenizer_matches_whole_text_across_chunk_boundaries(tmp_path):
+    """Chunked reads split "\\r\\n" and UTF-8 sequences; tokens, edges and digest do not change."""
+    import io
+    import random
+
+    from invariant_sdk.ingest import ADJACENT, HUB_ANCHORS, compute_ctx_hash, content_digest, scan_document
+    from invariant_sdk.tokenize import (
+        iter_binary_lines,
+        tokenize_with_lines,
+        tokenize_with_positions,
+    )
+
+    rng = random.Random(46)
+    vocab = ["Straße", "naïve", "FERC123", "1/5/2001", "December", "log_entry", "ok", "日本語"]
+    text = "".join(
+        " ".join(rng.choice(vocab) for _ in range(rng.randint(0, 6))) + rng.choice(["\n", "\r\n", "\r"])
+        for _ in range(60)
+    ) + "tail without newline"
+    data = text.encode("utf-8")
+    path = tmp_path / "big.log"
+    path.write_bytes(data)
+    expected_lines = path.read_text(encoding="utf-8").split("\n")
+
+    for chunk in (1, 2, 3, 7, 64, 1 << 20):
+        assert list(iter_binary_lines(io.BytesIO(data), chunk_size=chunk)) == expected_lines
+    assert list(iter_binary_lines(io.BytesIO(b""))) == [""]
+    assert list(iter_binary_lines(io.BytesIO(b"a\r"), chunk_size=1)) == ["a", ""]
+    with pytest.raises(UnicodeDecodeError):
+        list(iter_binary_lines(io.BytesIO(b"ok\n\xff\xfe"), chunk_size=2))
+
+    whole = "\n".join(expected_lines)
+    tokens = tokenize_with_lines(whole)
+    assert [t[:2] for t in tokenize_with_positions(whole)] == tokens
+    for chunk in (3, 1 << 20):
+        adjacent = scan_document(str(path), "big.log", max_words=5, policy=ADJACENT, chunk_size=chunk)
+        assert adjacent.digest == content_digest(data)
+        words = adjacent.words
+        ref = []
+        for j in range(1, len(tokens)):
+            s, t = words.index(tokens[j - 1][0]), words.index(tokens[j][0])
+            if s < 5 or t < 5:
+                ref.append((s, t, tokens[j][1], compute_ctx_hash(tokens, j)))
+        assert adjacent.edges == ref
+
+        anchors = scan_document(str(path), "big.log", max_words=None, policy=HUB_ANCHORS, chunk_size=chunk)
+        assert [words[i] for i in anchors.seq] == [w for w, _ in tokens]
+        assert list(anchors.lines) == [ln for _, ln in tokens]
+    assert scan_document(str(path), "big.log", known_digest=content_digest(data), chunk_size=5).unchanged
+
+
+def test_cli_update_noop_does_not_rewrite_overlay(tmp_path, monkeypatch, capsys):
+    """`inv ingest --update` with nothing added/changed/removed only refreshes the manifest; only meta failures are caught."""
+    import argparse
+    import os
+
+    from invariant_sdk import cli
+    from invariant_sdk.ingest import IngestManifest, IngestWriter, manifest_path
+    from invariant_sdk.operators import window_stats_path
+
+    class Client:
+        def get_halo_pages(self, chunk, limit=0):
+            return {h8: {"exists": True, "meta": {"degree_total": int(h8[:2], 16)}} for h8 in chunk}
+
+    class Physics:
+        crystal_id = "test"
+        mean_mass = 0.3
+
+        def __init__(self, server, auto_discover_overlay=False):
+            self._client = Client()
+
+    monkeypatch.setattr(cli, "HaloPhysics", Physics)
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(3):
+        (src / f"f{i}.txt").write_text(f"alpha beta gamma{i} delta\nepsilon zeta{i}\n", encoding="utf-8")
+    output = tmp_path / "overlay.jsonl"
+    args = argparse.Namespace(path=str(src), output=str(output), update=True, workers=1, server=None)
+
+    assert cli.cmd_ingest(args) == 0
+    written = [output, output.with_suffix(".pkl"), window_stats_path(output)]
+    before = [(p.stat().st_mtime_ns, p.read_bytes()) for p in written]
+
+    st = (src / "f0.txt").stat()
+    os.utime(src / "f0.txt", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))  # touch only
+    capsys.readouterr()
+    assert cli.cmd_ingest(args) == 0
+    assert "Overlay unchanged" in capsys.readouterr().out
+    assert [(p.stat().st_mtime_ns, p.read_bytes()) for p in written] == before
+    entry = IngestManifest.load(manifest_path(output)).docs["f0.txt"]
+    assert entry.mtime_ns == st.st_mtime_ns + 10**9  # manifest refreshed
+
+    (src / "f1.txt").write_text("alpha omega\n", encoding="utf-8")
+    assert cli.cmd_ingest(args) == 0
+    assert output.read_bytes() != before[0][1]
+
+    # Crystal failures are reported; anything else keeps its traceback
+    (src / "f2.txt").write_text("brand new words\n", encoding="utf-8")
+    with monkeypatch.context() as m:
+        m.setattr(Client, "get_halo_pages", lambda self, chunk, limit=0: 1 / 0)
+        assert cli.cmd_ingest(args) == 1
+    assert "crystal server batch failed: division by zero" in capsys.readouterr().out
+    with monkeypatch.context() as m:
+        m.setattr(IngestWriter, "add", lambda self, scanned: {}[scanned.doc])  # a writer bug
+        with pytest.raises(KeyError):
+            cli.cmd_ingest(args)
+
+
+def test_mcp_ingest_failure_leaves_published_overlay_untouched(tmp_path, mcp_env, halo_stub, monkeypatch):
+    """MCP ingest writes into a copy: a run that fails partway neither mutates nor saves _overlay."""
+    import json
+
+    from invariant_sdk import ingest, mcp_server
+    from invariant_sdk.overlay import OverlayGraph
+
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(3):
+        (src / f"f{i}.txt").write_text(f"alpha beta gamma{i} delta\nepsilon zeta{i}\n", encoding="utf-8")
+    overlay = OverlayGraph()
+    overlay.add_edge("0000000a", "0000000b", doc=str(src / "f0.txt"), line=1)
+    mcp_env(overlay, halo_stub())
+    overlay_path = tmp_path / "overlay.jsonl"
+    monkeypatch.setattr(mcp_server, "_overlay_path", overlay_path)
+
+    write = ingest.IngestWriter._write
+    seen = []
+
+    def crash_on_second_doc(self, scanned):
+        seen.append(scanned.doc)
+        if len(seen) == 2:
+            raise KeyError("writer bug")
+        return write(self, scanned)
+
+    def halo_down(chunk, limit=500):
+        raise OSError("connection refused")
+
+    # A crystal failure is reported; a bug propagates with its traceback
+    with monkeypatch.context() as m:
+        m.setattr(mcp_server._physics._client, "get_halo_pages", halo_down, raising=False)
+        out = json.loads(mcp_server.ingest(str(src)))
+    assert out["error"] == "Crystal server error: connection refused"
+    with monkeypatch.context() as m:
+        m.setattr(ingest.IngestWriter, "_write", crash_on_second_doc)
+        with pytest.raises(KeyError):
+            mcp_server.ingest(str(src))
+    assert mcp_server._overlay is overlay and overlay.n_edges == 1
+    assert set(overlay.doc_to_nodes) == {str(src / "f0.txt")}
+    assert not overlay_path.exists()
+
+    out = json.loads(mcp_server.ingest(str(src)))
+    assert out["success"] and out["total_files"] == 3
+    assert mcp_server._overlay is not overlay and overlay.n_edges == 1
+    assert len(mcp_server._overlay.doc_to_nodes) == 3 and overlay_path.exists()
@@ -0,0 +1,107 @@
+"""
+test_labelindex.py — Label search index (find_nodes, search_concept)
+"""
+
+
+def test_label_index_ranks_like_scan_and_serves_zero_start_crystal(tmp_path, mcp_env, halo_stub):
+    """Exact > prefix > contains as the old scans; Zero-Start crystals find labels; search_concept unchanged."""
+    import json
+    import random
+
+    from invariant_sdk import mcp_server
+    from invariant_sdk.crystal import BinaryCrystal, CrystalGraph
+    from invariant_sdk.halo import hash8_hex
+    from invariant_sdk.labelindex import LabelIndex
+    from invariant_sdk.merkle import get_token_hash16_hex
+    from invariant_sdk.overlay import OverlayGraph
+
+    def scan(items, q, limit):
+        exact = [h for label, h in items if label == q]
+        prefix = [h for label, h in items if label != q and label.startswith(q)]
+        contains = [h for label, h in items if q in label and not label.startswith(q)]
+        return (exact + prefix + contains)[:limit]
+
+    rng = random.Random(49)
+    words = ["".join(rng.choice("abcd") for _ in range(rng.randint(1, 6))) for _ in range(300)]
+    items = list(dict.fromkeys(words).items())
+    index = LabelIndex(items)
+    for q in ("a", "ab", "abc", "dab", "cccc", "z"):
+        for limit in (1, 3, 50):
+            assert index.find(q, limit) == scan(items, q, limit)
+
+    tank = tmp_path / "t.tank"
+    labels = {f"h{i}": f"Ġ{w}" for i, w in enumerate(words[:60])}
+    tank.write_text(json.dumps({"edges": [], "labels": labels}), encoding="utf-8")
+    graph = CrystalGraph(tank)
+    assert graph.find_nodes("AB ", 8) == scan(list(graph.label_to_hash.items()), "ab", 8)
+
+    (tmp_path / "q.crystal").write_bytes(b"CRYS")
+
+    def zero_start(tokens):
+        crystal = BinaryCrystal.__new__(BinaryCrystal)
+        crystal.path = tmp_path / "q.crystal"
+        crystal.label_index_path = crystal.path.with_suffix(".labels.idx")
+        crystal._label_index = None
+        crystal._use_vocab_index = True
+        crystal.n_labels = 4
+        crystal.label_to_hash = {}
+        crystal.idx_to_token = tokens
+        return crystal
+
+    crystal = zero_start({0: "Ġdealer", 1: "Ġdeal", 2: "ideal", 3: "Ġdelta"})
+    want = [get_token_hash16_hex(t) for t in ("Ġdeal", "Ġdealer", "ideal")]
+    assert crystal.find_nodes("Deal") == want
+    assert crystal.label_index_path.exists()
+    assert zero_start({}).find_nodes("deal") == want  # loaded from disk, vocab not re-walked
+
+    overlay = OverlayGraph()
+    for i in range(300):
+        src, tgt = rng.choice(words), rng.choice(words)
+        for w in (src, tgt):
+            overlay.define_label(hash8_hex(f"Ġ{w}"), w.upper())
+        overlay.add_edge(hash8_hex(f"Ġ{src}"), hash8_hex(f"Ġ{tgt}"), doc=f"{i % 7}.md", line=i)
+    mcp_env(overlay, halo_stub())
+    for concept, limit in (("Ab", 20), ("dd", 500), ("cab", 5), ("zz", 20)):
+        expected = []
+        for src, edges in overlay.edges.items():
+            for edge in edges:
+                src_label = overlay.get_label(src) or ""
+                tgt_label = overlay.get_label(edge.tgt) or ""
+                if concept.lower() in src_label.lower() or concept.lower() in tgt_label.lower():
+                    expected.append((edge.doc, edge.line, src_label, tgt_label))
+                if len(expected) >= limit:
+                    break
+            if len(expected) >= limit:
+                break
+        out = json.loads(mcp_server.search_concept(concept, limit))
+        got = [(o["doc"], o["line"], o["src"], o["tgt"]) for occ in out["by_document"].values() for o in occ]
+        assert sorted(got, key=lambda o: o[1]) == sorted(expected, key=lambda o: o[1])
+        assert out["total_occurrences"] == len(expected)
+
+    # Same edge and label counts after a re-label: the cached indexes still follow
+    node = next(iter(overlay.edges))
+    overlay.define_label(node, "QQQQ")
+    out = json.loads(mcp_server.search_concept("qqqq", 500))
+    assert out["total_occurrences"] == sum(
+        1 for src, edges in overlay.edges.items() for e in edges if node in (src, e.tgt)
+    ) > 0
+
+
+def test_ui_overlay_index_follows_same_size_rewrites(ui_env, halo_stub):
+    """UIHandler's overlay index is keyed on overlay.version, not (id, edge count, label count)."""
+    from invariant_sdk.overlay import OverlayGraph
+
+    overlay = OverlayGraph()
+    overlay.define_label("0000000a", "alpha")
+    overlay.define_label("0000000b", "beta")
+    overlay.add_edge("0000000a", "0000000b", doc="a.md", line=1)
+    handler = ui_env(overlay, halo_stub())
+
+    index = handler._get_overlay_index()
+    assert handler._get_overlay_index() is index
+    overlay.delete_doc("a.md")
+    overlay.add_edge("0000000b", "0000000a", doc="b.md", line=2)  # same edge count
+    assert handler._get_overlay_index() is not index
+    index = handler._get_overlay_index()
+    overlay.define_label("0000000a", "gamma")  # same label count
+    assert handler._get_overlay_index() is not index
@@ -0,0 +1,105 @@
+"""
+test_mcp_prove.py — MCP path proving (prove_path / prove_paths_batch) against a Halo stub
+"""
+
+
+def test_prove_paths_batch_shares_frontiers(mcp_env, halo_stub):
+    """Batch proving equals per-pair prove_path and fetches Halo once per hop."""
+    import json
+
+    from invariant_sdk import mcp_server
+    from invariant_sdk.halo import hash8_hex
+    from invariant_sdk.overlay import OverlayGraph
+
+    h = {w: hash8_hex(f"Ġ{w}") for w in ["user", "auth", "token", "db", "cache", "coffee"]}
+    client = halo_stub({h["auth"]: [h["token"]], h["token"]: [h["cache"]]})
+
+    overlay = OverlayGraph()
+    overlay.add_edge(h["user"], h["auth"], doc="a.md", line=3)
+    overlay.add_edge(h["auth"], h["db"], doc="a.md", line=4)
+    for word, node in h.items():
+        overlay.define_label(node, word)
+    mcp_env(overlay, client)
+
+    pairs = [["user", "db"], ["user", "cache"], ["user", "coffee"], ["auth", "token"], ["db"]]
+    out = json.loads(mcp_server.prove_paths_batch(pairs))
+    assert out["proven"] == 3 and "error" in out["results"][-1]
+    assert client.calls <= len(out["stats"]["hops"]) == 4
+    for pair, result in zip(pairs[:4], out["results"]):
+        single = json.loads(mcp_server.prove_path(*pair, max_hops=4))
+        assert (result["exists"], result["ring"], result["path"]) == (
+            single["exists"], single["ring"], single["path"]
+        )
+
+
+def test_prove_path_meets_in_the_middle_and_caps_frontier(mcp_env, halo_stub, monkeypatch):
+    """Bidirectional prove_path stops early; max_frontier bounds each hop and a capped miss is inconclusive."""
+    import json
+
+    from invariant_sdk import mcp_server
+    from invariant_sdk.halo import hash8_hex
+    from invariant_sdk.overlay import OverlayGraph
+
+    words = ["a", "b", "c", "d", "e"]
+    h = {w: hash8_hex(f"Ġ{w}") for w in words}
+    overlay = OverlayGraph()
+    for x, y in zip(words, words[1:]):  # a → b → c → d → e
+        overlay.add_edge(h[x], h[y], doc="chain.md", line=1)
+    for i in range(10):  # wide fan-out from a
+        overlay.add_edge(h["a"], hash8_hex(f"Ġfan{i}"), doc="fan.md", line=1)
+    h["z"] = hash8_hex("Ġz")
+    overlay.add_edge(hash8_hex("Ġfan9"), h["z"], doc="fan.md", line=2)  # behind the last fan node
+    for word, node in h.items():
+        overlay.define_label(node, word)
+
+    mcp_env(overlay, halo_stub())
+
+    forward = json.loads(mcp_server.prove_path("a", "e", max_hops=4))
+    both = json.loads(mcp_server.prove_path("a", "e", max_hops=4, bidirectional=True))
+    assert forward["path"] == both["path"] == words
+    assert both["ring"] == "sigma" and both["provenance"] == "chain.md:1"
+    assert len(both["stats"]["hops"]) < len(forward["stats"]["hops"]) == 4
+    assert all(hop["http_requests"] <= 1 for hop in forward["stats"]["hops"])
+
+    capped = json.loads(mcp_server.prove_path("a", "e", max_hops=4, max_frontier=3))
+    assert capped["stats"]["hops"][0]["dropped"] == 8
+    assert capped["exists"] is True and "truncated" not in capped
+    missed = json.loads(mcp_server.prove_path("a", "e", max_hops=3))
+    assert missed["exists"] is False and "truncated" not in missed
+
+    # A miss after the cap dropped nodes is not a disproof
+    assert json.loads(mcp_server.prove_path("a", "z", max_hops=2))["exists"] is True
+    cut = json.loads(mcp_server.prove_path("a", "z", max_hops=2, max_frontier=3))
+    assert cut["exists"] is None and cut["truncated"] is True
+    assert "inconclusive" in cut["message"]
+
+    monkeypatch.setattr(mcp_server, "_PROVE_MAX_FRONTIER", 3)
+    batch = json.loads(mcp_server.prove_paths_batch([["a", "z"], ["a", "b"]], max_hops=2))
+    assert [r["exists"] for r in batch["results"]] == [None, True]
+    assert batch["results"][0]["truncated"] is True and batch["truncated"] == 1
+
+
+def test_halo_outage_is_not_cached_as_missing_neighbors(mcp_env, halo_stub):
+    """A failed Halo batch leaves memory and disk caches empty; the path is found once it recovers."""
+    import json
+
+    from invariant_sdk import mcp_server
+    from invariant_sdk.halo import hash8_hex
+    from invariant_sdk.overlay import OverlayGraph
+
+    h = {w: hash8_hex(f"Ġ{w}") for w in ["alpha", "beta"]}
+    overlay = OverlayGraph()
+    for word, node in h.items():
+        overlay.define_label(node, word)
+    client = halo_stub({h["alpha"]: [h["beta"]]})
+    disk = mcp_env(overlay, client)
+
+    client.down = 1
+    assert not json.loads(mcp_server.prove_path("alpha", "beta"))["exists"]
+    assert mcp_server._halo_neighbors_cache == {} and disk.store == {}
+
+    assert json.loads(mcp_server.prove_path("alpha", "beta"))["exists"]
+    mcp_server._halo_neighbors_cache.clear()  # restart: disk cache must hold the real answer
+    calls = client.calls
+    assert json.loads(mcp_server.prove_path("alpha", "beta"))["exists"]
+    assert client.calls == calls
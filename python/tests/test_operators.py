@@ -0,0 +1,283 @@
+"""
+test_operators.py — σ-operators: anchor relocation, window stats, matched nulls, GATE
+"""
+
+import pytest
+
+
+def test_reread_context_windows_relocates_in_one_pass(tmp_path):
+    """Batch relocation agrees with the single-anchor protocol after lines drift."""
+    from invariant_sdk.overlay import OverlayEdge
+    from invariant_sdk.operators import (
+        compute_ctx_hash,
+        read_context_window,
+        reread_context_window,
+        reread_context_windows,
+    )
+
+    lines = [f"line {i} token{i % 7}, value!" for i in range(1, 41)]
+    doc = tmp_path / "doc.txt"
+    doc.write_text("\n".join(lines), encoding="utf-8")
+    anchors = [(ln, compute_ctx_hash(read_context_window(doc, ln))) for ln in (3, 20, 38)]
+
+    doc.write_text("\n".join(["inserted", "lines", ""] + lines), encoding="utf-8")
+    anchors.append((5, "00000000"))
+
+    batch = reread_context_windows("doc.txt", anchors, base_path=tmp_path)
+    single = [reread_context_window("doc.txt", ln, h, base_path=tmp_path) for ln, h in anchors]
+    assert batch == single
+    assert [(line, state) for _c, line, state in batch[:3]] == [
+        (6, OverlayEdge.RELOCATED),
+        (23, OverlayEdge.RELOCATED),
+        (41, OverlayEdge.RELOCATED),
+    ]
+    assert batch[3] == (None, 5, OverlayEdge.DECOHERENT)
+
+
+def test_sweep_anchor_integrity_updates_changed_edges(tmp_path):
+    """Bulk sweep classifies ingest-style anchors and relocates drifted lines in place."""
+    from invariant_sdk.cli import compute_ctx_hash, tokenize_with_positions
+    from invariant_sdk.overlay import OverlayEdge, OverlayGraph
+    from invariant_sdk.operators import sweep_anchor_integrity
+
+    text = "\n".join(f"alpha{i} beta{i} gamma{i}" for i in range(30))
+    (tmp_path / "a.txt").write_text(text, encoding="utf-8")
+    (tmp_path / "gone.txt").write_text(text, encoding="utf-8")
+
+    overlay = OverlayGraph()
+    for doc in ("a.txt", "gone.txt"):
+        toks = tokenize_with_positions(text)
+        for j in range(len(toks) - 1):
+            overlay.add_edge(
+                toks[j][0], toks[j + 1][0], doc=doc, line=toks[j + 1][1],
+                ctx_hash=compute_ctx_hash(toks, j + 1),
+            )
+
+    (tmp_path / "a.txt").write_text("inserted header\n\n" + text, encoding="utf-8")
+    (tmp_path / "gone.txt").unlink()
+
+    report = sweep_anchor_integrity(overlay, tmp_path)
+    assert report.n_docs == 2
+    assert report.n_edges == report.coherent + report.relocated + report.decoherent
+    edges = [e for lst in overlay.edges.values() for e in lst]
+    moved = [e for e in edges if e.doc == "a.txt" and e.line > 3]
+    assert moved and all(e.anchor_state == OverlayEdge.RELOCATED for e in moved)
+    assert all(e.anchor_state == OverlayEdge.DECOHERENT for e in edges if e.doc == "gone.txt")
+
+    # Relocated lines were written back, so a second sweep finds them in place.
+    again = sweep_anchor_integrity(overlay, tmp_path)
+    assert again.relocated == 0
+    assert again.decoherent == report.decoherent
+
+
+def test_matched_null_index_matches_exhaustive_definition():
+    """df-sorted bidirectional lookup returns the exhaustive argmin (ties → min hash8)."""
+    import math
+    import random
+
+    from invariant_sdk.operators import build_window_stats, find_matched_null
+    from invariant_sdk.overlay import OverlayGraph
+
+    rng = random.Random(11)
+    overlay = OverlayGraph()
+    tokens = [f"{i:08x}" for i in range(40)]
+    for _ in range(300):
+        a, b = rng.sample(tokens, 2)
+        overlay.add_edge(a, b, doc=f"d{rng.randint(0, 4)}", line=rng.randint(1, 25))
+    for _ in range(15):
+        overlay.suppressed.add(tuple(rng.sample(tokens, 2)))
+    stats = build_window_stats(overlay)
+
+    def exhaustive(target):
+        connected = {s for s, es in overlay.edges.items() for e in es if e.tgt == target and e.is_provable()}
+        connected |= {e.tgt for e in overlay.edges.get(target, []) if e.is_provable()}
+        log_t = math.log(stats.token_df[target] + 1)
+        eligible = [
+            h for h in stats.token_df
+            if h != target and h not in connected
+            and (target, h) not in overlay.suppressed and (h, target) not in overlay.suppressed
+        ]
+        if not eligible:
+            return None
+        return min(eligible, key=lambda h: (abs(math.log(stats.token_df[h] + 1) - log_t), h))
+
+    for target in stats.token_df:
+        assert find_matched_null(target, stats, overlay) == exhaustive(target)
+    assert find_matched_null("ffffffff", stats, overlay) is None
+
+
+    # The cached index follows every mutation, including same-size ones
+    from pathlib import Path
+
+    from invariant_sdk.operators import matched_null_index, relocate_and_verify
+    from invariant_sdk.overlay import OverlayEdge
+
+    index = matched_null_index(stats, overlay)
+    assert matched_null_index(stats, overlay) is index
+
+    def replace_edge():  # delete + re-add: same edge count, other endpoints
+        doc_edges = [(s, e) for s, es in overlay.edges.items() for e in es if e.doc == "d4"]
+        n_edges = overlay.n_edges
+        overlay.delete_doc("d4")
+        for s, e in doc_edges[1:]:
+            overlay.add_edge(s, e.tgt, doc="d4", line=e.line)
+        overlay.add_edge(tokens[0], tokens[1], doc="d4", line=1)
+        assert overlay.n_edges == n_edges
+
+    def tombstone():
+        edge = next(e for es in overlay.edges.values() for e in es if e.is_provable())
+        edge.live_state = OverlayEdge.DEPLETED
+        overlay.touch()
+
+    def decohere():  # anchor no longer found in its document
+        edge = next(e for es in overlay.edges.values() for e in es if e.is_provable())
+        edge.ctx_hash = "00000000"
+        relocate_and_verify(edge, base_path=Path("/nonexistent"), overlay=overlay)
+        assert edge.anchor_state == OverlayEdge.DECOHERENT
+
+    for mutate in (replace_edge, tombstone, decohere):
+        mutate()
+        assert matched_null_index(stats, overlay) is not index
+        index = matched_null_index(stats, overlay)
+        for target in stats.token_df:
+            assert find_matched_null(target, stats, overlay) == exhaustive(target)
+    assert matched_null_index(stats, overlay.copy()) is not index  # another graph, never a stale hit
+
+
+@pytest.mark.parametrize("prune_gas", [False, True])
+def test_sparse_cooccurrence_matches_window_sets(prune_gas, monkeypatch):
+    """CSR co-occurrence (blocked, optionally Gas-pruned) equals brute-force window counts."""
+    import random
+    from itertools import combinations
+
+    from invariant_sdk import operators
+    from invariant_sdk.operators import build_window_stats, get_cooccur_weight, infer_GATE
+    from invariant_sdk.overlay import OverlayGraph
+
+    monkeypatch.setattr(operators, "_PAIR_BLOCK", 7)  # force many counting blocks
+    rng = random.Random(5)
+    overlay = OverlayGraph()
+    tokens = [f"{i:08x}" for i in range(25)]
+    for _ in range(400):
+        a = tokens[0] if rng.random() < 0.4 else rng.choice(tokens)  # tokens[0] is Gas
+        b = rng.choice([t for t in tokens if t != a])
+        overlay.add_edge(a, b, doc=f"d{rng.randint(0, 3)}", line=rng.randint(1, 20))
+    stats = build_window_stats(overlay, prune_gas=prune_gas)
+    windows = stats.windows
+
+    assert stats.n_windows == len(windows)
+    assert (tokens[0] in {tokens[t] for t in stats.matrix.gas}) is prune_gas
+    for a, b in combinations(tokens, 2):
+        expected = sum(1 for w in windows if a in w and b in w)
+        assert get_cooccur_weight(a, b, stats) == expected == get_cooccur_weight(b, a, stats)
+    assert get_cooccur_weight(tokens[1], tokens[1], stats) == 0
+
+    for a, b, c in [tokens[1:4], tokens[4:7], (tokens[0], tokens[8], tokens[9])]:
+        w_abc = sum(1 for w in windows if a in w and b in w and c in w)
+        assert stats.matrix.count_windows_with(a, b, c) == w_abc
+        expected = sum(1 for w in windows if a in w and b in w) * stats.token_df.get(c, 0) / stats.n_windows
+        gated = w_abc - expected >= 1.0 and stats.token_df.get(c, 0) <= int(stats.n_windows * 0.30)
+        assert (infer_GATE(a, b, c, stats) == operators.InferResult.TRUE) is gated
+
+
+def test_infer_gate_many_matches_single_gate_checks():
+    """Posting-intersection batch GATE equals per-context infer_GATE."""
+    import random
+
+    from invariant_sdk.operators import build_window_stats, infer_GATE, infer_GATE_many
+    from invariant_sdk.overlay import OverlayGraph
+
+    rng = random.Random(9)
+    overlay = OverlayGraph()
+    tokens = [f"{i:08x}" for i in range(30)]
+    for _ in range(600):
+        a, b = rng.sample(tokens[:12] if rng.random() < 0.5 else tokens, 2)
+        overlay.add_edge(a, b, doc=f"d{rng.randint(0, 5)}", line=rng.randint(1, 40))
+    stats = build_window_stats(overlay)
+
+    contexts = tokens + ["missing0"]
+    for src, tgt in [(tokens[0], tokens[1]), (tokens[2], tokens[2]), (tokens[3], "missing1")]:
+        batch = infer_GATE_many(src, tgt, contexts, stats)
+        assert list(batch) == contexts
+        assert batch == {c: infer_GATE(src, tgt, c, stats) for c in contexts}
+        for c in contexts[:10]:
+            expected = sum(1 for w in stats.windows if src in w and tgt in w and c in w)
+            assert stats.matrix.count_windows_with(src, tgt, c) == expected
+
+
+def test_incremental_window_stats_match_full_rebuild(tmp_path, monkeypatch):
+    """add_doc/remove_doc deltas (and the dt_null cache) equal a fresh build."""
+    import random
+
+    from invariant_sdk import operators
+    from invariant_sdk.operators import (
+        build_window_stats,
+        compute_dt_null_cache,
+        load_or_build_window_stats,
+        load_window_stats,
+        window_stats_path,
+    )
+    from invariant_sdk.overlay import OverlayGraph
+
+    monkeypatch.setattr(operators, "_COMPACT_MIN_WINDOWS", 8)  # exercise compaction too
+    rng = random.Random(36)
+    tokens = [f"{i:08x}" for i in range(25)]
+
+    def ingest(overlay, doc, n):
+        for _ in range(n):
+            a, b = rng.sample(tokens, 2)
+            overlay.add_edge(a, b, doc=doc, line=rng.randint(1, 15), witness=rng.choice([0, 1]))
+
+    overlay = OverlayGraph()
+    for d in range(4):
+        ingest(overlay, f"d{d}", 60)
+    stats = build_window_stats(overlay)
+    stats.dt_null_cache(overlay)
+
+    for doc in ["d1", "d3", "d9", "d1"]:
+        stats.remove_doc(doc, overlay)
+        overlay.delete_doc(doc)
+        tokens.append(f"{100 + len(tokens):08x}")  # new vocabulary appears
+        ingest(overlay, doc, rng.randint(0, 60))
+        stats.add_doc(doc, overlay)
+
+        fresh = build_window_stats(overlay)
+        assert stats.token_df == fresh.token_df
+        assert stats.n_windows == fresh.n_windows
+        assert stats.cooccur == fresh.cooccur
+        assert {k: sorted(v) for k, v in stats.dt_distances.items()} == {
+            k: sorted(v) for k, v in fresh.dt_distances.items()
+        }
+        assert dict(stats.dt_null_cache(overlay)) == dict(compute_dt_null_cache(fresh, overlay))
+
+    with pytest.raises(ValueError):
+        stats.add_doc("d1", overlay)
+
+    overlay_path = tmp_path / "overlay.jsonl"
+    path = window_stats_path(overlay_path)
+    assert path.name == "overlay.winstats.pkl"
+    stats.save(path, overlay)
+    assert load_window_stats(path, overlay) is None  # overlay never saved: unstamped
+    overlay.save(overlay_path)
+    stats.save(path, overlay)
+    loaded = load_window_stats(path, overlay)
+    assert loaded is not None and loaded.cooccur == stats.cooccur
+    assert load_window_stats(path, OverlayGraph.load(overlay_path)) is not None
+    overlay_path.with_suffix(".pkl").unlink()  # the JSONL carries the token too
+    assert load_window_stats(path, OverlayGraph.load(overlay_path)) is not None
+    overlay.add_edge(tokens[0], tokens[1], doc="d0", line=99)
+    assert load_window_stats(path, overlay) is None  # overlay changed out of band
+
+    # Same edge and doc counts, different windows (e.g. a relocation sweep)
+    overlay.save(overlay_path)
+    stats = load_or_build_window_stats(overlay_path, overlay)
+    assert load_window_stats(path, overlay).cooccur == stats.cooccur
+    edge = next(e for edges in overlay.edges.values() for e in edges if e.line == 99)
+    edge.line = 98
+    overlay.touch()
+    assert load_window_stats(path, overlay) is None
+    overlay.save(overlay_path)  # a write that did not maintain the stats
+    assert load_window_stats(path, OverlayGraph.load(overlay_path)) is None
+    rebuilt = load_or_build_window_stats(overlay_path, overlay)
+    assert rebuilt.cooccur == build_window_stats(overlay).cooccur
+    assert load_window_stats(path, overlay) is not None
@@ -0,0 +1,40 @@
+"""
+test_overlay.py — OverlayGraph indexes and copies
+"""
+
+
+def test_overlay_label_and_target_indexes_follow_mutations(tmp_path):
+    """lookup_label / is_target stay equal to full scans across edits and reloads."""
+    import random
+
+    from invariant_sdk.overlay import OverlayGraph
+
+    def scan_label(graph, label):
+        needle = label.strip().lower()
+        return next((h for h, l in graph.labels.items() if l and l.strip().lower() == needle), None)
+
+    def scan_target(graph, node):
+        return any(e.tgt == node for edges in graph.edges.values() for e in edges)
+
+    rng = random.Random(40)
+    graph = OverlayGraph()
+    nodes = [f"{i:016x}" for i in range(30)]
+    words = ["Alpha", "beta", " alpha ", "Gamma", "delta"]
+    for _ in range(120):
+        a, b = rng.sample(nodes, 2)
+        graph.add_edge(a, b, doc=rng.choice(["x.md", "y.md"]), line=1)
+        graph.define_label(rng.choice(nodes), rng.choice(words))
+    graph.delete_doc("x.md")
+
+    path = tmp_path / "overlay.jsonl"
+    graph.save(path)
+    reloaded = OverlayGraph.load(path)
+    merged = OverlayGraph()
+    merged.merge(graph)
+
+    for g in (graph, reloaded, merged):
+        for word in words + ["missing"]:
+            assert g.lookup_label(word) == scan_label(g, word)
+        for node in nodes:
+            assert g.is_target(node) == scan_target(g, node)
+            assert g.has_node(node) == (bool(g.edges.get(node)) or scan_target(g, node))
@@ -0,0 +1,37 @@
+"""
+test_pathsearch.py — Overlay path search (forward / bidirectional BFS)
+"""
+
+
+def test_find_path_bidirectional_matches_forward_bfs():
+    """Meet-in-the-middle finds shortest paths like forward BFS, also after delete_doc."""
+    import random
+
+    from invariant_sdk.operators import VerifyResult, verify_path
+    from invariant_sdk.overlay import OverlayGraph
+    from invariant_sdk.pathsearch import find_path
+
+    rng = random.Random(37)
+    overlay = OverlayGraph()
+    nodes = [f"{i:08x}" for i in range(40)]
+    for _ in range(90):
+        a, b = rng.sample(nodes, 2)
+        overlay.add_edge(a, b, doc=rng.choice(["d1", "d2"]), line=1)
+    overlay.delete_doc("d2")
+    assert all(e.doc == "d1" for incoming in overlay.reverse_edges.values() for _s, e in incoming)
+
+    for _ in range(300):
+        src, tgt = rng.sample(nodes, 2)
+        both = find_path(overlay, src, tgt, max_hops=4)
+        fwd = find_path(overlay, src, tgt, max_hops=4, bidirectional=False)
+        assert both.found == fwd.found
+        assert len(both.path) == len(fwd.path) <= 4
+        node = src
+        for edge in both.path:
+            assert edge in overlay.edges[node]
+            node = edge.tgt
+        assert node == (tgt if both.found else src)
+
+    src, tgt = nodes[0], nodes[1]
+    result, path = verify_path(src, tgt, overlay, max_edges=0)
+    assert result == VerifyResult.UNKNOWN and path == []
@@ -884,3 +884,131 @@ def test_intent_sovereignty_partial_direct():
     
     # This is NOT a gate test for == 0, but illustrates the behavior
     # The pair SHOULD be filtered unless its product >= threshold
+
+
+# =============================================================================
+# TOP-K PRUNING: identical results to exhaustive scoring
+# =============================================================================
+
+def _random_overlay(seed: int, n_docs: int = 60, vocab_size: int = 12):
+    import random
+    from invariant_sdk.overlay import OverlayGraph
+    from invariant_sdk.halo import hash8_hex
+
+    rng = random.Random(seed)
+    words = [f"word{i:02d}" for i in range(vocab_size)]
+    hashes = {w: hash8_hex(f"Ġ{w}") for w in words}
+
+    overlay = OverlayGraph()
+    for w, h8 in hashes.items():
+        overlay.define_label(h8, w)
+    for d in range(n_docs):
+        doc = f"doc{d:03d}.txt"
+        for _ in range(rng.randint(1, 25)):
+            a, b = rng.sample(words, 2)
+            line = rng.randint(1, 40)
+            overlay.add_edge(hashes[a], hashes[b], doc=doc, ring="sigma",
+                             line=line, ctx_hash=f"{doc}:{line}")
+    return overlay
+
+
+def test_locate_top_k_matches_exhaustive():
+    """GATE: Top-k early termination returns exactly the exhaustive ranking."""
+    from invariant_sdk.engine import OverlayIndex, locate_files
+
+    for seed in range(5):
+        overlay = _random_overlay(seed)
+        index = OverlayIndex.build(overlay)
+        query = "word00 word03 word07 word11"
+        for k in (1, 3, 10):
+            fast = locate_files(query, overlay=overlay, index=index, max_results=k)
+            full = locate_files(query, overlay=overlay, index=index, max_results=k, exhaustive=True)
+            assert fast["results"] == full["results"]
+            assert len(fast["results"]) == k
+
+
+# =============================================================================
+# DYADIC KERNEL: matrix sweep matches the naive per-window definition
+# =============================================================================
+
+def _naive_windows(events, query):
+    """Reference tiling: (scale, {anchor: max alpha}) per dyadic window."""
+    filtered = [{h: a for h, a in e.items() if h in query and a > 0} for e in events]
+    filtered = [e for e in filtered if e]
+    out = []
+    for s in range(8):
+        size = 2 ** s
+        if size > len(filtered):
+            break
+        for start in range(0, len(filtered), size):
+            anchors = {}
+            for e in filtered[start:start + size]:
+                for h, a in e.items():
+                    anchors[h] = max(anchors.get(h, 0), a)
+            out.append((s, anchors))
+    return out
+
+
+def test_dyadic_profile_matches_naive_reference():
+    """GATE: Kernel energy/peak/coherence equal the pairwise definitions."""
+    import random
+    from invariant_sdk.quantum import binding_threshold, compute_dyadic_profile
+
+    rng = random.Random(7)
+    for _ in range(200):
+        anchors = [f"a{i}" for i in range(rng.randint(2, 8))]
+        alphas = {h: rng.choice([0.1, 0.5, 1.0, 2.0]) for h in anchors}
+        events = [
+            {h: alphas[h] for h in rng.sample(anchors, rng.randint(1, min(3, len(anchors))))}
+            for _ in range(rng.randint(2, 40))
+        ]
+        query = set(anchors)
+        direct = set(anchors[:2])
+        eps = binding_threshold(alphas)
+
+        energy = coherence = 0.0
+        peak = 0.0
+        for s, window in _naive_windows(events, query):
+            items = list(window.items())
+            cross = 0.0
+            for i, (hi, ai) in enumerate(items):
+                for hj, aj in items[i + 1:]:
+                    if (hi in direct and hj in direct) or ai * aj >= eps:
+                        cross += 2 * ai * aj
+            energy += sum(window.values()) ** 2 / 2 ** s
+            coherence += cross / 2 ** s
+            peak = max(peak, sum(a * a for a in window.values()) + cross)
+
+        profile = compute_dyadic_profile(events, query, query_amplitudes=alphas, direct_anchors=direct)
+        assert profile.energy == pytest.approx(energy)
+        assert profile.coherence == pytest.approx(coherence)
+        assert profile.peak == pytest.approx(peak)
+
+
+def test_scoring_tuple_fuses_peak_and_ranking():
+    """GATE: Fused scorer equals peak + ranking tuple computed separately."""
+    from invariant_sdk.quantum import compute_peak_score, compute_ranking_tuple, compute_scoring_tuple
+
+    events = [{"a": 2.0, "b": 0.1}, {"c": 0.1}, {"a": 2.0}, {"b": 0.1, "c": 0.1}]
+    query = {"a", "b", "c"}
+    amplitudes = {"a": 2.0, "b": 0.1, "c": 0.1}
+
+    peak, energy, coherence, min_scale = compute_scoring_tuple(events, query, query_amplitudes=amplitudes)
+
+    assert peak == compute_peak_score(events, query, query_amplitudes=amplitudes)
+    assert (energy, coherence, min_scale) == compute_ranking_tuple(events, query)
+
+
+@pytest.mark.parametrize("use_threads", [True, False])
+def test_locate_parallel_scoring_matches_serial(use_threads):
+    """GATE: Chunked pool scoring merges to the exact serial ranking."""
+    from invariant_sdk.engine import OverlayIndex, locate_files
+
+    overlay = _random_overlay(3, n_docs=300, vocab_size=16)
+    index = OverlayIndex.build(overlay)
+    query = "word01 word04 word09 word13"
+    for k in (0, 5):
+        serial = locate_files(query, overlay=overlay, index=index, max_results=k)
+        parallel = locate_files(query, overlay=overlay, index=index, max_results=k,
+                                workers=2, use_threads=use_threads)
+        assert parallel["results"] == serial["results"]
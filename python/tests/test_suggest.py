@@ -0,0 +1,65 @@
+"""
+test_suggest.py — Autocomplete prefix index and /api/suggest sources
+"""
+
+
+def test_suggest_prefix_index_topk_and_cached_global_sources(ui_env, halo_stub, monkeypatch):
+    """Frequency-weighted top-k equals a full scan; global words come from a vocab index or a cached lookup (failures uncached)."""
+    import random
+
+    from invariant_sdk.halo import hash8_hex
+    from invariant_sdk.overlay import OverlayGraph
+    from invariant_sdk.suggest import PrefixIndex
+    from invariant_sdk.ui_handler import UIHandler
+
+    rng = random.Random(48)
+    entries = [("".join(rng.choice("abc") for _ in range(rng.randint(1, 4))), rng.randint(0, 4)) for _ in range(400)]
+    index = PrefixIndex((key, key.upper(), i, weight) for i, (key, weight) in enumerate(entries))
+    totals = {}
+    for key, weight in entries:
+        totals[key] = totals.get(key, 0) + weight
+    for prefix in ("", "a", "ab", "cab", "z"):
+        want = sorted((k for k in totals if k.startswith(prefix)), key=lambda k: (-totals[k], k))[:7]
+        assert [word.lower() for word, _payload, _w in index.top(prefix, 7)] == want
+
+    overlay = OverlayGraph()
+    for i, (src, tgt) in enumerate([("deal", "dealer"), ("deal", "delta"), ("deal", "dealer"), ("dealt", "x1")]):
+        for word in (src, tgt):
+            overlay.define_label(hash8_hex(f"Ġ{word}"), word)
+        overlay.add_edge(hash8_hex(f"Ġ{src}"), hash8_hex(f"Ġ{tgt}"), doc="d.txt", line=i + 1)
+
+    client = halo_stub({hash8_hex("Ġdea"): ["n1"]}, {"n1": "dealing"})
+
+    class Crystal:
+        n_labels = 4
+        idx_to_token = {0: "Ġdealership", 1: "ing", 2: "Ġdeals", 3: "Ġd"}
+        offsets = [0, 2, 9, 14, 15]
+
+    sent = []
+    handler = UIHandler.__new__(UIHandler)
+    handler.send_json = lambda data, status=200: sent.append(data)
+    ui_env(overlay, client)
+
+    # Halo failures ({} page, all-None labels) are served but never cached
+    client.down = 1
+    handler.api_suggest("q=dea")
+    assert [s["source"] for s in sent.pop()["suggestions"]] == ["local"] * 3
+    with monkeypatch.context() as m:
+        m.setattr(client, "get_labels_batch", lambda hashes: dict.fromkeys(hashes))
+        handler.api_suggest("q=dea")
+    assert [s["word"] for s in sent.pop()["suggestions"] if s["source"] == "global"] == ["dea"]
+    assert UIHandler._global_suggest_cache == {}
+    client.calls = 0
+
+    for _ in range(3):
+        handler.api_suggest("q=dea")
+    local = [s["word"] for s in sent[0]["suggestions"] if s["source"] == "local"]
+    assert local == ["deal", "dealer", "dealt"]  # σ-edge count, then alphabetical
+    assert [s["word"] for s in sent[0]["suggestions"] if s["source"] == "global"] == ["dea", "dealing"]
+    assert client.calls == 2 and sent[0] == sent[2]  # one halo page + one labels batch
+
+    monkeypatch.setattr(UIHandler, "_crystal", Crystal())
+    handler.api_suggest("q=dea")
+    glob = [(s["word"], s["hash8"]) for s in sent[-1]["suggestions"] if s["source"] == "global"]
+    assert glob == [("deals", hash8_hex("Ġdeals")), ("dealership", hash8_hex("Ġdealership"))]
+    assert client.calls == 2
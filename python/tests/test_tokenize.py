@@ -292,5 +292,57 @@ def test_tokenizer_mode_default_is_atomic():
     assert "eric" in tokens or "bass" in tokens
 
 
+# =============================================================================
+# FAST PATH: memoized normalization must not change output
+# =============================================================================
+
+def _reference_simple(text, mode="atomic"):
+    import re
+    pattern = re.compile(r"[A-Za-z0-9_]{2,}" if mode == "identifier" else r"[A-Za-z0-9]{2,}")
+    return [t for t in (_normalize(m.group(0)) for m in pattern.finditer(text)) if t]
+
+
+def _reference_positions(text):
+    from invariant_sdk.tokenize import _TOKEN_RE
+    out, offset = [], 0
+    for line_num, line in enumerate(text.split("\n"), 1):
+        for m in _TOKEN_RE.finditer(line):
+            token = _normalize(m.group(0))
+            if token:
+                out.append((token, line_num, offset + m.start(), offset + m.end()))
+        offset += len(line) + 1
+    return out
+
+
+def test_fast_tokenizer_output_identical_with_small_memo(monkeypatch):
+    """GATE: memoized + batch tokenizers equal per-token _normalize, even as the memo evicts."""
+    import random
+    import sys
+
+    from invariant_sdk import tokenize as tok
+
+    monkeypatch.setattr(tok, "NORMALIZE_CACHE_SIZE", 16)
+    tok._NORM_CACHE.clear()
+    rng = random.Random(47)
+    pieces = ["Deal", "deal", "258505", "01/15/2001", "2001-01-05", "1/5/2001", "FERC123", "EOL-2001",
+              "December", "may", "march", "dec", "get_data_from_server", "#42", "a", "ab", "x_", "--",
+              "v1.2.3", "path/to/file.py", "Straße", "\t", "\n", " "]
+    texts = ["".join(rng.choice(pieces) + rng.choice(" \n_-./") for _ in range(rng.randint(0, 40)))
+             for _ in range(60)]
+
+    for mode in ("atomic", "identifier"):
+        assert tok.tokenize_batch(texts, mode) == [_reference_simple(t, mode) for t in texts]
+        assert [tok.tokenize_simple(t, mode) for t in texts] == [_reference_simple(t, mode) for t in texts]
+    for text in texts:
+        positions = _reference_positions(text)
+        assert tok.tokenize_with_positions(text) == positions
+        assert tok.tokenize_with_lines(text) == [p[:2] for p in positions]
+    assert len(tok._NORM_CACHE) <= 16
+
+    # Repeated spellings come back as one interned object
+    first, second = tok.tokenize_batch(["Deal closes", "DEAL closes"])
+    assert first[0] is second[0] is sys.intern("deal")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
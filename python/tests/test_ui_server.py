@@ -0,0 +1,152 @@
+"""
+test_ui_server.py — Threaded UI server and copy-on-write overlay swaps
+"""
+
+
+def test_threaded_ui_serves_queries_concurrently_and_swaps_overlay(ui_env, halo_stub):
+    """Slow halo lookups overlap under the threaded server; delete swaps in a copy atomically."""
+    import json
+    import threading
+    import urllib.request
+    from concurrent.futures import ThreadPoolExecutor
+
+    from invariant_sdk.halo import hash8_hex
+    from invariant_sdk.overlay import OverlayGraph
+    from invariant_sdk.ui_handler import UIHandler
+    from invariant_sdk.ui_server import ReuseHTTPServer, ThreadingReuseHTTPServer
+
+    overlay = OverlayGraph()
+    for doc in ("a.md", "b.md"):
+        for i, (src, tgt) in enumerate([("alpha", "beta"), ("beta", "gamma")]):
+            for word in (src, tgt):
+                overlay.define_label(hash8_hex(f"Ġ{word}"), word)
+            overlay.add_edge(hash8_hex(f"Ġ{src}"), hash8_hex(f"Ġ{tgt}"), doc=doc, line=i + 1)
+    client = halo_stub(delay=0.02)
+    ui_env(overlay, client)
+
+    def serve(server_cls, paths):
+        client.max_active = 0
+        httpd = server_cls(("localhost", 0), UIHandler)
+        threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+        base = f"http://localhost:{httpd.server_address[1]}"
+        get = lambda path: json.loads(urllib.request.urlopen(base + path, timeout=10).read())
+        try:
+            with ThreadPoolExecutor(8) as pool:
+                out = list(pool.map(get, paths))
+            return client.max_active, out
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+
+    # Overlap is observed in the stub (halo calls in flight), not by wall-clock
+    serial, out_serial = serve(ReuseHTTPServer, [f"/api/suggest?q=s{i}" for i in range(8)])
+
+    # Threaded: each halo call waits for a second one to be in flight (a
+    # serial server would break the barrier and drop the global suggestions)
+    meet = threading.Barrier(2, timeout=10)
+    page = client.get_halo_page
+
+    def paired_page(h8, limit=20, **kw):
+        meet.wait()
+        return page(h8, limit, **kw)
+
+    client.get_halo_page = paired_page
+    threaded, out_threaded = serve(ThreadingReuseHTTPServer, [f"/api/suggest?q=t{i}" for i in range(8)])
+    del client.get_halo_page
+    assert [len(o["suggestions"]) for o in out_serial] == [len(o["suggestions"]) for o in out_threaded]
+    assert serial == 1 and threaded > 1 and not meet.broken, (serial, threaded)
+
+    # Readers racing a delete see the old or the new overlay, never a mix
+    httpd = ThreadingReuseHTTPServer(("localhost", 0), UIHandler)
+    threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+    base = f"http://localhost:{httpd.server_address[1]}"
+    try:
+        def docs(_):
+            data = json.loads(urllib.request.urlopen(base + "/api/docs", timeout=10).read())
+            return tuple(sorted((d["doc"], d["edges"]) for d in data["docs"]))
+
+        with ThreadPoolExecutor(8) as pool:
+            seen = pool.map(docs, range(40))
+            req = urllib.request.Request(base + "/api/delete", data=json.dumps({"doc": "b.md"}).encode(), method="POST")
+            deleted = json.loads(urllib.request.urlopen(req, timeout=10).read())
+            seen = set(seen)
+        assert deleted["deleted_edges"] == 2 and deleted["remaining_edges"] == 2
+        assert seen <= {(("a.md", 2), ("b.md", 2)), (("a.md", 2),)}
+        assert docs(0) == (("a.md", 2),)
+        assert UIHandler.overlay is not overlay and overlay.n_edges == 4  # copy-on-write
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_ui_delete_keeps_persisted_window_stats_current(tmp_path, monkeypatch, ui_env, halo_stub):
+    """Writes through the UI maintain overlay.winstats.pkl; writes without stats drop it."""
+    import json
+    import threading
+    import urllib.request
+
+    from invariant_sdk import operators
+    from invariant_sdk.operators import build_window_stats, load_window_stats, window_stats_path
+    from invariant_sdk.overlay import OverlayGraph
+    from invariant_sdk.ui_handler import UIHandler
+    from invariant_sdk.ui_server import ThreadingReuseHTTPServer
+
+    overlay = OverlayGraph()
+    for doc in ("a.md", "b.md", "c.md"):
+        overlay.add_edge("0000000a", "0000000b", doc=doc, line=1)
+        overlay.add_edge("0000000b", "0000000c", doc=doc, line=1)
+    path = tmp_path / "overlay.jsonl"
+    overlay.save(path)
+    stats_path = window_stats_path(path)
+    ui_env(overlay, halo_stub())
+    monkeypatch.setattr(UIHandler, "overlay_path", path)
+
+    loads = []
+    load_or_build = operators.load_or_build_window_stats
+
+    def counted_load(*args, **kwargs):
+        loads.append(args)
+        return load_or_build(*args, **kwargs)
+
+    monkeypatch.setattr(operators, "load_or_build_window_stats", counted_load)
+
+    httpd = ThreadingReuseHTTPServer(("localhost", 0), UIHandler)
+    threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+    base = f"http://localhost:{httpd.server_address[1]}"
+    try:
+        for doc in ("b.md", "c.md"):
+            req = urllib.request.Request(base + "/api/delete", data=json.dumps({"doc": doc}).encode(), method="POST")
+            assert json.loads(urllib.request.urlopen(req, timeout=10).read())["success"]
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    assert len(loads) == 1  # the second write reused the in-memory stats
+    assert UIHandler._window_stats_key == UIHandler.overlay.version
+
+    saved = OverlayGraph.load(path)
+    stats = load_window_stats(stats_path, saved)
+    assert stats is not None and stats.cooccur == build_window_stats(saved).cooccur
+
+    UIHandler._save_overlay(saved, path)  # a write that did not maintain them
+    assert not stats_path.exists()
+
+
+def test_scoring_pool_is_created_once_under_concurrent_first_use():
+    """Server threads racing on the first query share one pool; exit shutdown clears them."""
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    from invariant_sdk import engine
+
+    start = threading.Barrier(8)
+
+    def first_use(_):
+        start.wait()
+        return engine._scoring_pool(7, True)
+
+    with ThreadPoolExecutor(8) as pool:
+        pools = set(map(id, pool.map(first_use, range(8))))
+    assert len(pools) == 1 and engine._SCORING_POOLS[(True, 7)].submit(int, "3").result() == 3
+
+    engine._shutdown_scoring_pools()
+    assert engine._SCORING_POOLS == {}